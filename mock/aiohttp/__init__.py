@@ -19,7 +19,10 @@ class ClientError(Exception):
 
 
 class ClientResponseError(ClientError):
-    pass
+
+    def __init__(self, *args, status=None, **kwds):
+        super().__init__(*args)
+        self.status = status
 
 
 class ContentTypeError(ClientResponseError):
@@ -161,6 +164,27 @@ class CaseInsensitiveDict(dict):
     __hash__ = None
 
 
+class StreamReader:
+
+    def __init__(self, content):
+        self._content = content
+
+    async def read(self, n=-1):
+        if n < 0:
+            n = len(self._content)
+        data = self._content[:n]
+        self._content = self._content[n:]
+        return data
+
+    async def iter_chunked(self, n):
+        while self._content:
+            yield await self.read(n)
+
+    async def iter_any(self):
+        while self._content:
+            yield await self.read()
+
+
 class ClientResponse:
 
     def __init__(self):
@@ -171,6 +195,7 @@ class ClientResponse:
         self._content = None
         self._encoding = None
         self._closed = None
+        self._stream = None
 
     @classmethod
     def mock(cls, status, **kwds):
@@ -207,6 +232,12 @@ class ClientResponse:
     def closed(self):
         return self._closed
 
+    @property
+    def content(self):
+        if self._stream is None:
+            self._stream = StreamReader(self._content)
+        return self._stream
+
     async def read(self):
         return self._content
 
@@ -225,7 +256,7 @@ class ClientResponse:
 
     def raise_for_status(self):
         if self.status >= 400:
-            raise ClientResponseError("Error: {}".format(self.status))
+            raise ClientResponseError("Error: {}".format(self.status), status=self.status)
 
 
 class AsyncContextManager:
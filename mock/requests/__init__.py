@@ -11,6 +11,7 @@ import copy
 import datetime
 import json
 
+from . import adapters
 from .exceptions import *
 
 __version__ = "2.21"
@@ -119,11 +120,16 @@ class Response:
         return self.ok
 
     def __iter__(self):
-        return iter(self.content)
+        return self.iter_content(128)
 
     def close(self):
         pass
 
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        content = self.content
+        for index in range(0, len(content), chunk_size):
+            yield content[index:index + chunk_size]
+
     @property
     def ok(self):
         return self.status_code < 400
@@ -161,13 +167,16 @@ class Response:
 
     def raise_for_status(self):
         if not self.ok:
-            raise HTTPError("Error: {}".format(self.status_code))
+            raise HTTPError("Error: {}".format(self.status_code), response=self)
 
 
 class Session:
 
     def __init__(self):
-        pass
+        self.headers = CaseInsensitiveDict()
+        self.adapters = {}
+        self.mount('https://', adapters.HTTPAdapter())
+        self.mount('http://', adapters.HTTPAdapter())
 
     def __enter__(self):
         return self
@@ -176,7 +185,11 @@ class Session:
         self.close()
 
     def close(self):
-        pass
+        for adapter in self.adapters.values():
+            adapter.close()
+
+    def mount(self, prefix, adapter):
+        self.adapters[prefix] = adapter
 
     def request(self, method, url, **kwds):
         if EXCEPTION is not None:
@@ -0,0 +1,21 @@
+class BaseAdapter:
+
+    def __init__(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class HTTPAdapter(BaseAdapter):
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, max_retries=0, pool_block=False):
+        super().__init__()
+        self.max_retries = max_retries
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self.closed = False
+
+    def close(self):
+        self.closed = True
@@ -2,7 +2,11 @@ from urllib3.exceptions import HTTPError as BaseHTTPError
 
 
 class RequestException(IOError):
-    pass
+
+    def __init__(self, *args, response=None, request=None):
+        super().__init__(*args)
+        self.response = response
+        self.request = request
 
 
 class ChunkedEncodingError(RequestException):
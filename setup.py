@@ -78,6 +78,8 @@ EXTRAS_REQUIRE = {
     'crypto': ['pycryptodome>=3.4', 'ed25519>=1.4', 'ed25519sha3>=1.4'],
     # Use ReactiveX for asynchronous code scheduling.
     'reactive': ['rx>=1.6'],
+    # Use orjson for faster JSON encoding and decoding.
+    'json': ['orjson>=3.0'],
 
     # TESTING / DOCUMENTATION
 
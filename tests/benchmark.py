@@ -0,0 +1,82 @@
+"""
+    benchmark
+    =========
+
+    Benchmark the JSON codecs on the mocked response data.
+
+    Each fixture in `tests/data` is decoded (and re-encoded) with every
+    available codec, and the total time per round is reported. Run with:
+
+        python -m tests.benchmark [ROUNDS]
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+import os
+import sys
+import timeit
+
+from xpxchain import client
+from tests import responses
+
+
+def load_contents():
+    """Load the raw response bodies of all fixtures."""
+
+    contents = []
+    for name in sorted(os.listdir(responses.DATADIR)):
+        if name.endswith('.json'):
+            contents.append(responses.load_response(name)['content'])
+    return contents
+
+
+def get_codecs():
+    """Get all available codecs."""
+
+    codecs = [client.JSONCodec()]
+    try:
+        codecs.append(client.OrjsonCodec())
+    except ImportError:
+        print('orjson is not installed, only benchmarking the standard library.')
+    return codecs
+
+
+def bench(codec, contents, rounds):
+    """Get the best time per round to decode and encode every fixture."""
+
+    documents = [codec.loads(i) for i in contents]
+    loads = min(timeit.repeat(lambda: [codec.loads(i) for i in contents], number=rounds, repeat=5))
+    dumps = min(timeit.repeat(lambda: [codec.dumps(i) for i in documents], number=rounds, repeat=5))
+    return loads / rounds, dumps / rounds
+
+
+def main(rounds=200):
+    contents = load_contents()
+    size = sum(len(i) for i in contents)
+    print(f'{len(contents)} fixtures, {size} bytes, {rounds} rounds.')
+    print(f'{"codec":<10}{"loads (us)":>14}{"dumps (us)":>14}{"MB/s":>10}')
+    baseline = None
+    for codec in get_codecs():
+        loads, dumps = bench(codec, contents, rounds)
+        baseline = baseline or loads
+        speed = size / loads / 1e6
+        print(f'{codec.name:<10}{loads * 1e6:>14.1f}{dumps * 1e6:>14.1f}{speed:>10.1f}  ({baseline / loads:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*(int(i) for i in sys.argv[1:2]))
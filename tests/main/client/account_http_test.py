@@ -1,9 +1,27 @@
+import aiohttp
+import itertools
+import requests
+
 from xpxchain import client
 from xpxchain import models
+from tests import aitertools
 from tests import harness
 from tests import responses
 from xpxchain import util
 
+PUBLIC_ACCOUNT = models.PublicAccount.create_from_public_key('7A562888C7AE1E082579951D6D93BF931DE979360ACCA4C4085D754E5E122808', models.NetworkType.MIJIN_TEST)
+TRANSACTION_ID = '5CC07CBCA03D9100014F5754'
+
+
+async def take(iterable, count):
+    """Take up to count items from a synchronous or asynchronous iterator."""
+
+    if hasattr(iterable, '__aiter__'):
+        result = [i async for i in aitertools.aslice(iterable, count)]
+        await iterable.aclose()
+        return result
+    return list(itertools.islice(iterable, count))
+
 
 @harness.mocked_http_test_case({
     'clients': (client.AccountHTTP, client.AsyncAccountHTTP),
@@ -107,6 +125,46 @@ from xpxchain import util
                 lambda x: (x[0].names[0], 'foo.bar'),
             ],
         },
+        {
+            'name': 'test_get_accounts_info_bulk',
+            'response': responses.ACCOUNTS_INFO["Ok"],
+            'params': [[models.Address('SCBO3CAFOVAOGYBAHQKPUOGLAYWFLNJUFFCH3RYY')] * 5, 2],
+            'method': 'get_accounts_info_bulk',
+            'validation': [
+                lambda x: (len(x), 3),
+                lambda x: (x[2].public_key, '7A562888C7AE1E082579951D6D93BF931DE979360ACCA4C4085D754E5E122808'),
+            ],
+        },
+        {
+            'name': 'test_get_accounts_properties_bulk',
+            'response': responses.ACCOUNTS_PROPERTIES["Ok"],
+            'params': [[models.Address.create_from_encoded('906DE63B4FDC66936F823B1CA8B08992C6FBCF0D0AEA2310AF')] * 3, 1, 2],
+            'method': 'get_accounts_properties_bulk',
+            'validation': [
+                lambda x: (len(x), 6),
+                lambda x: (x[4].address.hex, '906DE63B4FDC66936F823B1CA8B08992C6FBCF0D0AEA2310AF'),
+                lambda x: (x[5].address.hex, '907833A9D4D5EC393ADB9FE69AC7558AA397EC33094174D6C3'),
+            ],
+        },
+        {
+            'name': 'test_get_account_names_bulk',
+            'response': responses.ACCOUNT_NAMES["Ok"],
+            'params': [[models.Address.create_from_encoded('904E828FB27B84589C2FCFFC3B09CBC9E56C6612E4E133A558')] * 4],
+            'method': 'get_account_names_bulk',
+            'validation': [
+                lambda x: (len(x), 1),
+                lambda x: (x[0].names[0], 'foo.bar'),
+            ],
+        },
+        {
+            'name': 'test_get_account_names_bulk_empty',
+            'response': responses.ACCOUNT_NAMES["Ok"],
+            'params': [[]],
+            'method': 'get_account_names_bulk',
+            'validation': [
+                lambda x: (x, []),
+            ],
+        },
         {
             'name': 'test_get_multisig_account_info',
             'response': responses.MULTISIG_INFO["Ok"],
@@ -220,4 +278,28 @@ from xpxchain import util
     ],
 })
 class TestAccountHTTP(harness.TestCase):
-    pass
+
+    @harness.async_test(
+        sync_data=(client.AccountHTTP, requests),
+        async_data=(client.AsyncAccountHTTP, aiohttp)
+    )
+    async def test_iter_transactions(self, data, await_cb, with_cb):
+        network_type = models.NetworkType.MIJIN_TEST
+        async with with_cb(data[0](responses.ENDPOINT, network_type=network_type)) as http:
+            with data[1].default_response(200, **responses.BLOCK_TRANSACTIONS["Ok"]):
+                # Full pages continue onto the next page.
+                transactions = await take(http.iter_transactions(PUBLIC_ACCOUNT, page_size=1), 3)
+                self.assertEqual(len(transactions), 3)
+                self.assertEqual(transactions[2].transaction_info.id, TRANSACTION_ID)
+
+                # Partial pages end iteration.
+                transactions = await take(http.iter_incoming_transactions(PUBLIC_ACCOUNT, page_size=10), 5)
+                self.assertEqual(len(transactions), 1)
+
+                # Stop conditions.
+                transactions = await take(http.iter_outgoing_transactions(PUBLIC_ACCOUNT, 1, stop_id=TRANSACTION_ID), 5)
+                self.assertEqual(transactions, [])
+                transactions = await take(http.iter_aggregate_bonded_transactions(PUBLIC_ACCOUNT, 1, stop_height=2), 5)
+                self.assertEqual(transactions, [])
+                transactions = await take(http.iter_transactions(PUBLIC_ACCOUNT, 10, stop_height=1), 5)
+                self.assertEqual(len(transactions), 1)
@@ -0,0 +1,188 @@
+import asyncio
+import gc
+
+from xpxchain import client
+from xpxchain.client import abc
+from xpxchain import errors
+from xpxchain import models
+from tests import harness
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+SIGNER = '1B153F8B76EF60A4BFE152F4DE3698BD230BAC9DC239D4E448715AA46BD58290'
+CONFIRMED = models.TransactionStatusGroup.CONFIRMED
+FAILED = models.TransactionStatusGroup.FAILED
+UNCONFIRMED = models.TransactionStatusGroup.UNCONFIRMED
+
+
+def signed(index):
+    hash = format(index, '064x')
+    return models.SignedTransaction('00', hash, SIGNER, 0x4154, NETWORK_TYPE)
+
+
+def transaction_status(hash, group, status='Success'):
+    return models.TransactionStatus(group, status, hash, None, 1)
+
+
+class Node:
+    """Fake transaction client, confirming or rejecting after some polls."""
+
+    def __init__(self, outcomes=None, announce_errors=None):
+        self.outcomes = outcomes or {}
+        self.announce_errors = announce_errors or {}
+        self.announced = []
+        self.requests = []
+
+    async def announce(self, transaction):
+        await asyncio.sleep(0)
+        error = self.announce_errors.get(transaction.hash)
+        if error is not None:
+            raise error
+        self.announced.append(transaction.hash)
+
+    async def get_transaction_statuses(self, hashes):
+        self.requests.append(list(hashes))
+        statuses = []
+        for hash in hashes:
+            group = self.outcomes.get(hash.lower(), CONFIRMED)
+            status = 'Failure_Core_Insufficient_Balance' if group == FAILED else 'Success'
+            statuses.append(transaction_status(hash, group, status))
+        return statuses
+
+
+class Listener:
+    """Fake listener, replaying queued messages."""
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.channels = []
+
+    async def status(self, address):
+        self.channels.append(f'status/{address.address}')
+
+    async def confirmed(self, address):
+        self.channels.append(f'confirmedAdded/{address.address}')
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.queue.get()
+        if isinstance(message, Exception):
+            raise message
+        return message
+
+
+class TestAnnouncePipeline(harness.TestCase):
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            client.AnnouncePipeline(Node(), concurrency=0)
+
+    async def test_poll(self):
+        transactions = [signed(i) for i in range(10)]
+        node = Node(outcomes={transactions[3].hash: FAILED})
+        pipeline = client.AnnouncePipeline(node, concurrency=2, batch_size=4, poll_interval=0.01)
+        async with pipeline:
+            futures = await pipeline.submit_all(transactions)
+            # Duplicate transactions share a future.
+            self.assertIs(await pipeline.submit(transactions[0]), futures[0])
+
+        self.assertEqual(len(pipeline), 0)
+        self.assertEqual(sorted(node.announced), [i.hash for i in transactions])
+        self.assertEqual(node.requests[0], [i.hash.upper() for i in transactions[:4]])
+        self.assertTrue(all(len(i) <= 4 for i in node.requests))
+        self.assertEqual((pipeline.announced, pipeline.confirmed, pipeline.failed), (10, 9, 1))
+
+        status = futures[0].result()
+        self.assertEqual((status.group, status.hash), (CONFIRMED, transactions[0].hash.upper()))
+        error = futures[3].exception()
+        self.assertIsInstance(error, errors.TransactionError)
+        self.assertEqual(error.status, 'Failure_Core_Insufficient_Balance')
+        address = models.PublicAccount.create_from_public_key(SIGNER, NETWORK_TYPE).address
+        self.assertEqual(error.address, address)
+
+    async def test_announce_error(self):
+        transactions = [signed(1), signed(2)]
+        node = Node(announce_errors={transactions[0].hash: client.AsyncHTTPError('Error: 400')})
+        async with client.AnnouncePipeline(node, poll_interval=0.01) as pipeline:
+            futures = await pipeline.submit_all(transactions)
+
+        self.assertIsInstance(futures[0].exception(), client.AsyncHTTPError)
+        self.assertEqual(futures[1].result().group, CONFIRMED)
+        self.assertEqual((pipeline.announced, pipeline.failed), (1, 1))
+        self.assertEqual(sum(len(i) for i in node.requests), 1)
+
+    async def test_timeout(self):
+        transaction = signed(1)
+        node = Node(outcomes={transaction.hash: UNCONFIRMED})
+        async with client.AnnouncePipeline(node, poll_interval=0.01, timeout=0.05) as pipeline:
+            future = await pipeline.submit(transaction)
+        self.assertIsInstance(future.exception(), asyncio.TimeoutError)
+        self.assertGreater(len(node.requests), 1)
+
+    async def test_unretrieved(self):
+        loop = asyncio.get_event_loop()
+        handler = loop.get_exception_handler()
+        contexts = []
+        loop.set_exception_handler(lambda loop, context: contexts.append(context))
+        try:
+            transaction = signed(1)
+            node = Node(outcomes={transaction.hash: FAILED})
+            async with client.AnnouncePipeline(node, poll_interval=0.01) as pipeline:
+                # Only wait on the pipeline, dropping the future.
+                await pipeline.submit(transaction)
+            self.assertEqual(pipeline.failed, 1)
+            del pipeline
+            await asyncio.sleep(0)
+            gc.collect()
+        finally:
+            loop.set_exception_handler(handler)
+        self.assertEqual(contexts, [])
+
+    async def test_close(self):
+        node = Node(outcomes={signed(1).hash: UNCONFIRMED})
+        pipeline = client.AnnouncePipeline(node, poll_interval=0.01)
+        with self.assertRaises(RuntimeError):
+            await pipeline.submit(signed(1))
+        pipeline.start()
+        with self.assertRaises(RuntimeError):
+            pipeline.start()
+        future = await pipeline.submit(signed(1))
+        await asyncio.sleep(0.05)
+        self.assertFalse(future.done())
+        await pipeline.close()
+        self.assertTrue(future.cancelled())
+
+    async def test_listener(self):
+        transactions = [signed(1), signed(2), signed(3)]
+        node = Node(outcomes={i.hash: UNCONFIRMED for i in transactions})
+        listener = Listener()
+        address = models.PublicAccount.create_from_public_key(SIGNER, NETWORK_TYPE).address
+        pipeline = client.AnnouncePipeline(node, listener, poll_interval=0.01)
+        async with pipeline:
+            futures = await pipeline.submit_all(transactions)
+            while pipeline.announced < 3:
+                await asyncio.sleep(0.01)
+            self.assertEqual(listener.channels, [f'status/{address.address}', f'confirmedAdded/{address.address}'])
+
+            status = 'Failure_Core_Past_Deadline'
+            error = models.TransactionStatusError(transactions[0].hash, status, None, 'status', address)
+            await listener.queue.put(abc.ListenerMessage('status', error))
+            info = models.TransactionInfo(1, 0, '', transactions[1].hash.upper(), '')
+            transaction = models.TransferTransaction(
+                network_type=NETWORK_TYPE,
+                version=models.TransactionVersion.TRANSFER,
+                deadline=models.Deadline.create(),
+                recipient=address,
+                transaction_info=info,
+            )
+            await listener.queue.put(abc.ListenerMessage('confirmedAdded', transaction))
+            await asyncio.wait(futures[:2])
+
+            # Lost connection, the remaining transaction is still polled.
+            await listener.queue.put(ConnectionError())
+            node.outcomes.clear()
+
+        self.assertEqual(futures[0].exception().status, 'Failure_Core_Past_Deadline')
+        self.assertEqual(futures[1].result().height, 1)
+        self.assertEqual(futures[2].result().group, CONFIRMED)
@@ -0,0 +1,146 @@
+import asyncio
+import requests
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import nis
+from tests import harness
+from tests import responses
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+
+
+def load_block():
+    with client.BlockchainHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE) as http:
+        with requests.default_response(200, **responses.BLOCK_INFO["Ok"]):
+            return http.get_block_by_height(1)
+
+
+class FakeChain:
+    """Fake block endpoints, serving `height` blocks with some missing from ranges."""
+
+    def __init__(self, height, missing=()):
+        self.block = load_block()
+        self.height = height
+        self.missing = set(missing)
+        self.calls = []
+        self.clients = []
+        self.active = 0
+        self.max_active = 0
+
+    def blocks(self, height, limit):
+        self.calls.append(('range', height, limit))
+        end = min(height + limit, self.height + 1)
+        return [self.block.replace(height=i) for i in range(height, end) if i not in self.missing]
+
+    def block_at(self, height):
+        self.calls.append(('block', height))
+        return self.block.replace(height=height)
+
+    def callbacks(self, cb):
+        def sync(client, network_type, *args, **kwds):
+            self.clients.append(client)
+            return cb(*args)
+
+        async def async_(client, network_type, *args, **kwds):
+            await network_type
+            self.clients.append(client)
+            self.active += 1
+            self.max_active = max(self.active, self.max_active)
+            try:
+                # Finish later windows first to exercise the reordering.
+                await asyncio.sleep(0.001 * (self.height - (args or (0,))[0]) / self.height)
+                return cb(*args)
+            finally:
+                self.active -= 1
+
+        return (sync, async_)
+
+    def patch(self):
+        patcher = mock.patch.multiple(
+            nis,
+            get_blocks_by_height_with_limit=self.callbacks(self.blocks),
+            get_block_by_height=self.callbacks(self.block_at),
+            get_block_transactions=self.callbacks(lambda height: [height]),
+            get_block_receipts=self.callbacks(lambda height: [height, height]),
+            get_blockchain_height=self.callbacks(lambda: self.height),
+        )
+        return patcher
+
+
+async def collect(iterator):
+    if hasattr(iterator, '__aiter__'):
+        return [i async for i in iterator]
+    return list(iterator)
+
+
+class TestIterBlocks(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, {}),
+        async_data=(client.AsyncBlockchainHTTP, {'loop': None})
+    )
+    async def test_ordered(self, data, await_cb, with_cb):
+        chain = FakeChain(250, missing=(7, 150))
+        http = data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, **data[1])
+        async with with_cb(http) as http:
+            with chain.patch():
+                blocks = await collect(http.iter_blocks(5, 230, limit=20, concurrency=3))
+                self.assertEqual([i.height for i in blocks], list(range(5, 230)))
+                self.assertIn(('block', 7), chain.calls)
+                self.assertIn(('block', 150), chain.calls)
+
+                blocks = await collect(http.iter_blocks(240))
+                self.assertEqual([i.height for i in blocks], list(range(240, 251)))
+                self.assertEqual(await collect(http.iter_blocks(10, 10)), [])
+        self.assertLessEqual(chain.max_active, 3)
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, {}),
+        async_data=(client.AsyncBlockchainHTTP, {'loop': None})
+    )
+    async def test_block_data(self, data, await_cb, with_cb):
+        chain = FakeChain(50)
+        http = data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, **data[1])
+        async with with_cb(http) as http:
+            with chain.patch():
+                items = await collect(http.iter_blocks(1, 31, limit=10, transactions=True))
+                self.assertEqual([i.block.height for i in items], list(range(1, 31)))
+                self.assertEqual([i.transactions for i in items], [[i] for i in range(1, 31)])
+                self.assertTrue(all(i.receipts is None for i in items))
+
+                items = await collect(http.iter_blocks(3, 5, transactions=True, receipts=True))
+                self.assertEqual(items[0].receipts, [3, 3])
+
+    async def test_nodes(self):
+        chain = FakeChain(100)
+        nodes = [client.AsyncBlockchainHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE) for _ in range(3)]
+        for node in nodes:
+            await node.__aenter__()
+        try:
+            with chain.patch():
+                blocks = await collect(nodes[0].iter_blocks(1, 101, limit=10, nodes=nodes[1:]))
+        finally:
+            for node in nodes:
+                await node.__aexit__(None, None, None)
+        self.assertEqual([i.height for i in blocks], list(range(1, 101)))
+        counts = [len([i for i in chain.clients if i is node.raw]) for node in nodes]
+        self.assertEqual(counts, [4, 3, 3])
+
+    async def test_cancel(self):
+        chain = FakeChain(1000)
+        async with client.AsyncBlockchainHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE) as http:
+            with chain.patch():
+                iterator = http.iter_blocks(1, 1001, limit=10, concurrency=4)
+                async for block in iterator:
+                    break
+                await iterator.aclose()
+                await asyncio.sleep(0.01)
+        self.assertEqual(block.height, 1)
+        self.assertLessEqual(len([i for i in chain.calls if i[0] == 'range']), 5)
+
+    def test_invalid(self):
+        with client.BlockchainHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE) as http:
+            with self.assertRaises(ValueError):
+                list(http.iter_blocks(1, 10, limit=0))
@@ -0,0 +1,149 @@
+import aiohttp
+import os
+import requests
+import tempfile
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+from tests import responses
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+TRANSACTION_HASH = '47490969DB1960AD8565E67700C47FE41BBE07C6F490A66D3001AC46B6684600'
+
+
+class Server:
+    """Wrap a mocked session, answering chain height requests separately."""
+
+    def __init__(self, request):
+        self.request = request
+        self.urls = []
+
+    def sync(self, method, url, **kwds):
+        self.urls.append(url)
+        if url.endswith('/chain/height'):
+            return requests.Response.mock(200, **responses.CHAIN_HEIGHT["Ok"])
+        return self.request(method, url, **kwds)
+
+    async def async_(self, method, url, **kwds):
+        self.urls.append(url)
+        if url.endswith('/chain/height'):
+            return aiohttp.ClientResponse.mock(200, **responses.CHAIN_HEIGHT["Ok"])
+        return await self.request(method, url, **kwds)
+
+
+class TestResponseCache(harness.TestCase):
+
+    def test_key(self):
+        cache = client.ResponseCache()
+        self.assertIsNotNone(cache.key('get_block_by_height', NETWORK_TYPE, (1,), {}))
+        self.assertIsNotNone(cache.key('get_block_by_height', NETWORK_TYPE, (1,), {'timeout': 1}))
+        self.assertIsNone(cache.key('get_block_by_height', NETWORK_TYPE, (1,), {'params': {}}))
+        self.assertIsNone(cache.key('get_account_info', NETWORK_TYPE, (1,), {}))
+
+    def test_finality(self):
+        cache = client.ResponseCache(depth=10)
+        key = cache.key('get_block_by_height', NETWORK_TYPE, (5,), {})
+
+        # Unknown chain height, cannot prove the block is final.
+        self.assertFalse(cache.put('get_block_by_height', key, (5,), 200, {}, 'block'))
+        cache.observe('get_blockchain_height', 14)
+        self.assertFalse(cache.put('get_block_by_height', key, (5,), 200, {}, 'block'))
+        cache.observe('get_blockchain_height', 15)
+        self.assertTrue(cache.put('get_block_by_height', key, (5,), 200, {}, 'block'))
+        self.assertEqual(cache.get(key, NETWORK_TYPE, None), 'block')
+
+        # The chain height never decreases.
+        cache.height = 1
+        self.assertEqual(cache.height, 15)
+
+    def test_eviction(self):
+        cache = client.ResponseCache(maxsize=2, depth=0)
+        cache.height = 10
+        keys = [cache.key('get_block_by_height', NETWORK_TYPE, (i,), {}) for i in range(3)]
+        cache.put('get_block_by_height', keys[0], (0,), 200, {}, 0)
+        cache.put('get_block_by_height', keys[1], (1,), 200, {}, 1)
+        cache.get(keys[0], NETWORK_TYPE, None)
+        cache.put('get_block_by_height', keys[2], (2,), 200, {}, 2)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(keys[0], NETWORK_TYPE, None), 0)
+        self.assertEqual(cache.get(keys[2], NETWORK_TYPE, None), 2)
+        self.assertEqual(cache.hits, 3)
+        self.assertEqual(cache.get(keys[1], NETWORK_TYPE, None) is client.cache.MISSING, True)
+        self.assertEqual(cache.misses, 1)
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.sqlite')
+            cache = client.ResponseCache(depth=0, path=path)
+            cache.height = 10
+            key = cache.key('get_block_by_height', NETWORK_TYPE, (1,), {})
+            cache.put('get_block_by_height', key, (1,), 200, {'height': 1}, 'block')
+            cache.close()
+
+            cache = client.ResponseCache(path=path)
+            process = lambda status, json, network_type: (status, json, network_type)
+            self.assertEqual(cache.get(key, NETWORK_TYPE, process), (200, {'height': 1}, NETWORK_TYPE))
+            self.assertEqual(len(cache), 1)
+            cache.clear()
+            self.assertIs(cache.get(key, NETWORK_TYPE, process), client.cache.MISSING)
+            cache.close()
+
+
+class TestCachedHTTP(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.HTTP, requests, {}),
+        async_data=(client.AsyncHTTP, aiohttp, {'loop': None})
+    )
+    async def test_cached_requests(self, data, await_cb, with_cb):
+        cache = client.ResponseCache(depth=100)
+        http = data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, cache=cache, **data[2])
+        async with with_cb(http) as http:
+            with data[1].default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                self.assertEqual(await await_cb(http.blockchain.get_blockchain_height()), 53577)
+            self.assertEqual(cache.height, 53577)
+
+            with data[1].default_response(200, **responses.BLOCK_INFO["Ok"]):
+                block = await await_cb(http.blockchain.get_block_by_height(1))
+            with data[1].default_response(200, **responses.TRANSACTION["Ok"]):
+                # Transaction is confirmed above the final height.
+                await await_cb(http.transaction.get_transaction(TRANSACTION_HASH))
+                cache.height = 158258
+                transaction = await await_cb(http.transaction.get_transaction(TRANSACTION_HASH))
+
+            # Immutable responses are served without a request.
+            self.assertIs(await await_cb(http.blockchain.get_block_by_height(1)), block)
+            self.assertIs(await await_cb(http.transaction.get_transaction(TRANSACTION_HASH)), transaction)
+
+            # Mutable responses are always requested.
+            with self.assertRaises(RuntimeError):
+                await await_cb(http.blockchain.get_blockchain_height())
+            with self.assertRaises(RuntimeError):
+                await await_cb(http.blockchain.get_block_by_height(158200))
+
+    @harness.async_test(
+        sync_data=(client.HTTP, requests, {}, 'request', 'sync'),
+        async_data=(client.AsyncHTTP, aiohttp, {'loop': None}, '_request', 'async_')
+    )
+    async def test_refresh_height(self, data, await_cb, with_cb):
+        cache = client.ResponseCache(depth=100, refresh=60)
+        http = data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, cache=cache, **data[2])
+        async with with_cb(http) as http:
+            session = http.blockchain.raw._session
+            server = Server(getattr(session, data[3]))
+            with mock.patch.object(session, data[3], getattr(server, data[4])):
+                with data[1].default_response(200, **responses.BLOCK_INFO["Ok"]):
+                    # The cache requests the chain height itself.
+                    block = await await_cb(http.blockchain.get_block_by_height(1))
+                    self.assertEqual(cache.height, 53577)
+                    self.assertIs(await await_cb(http.blockchain.get_block_by_height(1)), block)
+
+                    # The chain height is requested at most once per refresh.
+                    await await_cb(http.blockchain.get_block_by_height(53500))
+                    await await_cb(http.blockchain.get_block_by_height(53500))
+
+            heights = [i for i in server.urls if i.endswith('/chain/height')]
+            self.assertEqual(len(heights), 1)
+            self.assertEqual(len(server.urls), 4)
@@ -0,0 +1,88 @@
+import aiohttp
+import asyncio
+import gc
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+from tests import responses
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+
+
+class TestRequestCoalescer(harness.TestCase):
+
+    def test_key(self):
+        coalescer = client.RequestCoalescer()
+        key = coalescer.key(responses.ENDPOINT, 'get_blockchain_height', NETWORK_TYPE, (), {})
+        self.assertIsNotNone(key)
+        timeout = coalescer.key(responses.ENDPOINT, 'get_blockchain_height', NETWORK_TYPE, (), {'timeout': 1})
+        self.assertNotEqual(key, timeout)
+        self.assertNotEqual(key, coalescer.key('//localhost:3001', 'get_blockchain_height', NETWORK_TYPE, (), {}))
+        self.assertIsNone(coalescer.key(responses.ENDPOINT, 'announce', NETWORK_TYPE, (), {}))
+
+    async def test_coalesced(self):
+        coalescer = client.RequestCoalescer()
+        http = client.AsyncBlockchainHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, coalescer=coalescer)
+        async with http as http:
+            with aiohttp.default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                heights = await asyncio.gather(*(http.get_blockchain_height() for _ in range(10)))
+                self.assertEqual(heights, [53577] * 10)
+                self.assertEqual(coalescer.requests, 10)
+                self.assertEqual(coalescer.deduplicated, 9)
+                self.assertEqual(len(coalescer), 0)
+
+                # Sequential requests are not shared.
+                await http.get_blockchain_height()
+                self.assertEqual(coalescer.deduplicated, 9)
+
+    async def test_exception(self):
+        coalescer = client.RequestCoalescer()
+        http = client.AsyncBlockchainHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, coalescer=coalescer)
+        async with http as http:
+            with aiohttp.default_exception(client.AsyncHTTPError):
+                results = await asyncio.gather(
+                    *(http.get_blockchain_height() for _ in range(3)),
+                    return_exceptions=True
+                )
+        self.assertTrue(all(isinstance(i, client.AsyncHTTPError) for i in results))
+        self.assertEqual(coalescer.deduplicated, 2)
+
+    async def test_cancel(self):
+        coalescer = client.RequestCoalescer()
+        http = client.AsyncBlockchainHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, coalescer=coalescer)
+        async with http as http:
+            with aiohttp.default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                first = asyncio.ensure_future(http.get_blockchain_height())
+                second = asyncio.ensure_future(http.get_blockchain_height())
+                await asyncio.sleep(0)
+                first.cancel()
+                # The shared request outlives the cancelled caller.
+                self.assertEqual(await second, 53577)
+        self.assertTrue(first.cancelled())
+        self.assertEqual(coalescer.deduplicated, 1)
+
+    async def test_cancel_all(self):
+        loop = asyncio.get_event_loop()
+        handler = loop.get_exception_handler()
+        contexts = []
+        loop.set_exception_handler(lambda loop, context: contexts.append(context))
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise client.AsyncHTTPError('Error: 503')
+
+        try:
+            coalescer = client.RequestCoalescer()
+            callers = [asyncio.ensure_future(coalescer.run('key', fetch)) for _ in range(2)]
+            await asyncio.sleep(0)
+            for caller in callers:
+                caller.cancel()
+            # The shared request fails without any caller left to retrieve the error.
+            await asyncio.sleep(0.05)
+            del callers
+            gc.collect()
+        finally:
+            loop.set_exception_handler(handler)
+        self.assertEqual(contexts, [])
+        self.assertEqual(len(coalescer), 0)
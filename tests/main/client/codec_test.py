@@ -0,0 +1,84 @@
+import aiohttp
+import json
+import requests
+import unittest
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import codec
+from tests import benchmark
+from tests import harness
+from tests import responses
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+
+
+class CountingCodec(client.JSONCodec):
+
+    __slots__ = ('loaded', 'dumped')
+
+    def __init__(self):
+        self.loaded = 0
+        self.dumped = 0
+
+    def loads(self, data):
+        self.loaded += 1
+        return super().loads(data)
+
+    def dumps(self, obj):
+        self.dumped += 1
+        return super().dumps(obj)
+
+
+class TestJSONCodec(harness.TestCase):
+
+    def test_codecs(self):
+        contents = benchmark.load_contents()
+        for item in benchmark.get_codecs():
+            for content in contents:
+                data = item.loads(content)
+                self.assertEqual(data, json.loads(content))
+                self.assertEqual(item.loads(item.dumps(data)), data)
+                self.assertIsInstance(item.dumps(data), str)
+
+    @unittest.skipIf(codec.orjson is None, "orjson is not installed.")
+    def test_default(self):
+        self.assertIsInstance(client.DEFAULT_CODEC, client.OrjsonCodec)
+
+    @unittest.skipIf(codec.orjson is not None, "orjson is installed.")
+    def test_fallback(self):
+        self.assertIs(type(client.DEFAULT_CODEC), client.JSONCodec)
+        with self.assertRaises(ImportError):
+            client.OrjsonCodec()
+
+
+class TestCodecHTTP(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.AccountHTTP, requests, {}),
+        async_data=(client.AsyncAccountHTTP, aiohttp, {'loop': None})
+    )
+    async def test_responses(self, data, await_cb, with_cb):
+        counting = CountingCodec()
+        http = data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, codec=counting, **data[2])
+        async with with_cb(http) as http:
+            self.assertIs(http.raw.codec, counting)
+            with data[1].default_response(200, **responses.ACCOUNT_INFO["Ok"]):
+                address = models.Address('SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54')
+                await await_cb(http.get_account_info(address))
+        self.assertEqual(counting.loaded, 1)
+
+    def test_request_body(self):
+        counting = CountingCodec()
+        with client.AccountHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, codec=counting) as http:
+            request = mock.Mock(wraps=http.raw._session.request)
+            with mock.patch.object(http.raw._session, 'request', request):
+                with requests.default_response(200, **responses.ACCOUNTS_INFO["Ok"]):
+                    address = models.Address('SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54')
+                    http.get_accounts_info([address])
+        kwds = request.call_args[1]
+        self.assertEqual(counting.dumped, 1)
+        self.assertEqual(json.loads(kwds['data']), {'addresses': [address.address]})
+        self.assertEqual(kwds['headers']['Content-Type'], 'application/json')
+        self.assertIsNone(kwds.get('json'))
@@ -50,6 +50,29 @@ class TestHTTP(harness.TestCase):
             copy = data.create_from_http(http)
             self.assertTrue(http.raw is copy.raw)
 
+    @harness.async_test(
+        sync_data=(client.HTTP, client.AccountHTTP, requests),
+        async_data=(client.AsyncHTTP, client.AsyncAccountHTTP, aiohttp)
+    )
+    async def test_child(self, data, await_cb, with_cb):
+        http = data[0](responses.ENDPOINT)
+        async with with_cb(http):
+            account = http.account
+            self.assertIsInstance(account, data[1])
+            self.assertIs(http.account, account)
+            self.assertIs(account.raw, http.raw)
+            self.assertIs(http.root, http.root)
+            self.assertIsNone(account._network_type)
+
+            with data[2].default_response(200, **responses.NETWORK_TYPE["MIJIN_TEST"]):
+                await await_cb(http.network_type)
+            self.assertEqual(http.account._network_type, models.NetworkType.MIJIN_TEST)
+
+        # Re-entering the client creates a new session, and new children.
+        async with with_cb(http):
+            self.assertIsNot(http.account, account)
+            self.assertIs(http.account.raw, http.raw)
+
     @harness.async_test(
         sync_data=(client.HTTP, requests),
         async_data=(client.AsyncHTTP, aiohttp)
@@ -0,0 +1,193 @@
+import asyncio
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import abc
+from tests import harness
+
+ADDRESS = 'SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54'
+OTHER = 'SARNASAS2BIAB6LMFA3FPMGBPGIJGK6IJETM3ZSP'
+
+
+def message(channel, value=None):
+    channel_name = channel.partition('/')[0]
+    return abc.ListenerMessage(channel_name, value, channel)
+
+
+class Listener:
+    """Fake listener, replaying queued messages."""
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.channels = []
+        self.entered = False
+
+    async def __aenter__(self):
+        self.entered = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.entered = False
+
+    @property
+    async def uid(self):
+        return 'uid'
+
+    async def subscribe(self, channel):
+        self.channels.append(channel)
+
+    async def unsubscribe(self, channel):
+        self.channels.remove(channel)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.queue.get()
+        if isinstance(message, Exception):
+            raise message
+        return message
+
+
+class TestSubscription(harness.TestCase):
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            client.Subscription('block', overflow='wait')
+        with self.assertRaises(ValueError):
+            client.ListenerHub([])
+
+    async def test_overflow(self):
+        subscription = client.Subscription('block', maxsize=2, overflow='drop')
+        for i in range(4):
+            await subscription.put(message('block', i))
+        self.assertEqual((subscription.depth, subscription.dropped), (2, 2))
+        self.assertEqual((await subscription.get()).message, 0)
+
+        subscription = client.Subscription('block', maxsize=2, overflow='drop_oldest')
+        for i in range(4):
+            await subscription.put(message('block', i))
+        self.assertEqual((subscription.depth, subscription.dropped), (2, 2))
+        subscription.close()
+        self.assertEqual([i.message async for i in subscription], [2, 3])
+
+        subscription = client.Subscription('block', maxsize=1)
+        await subscription.put(message('block', 0))
+        put = asyncio.ensure_future(subscription.put(message('block', 1)))
+        await asyncio.sleep(0.01)
+        self.assertFalse(put.done())
+        self.assertEqual((await subscription.get()).message, 0)
+        await put
+        self.assertEqual(subscription.dropped, 0)
+
+    async def test_close(self):
+        subscription = client.Subscription('block')
+        get = asyncio.ensure_future(subscription.get())
+        await asyncio.sleep(0)
+        subscription.close(ConnectionError())
+        with self.assertRaises(ConnectionError):
+            await get
+        await subscription.put(message('block'))
+        self.assertEqual(subscription.depth, 0)
+
+
+class TestListenerHub(harness.TestCase):
+
+    async def test_route(self):
+        listeners = [Listener(), Listener()]
+        async with client.ListenerHub(listeners, maxsize=10) as hub:
+            self.assertTrue(all(i.entered for i in listeners))
+            first = await hub.subscribe(f'confirmedAdded/{ADDRESS.lower()}')
+            second = await hub.subscribe(f'confirmedAdded/{ADDRESS}')
+            other = await hub.subscribe(f'confirmedAdded/{OTHER}', overflow='drop', maxsize=1)
+            blocks = await hub.subscribe('block')
+            self.assertEqual(listeners[0].channels, [f'confirmedAdded/{ADDRESS}', 'block'])
+            self.assertEqual(listeners[1].channels, [f'confirmedAdded/{OTHER}'])
+
+            await listeners[0].queue.put(message(f'confirmedAdded/{ADDRESS}', 1))
+            await listeners[1].queue.put(message(f'confirmedAdded/{OTHER}', 2))
+            await listeners[1].queue.put(message(f'confirmedAdded/{OTHER}', 3))
+            await listeners[0].queue.put(message('block', 4))
+            # Without the address, any subscription to the channel may be the recipient.
+            await listeners[1].queue.put(message('confirmedAdded', 5))
+            await asyncio.sleep(0.01)
+
+            self.assertEqual([(await first.get()).message, (await first.get()).message], [1, 5])
+            self.assertEqual((await second.get()).message, 1)
+            self.assertEqual((await other.get()).message, 2)
+            self.assertEqual((await blocks.get()).message, 4)
+            self.assertEqual(hub.depths(), {f'confirmedAdded/{ADDRESS}': 1, f'confirmedAdded/{OTHER}': 0, 'block': 0})
+            self.assertEqual(hub.dropped, 2)
+
+            await hub.unsubscribe(first)
+            self.assertIn(f'confirmedAdded/{ADDRESS}', listeners[0].channels)
+            await hub.unsubscribe(second)
+            self.assertEqual(listeners[0].channels, ['block'])
+            self.assertEqual(hub.channels, (f'confirmedAdded/{OTHER}', 'block'))
+
+        self.assertFalse(any(i.entered for i in listeners))
+        self.assertTrue(blocks.closed)
+
+    async def test_backpressure(self):
+        listeners = [Listener()]
+        async with client.ListenerHub(listeners, maxsize=1) as hub:
+            slow = await hub.subscribe('block')
+            for i in range(3):
+                await listeners[0].queue.put(message('block', i))
+            await asyncio.sleep(0.01)
+            # The reader waits for the slow subscriber, leaving messages on the connection.
+            self.assertEqual(slow.depth, 1)
+            self.assertEqual(listeners[0].queue.qsize(), 1)
+            self.assertEqual([(await slow.get()).message for _ in range(3)], [0, 1, 2])
+
+    async def test_error(self):
+        listeners = [Listener(), Listener()]
+        async with client.ListenerHub(listeners) as hub:
+            lost = await hub.subscribe('block')
+            alive = await hub.subscribe(f'status/{ADDRESS}')
+            await listeners[0].queue.put(message('block', 1))
+            await listeners[0].queue.put(ConnectionError())
+            await asyncio.sleep(0.01)
+            self.assertEqual((await lost.get()).message, 1)
+            with self.assertRaises(ConnectionError):
+                await lost.get()
+            self.assertFalse(alive.closed)
+
+    async def test_closed(self):
+        listeners = [Listener(), Listener()]
+        async with client.ListenerHub(listeners) as hub:
+            lost = await hub.subscribe('block')
+            alive = await hub.subscribe(f'status/{ADDRESS}')
+            await listeners[0].queue.put(message('block', 1))
+            # End the iterator, as a cleanly closed connection does.
+            await listeners[0].queue.put(StopAsyncIteration())
+            await asyncio.sleep(0.01)
+            self.assertEqual((await lost.get()).message, 1)
+            with self.assertRaises(ConnectionError):
+                await asyncio.wait_for(lost.get(), 1)
+            self.assertTrue(lost.closed)
+            self.assertFalse(alive.closed)
+
+    async def test_closed_rebalance(self):
+        listeners = [Listener(), Listener()]
+        async with client.ListenerHub(listeners) as hub:
+            await hub.subscribe('block')
+            await listeners[0].queue.put(StopAsyncIteration())
+            await asyncio.sleep(0.01)
+            # The channel is subscribed again, on the live listener.
+            subscription = await asyncio.wait_for(hub.subscribe('block'), 1)
+            self.assertEqual(listeners[1].channels, ['block'])
+            await listeners[1].queue.put(message('block', 2))
+            self.assertEqual((await asyncio.wait_for(subscription.get(), 1)).message, 2)
+
+            await listeners[1].queue.put(StopAsyncIteration())
+            await asyncio.sleep(0.01)
+            with self.assertRaises(ConnectionError):
+                await hub.subscribe('block')
+
+    def test_message_channel(self):
+        address = models.Address(ADDRESS)
+        self.assertEqual(abc.message_channel('confirmedAdded', {}), 'confirmedAdded')
+        meta = {'address': ADDRESS.lower()}
+        self.assertEqual(abc.message_channel('confirmedAdded', meta), f'confirmedAdded/{ADDRESS}')
+        self.assertEqual(abc.message_channel('status', {'address': address.encoded.hex()}), f'status/{ADDRESS}')
@@ -0,0 +1,137 @@
+import aiohttp
+import asyncio
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+from tests import responses
+
+ENDPOINT = 'http://localhost:3000'
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+
+
+class Overloaded(Exception):
+
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+class Backend:
+    """Fake endpoint, tracking the number of concurrent requests."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+
+    async def fetch(self, delay=0, exc=None):
+        self.active += 1
+        self.max_active = max(self.active, self.max_active)
+        try:
+            await asyncio.sleep(delay)
+            if exc is not None:
+                raise exc
+            return delay
+        finally:
+            self.active -= 1
+
+
+class TestAdaptiveLimiter(harness.TestCase):
+
+    def setUp(self):
+        self.backend = Backend()
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            client.AdaptiveLimiter(initial=8, maximum=4)
+        with self.assertRaises(ValueError):
+            client.AdaptiveLimiter(backoff=1)
+
+    async def test_queue(self):
+        limiter = client.AdaptiveLimiter(initial=3, maximum=3)
+        tasks = [limiter.run(ENDPOINT, lambda: self.backend.fetch(0.001)) for _ in range(20)]
+        self.assertEqual(await asyncio.gather(*tasks), [0.001] * 20)
+        state = limiter[ENDPOINT]
+        self.assertEqual(self.backend.max_active, 3)
+        self.assertEqual(state.requests, 20)
+        self.assertEqual(state.max_queued, 17)
+        self.assertEqual((state.in_flight, state.queued), (0, 0))
+        self.assertGreater(state.wait_time, 0)
+        self.assertEqual(list(limiter), [ENDPOINT])
+
+    async def test_increase(self):
+        limiter = client.AdaptiveLimiter(initial=2, maximum=6)
+        for _ in range(10):
+            await asyncio.gather(*(limiter.run(ENDPOINT, self.backend.fetch) for _ in range(20)))
+        self.assertEqual(limiter[ENDPOINT].limit, 6)
+        self.assertEqual(self.backend.max_active, 6)
+
+        # An idle endpoint does not grow its limit.
+        limiter = client.AdaptiveLimiter(initial=2)
+        for _ in range(20):
+            await limiter.run(ENDPOINT, self.backend.fetch)
+        self.assertEqual(limiter[ENDPOINT].limit, 2)
+
+    async def test_errors(self):
+        limiter = client.AdaptiveLimiter(initial=8)
+        state = limiter[ENDPOINT]
+        tasks = [limiter.run(ENDPOINT, lambda: self.backend.fetch(exc=Overloaded(503))) for _ in range(8)]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        self.assertTrue(all(isinstance(i, Overloaded) for i in results))
+        # Concurrent failures only back off once.
+        self.assertEqual((state.limit, state.decreases, state.errors), (4, 1, 8))
+
+        with self.assertRaises(Overloaded):
+            await limiter.run(ENDPOINT, lambda: self.backend.fetch(exc=Overloaded(404)))
+        with self.assertRaises(ValueError):
+            await limiter.run(ENDPOINT, lambda: self.backend.fetch(exc=ValueError()))
+        self.assertEqual(state.limit, 4)
+        with self.assertRaises(asyncio.TimeoutError):
+            await limiter.run(ENDPOINT, lambda: self.backend.fetch(exc=asyncio.TimeoutError()))
+        self.assertEqual(state.limit, 2)
+        for _ in range(3):
+            with self.assertRaises(Overloaded):
+                await limiter.run(ENDPOINT, lambda: self.backend.fetch(exc=Overloaded(429)))
+        self.assertEqual(state.limit, 1)
+
+    async def test_latency(self):
+        limiter = client.AdaptiveLimiter(initial=4)
+        state = limiter[ENDPOINT]
+        await limiter.run(ENDPOINT, lambda: self.backend.fetch(0.001))
+        await limiter.run(ENDPOINT, lambda: self.backend.fetch(0.005))
+        self.assertEqual(state.limit, 4)
+        await limiter.run(ENDPOINT, lambda: self.backend.fetch(0.05))
+        self.assertEqual(state.limit, 2)
+        self.assertLess(state.baseline, 0.01)
+        self.assertGreater(state.latency, state.baseline)
+
+    async def test_cancel(self):
+        limiter = client.AdaptiveLimiter(initial=1, maximum=1)
+        first = asyncio.ensure_future(limiter.run(ENDPOINT, lambda: self.backend.fetch(0.01)))
+        second = asyncio.ensure_future(limiter.run(ENDPOINT, lambda: self.backend.fetch(0.01)))
+        third = asyncio.ensure_future(limiter.run(ENDPOINT, lambda: self.backend.fetch(0.01)))
+        await asyncio.sleep(0)
+        self.assertEqual(limiter[ENDPOINT].queued, 2)
+        second.cancel()
+        self.assertEqual(await first, 0.01)
+        self.assertEqual(await third, 0.01)
+        self.assertTrue(second.cancelled())
+        self.assertEqual((limiter[ENDPOINT].in_flight, limiter[ENDPOINT].queued), (0, 0))
+
+
+class TestLimitedHTTP(harness.TestCase):
+
+    async def test_requests(self):
+        limiter = client.AdaptiveLimiter()
+        address = models.Address('SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54')
+        async with client.AsyncAccountHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, limiter=limiter) as http:
+            self.assertIs(http.raw.limiter, limiter)
+            with aiohttp.default_response(200, **responses.ACCOUNT_INFO["Ok"]):
+                await http.get_account_info(address)
+            state = limiter[http.raw.endpoint]
+            self.assertEqual(state.requests, 1)
+
+            with aiohttp.default_response(503, **responses.ACCOUNT_INFO["Ok"]):
+                with self.assertRaises(client.AsyncHTTPError):
+                    await http.get_account_info(address)
+            self.assertEqual((state.errors, state.limit), (1, 2))
@@ -1,5 +1,16 @@
+import asyncio
+import json
+import requests
+import websockets
+from unittest import mock
+
+from xpxchain import client
+from xpxchain.client import abc
 from xpxchain import models
 from tests import harness
+from tests import responses
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
 
 BLOCK_VALIDATOR = [
     lambda x: (x.channel_name, 'block'),
@@ -27,3 +38,328 @@ BLOCK_VALIDATOR = [
 })
 class TestListener(harness.TestCase):
     pass
+
+
+def load_block():
+    with client.BlockchainHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE) as http:
+        with requests.default_response(200, **responses.BLOCK_INFO["Ok"]):
+            return http.get_block_by_height(1)
+
+
+class Session:
+    """Fake websockets session, dropping after its messages."""
+
+    def __init__(self, uid, messages):
+        self.messages = [json.dumps({'uid': uid}), *messages]
+        self.sent = []
+        self.closed = False
+
+    async def recv(self):
+        if not self.messages:
+            raise websockets.ConnectionClosed()
+        return self.messages.pop(0)
+
+    async def __aiter__(self):
+        while True:
+            yield await self.recv()
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    async def close(self):
+        self.closed = True
+
+
+class SlowSession(Session):
+    """Fake websockets session, taking a while to write each frame."""
+
+    def __init__(self, uid, messages, delay):
+        super().__init__(uid, messages)
+        self.delay = delay
+        self.active = 0
+        self.concurrency = 0
+
+    async def send(self, message):
+        self.active += 1
+        self.concurrency = max(self.concurrency, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            await super().send(message)
+        finally:
+            self.active -= 1
+
+
+class Server:
+    """Fake websockets server, accepting one connection per session."""
+
+    def __init__(self, *sessions):
+        self.sessions = list(sessions)
+
+    def connect(self, url, **kwds):
+        server = self
+
+        class Connection:
+            async def __aenter__(self):
+                session = server.sessions.pop(0)
+                if isinstance(session, Exception):
+                    raise session
+                return session
+
+            async def __aexit__(self, exc_type, exc, tb):
+                pass
+
+        return Connection()
+
+
+class Chain:
+    """Fake blockchain client, backfilling blocks up to `height`."""
+
+    def __init__(self, block, height):
+        self.block = block
+        self.height = height
+        self.starts = []
+        self.yielded = 0
+
+    async def iter_blocks(self, start):
+        self.starts.append(start)
+        for height in range(start, self.height + 1):
+            self.yielded += 1
+            yield self.block.replace(height=height)
+
+
+class TestReconnectingListener(harness.TestCase):
+
+    async def test_reconnect(self):
+        block = load_block()
+        message = lambda x: json.dumps(block.replace(height=x).to_dto(NETWORK_TYPE))
+        first = Session('A', [message(1), message(2)])
+        second = Session('B', [message(4), message(5), message(6)])
+        server = Server(first, OSError('Connection refused'), second)
+        chain = Chain(block, 4)
+        policy = client.RetryPolicy(backoff=0.001)
+
+        with mock.patch.object(websockets, 'connect', server.connect):
+            listener = client.ReconnectingListener(
+                responses.ENDPOINT,
+                network_type=NETWORK_TYPE,
+                retry=policy,
+                http=chain,
+            )
+            async with listener:
+                await listener.new_block()
+                self.assertEqual(listener.channels, ('block',))
+                heights = []
+                async for item in listener:
+                    self.assertEqual(item.channel_name, 'block')
+                    heights.append(item.message.height)
+                    if len(heights) == 6:
+                        break
+
+        self.assertEqual(heights, [1, 2, 3, 4, 5, 6])
+        self.assertEqual(chain.starts, [3])
+        self.assertEqual(listener.reconnects, 1)
+        self.assertEqual(first.sent, [{'uid': 'A', 'subscribe': 'block'}])
+        self.assertEqual(second.sent, [{'uid': 'B', 'subscribe': 'block'}])
+
+    async def test_streamed_backfill(self):
+        block = load_block()
+        message = lambda x: json.dumps(block.replace(height=x).to_dto(NETWORK_TYPE))
+        server = Server(Session('A', [message(1)]), Session('B', [message(500)]))
+        chain = Chain(block, 499)
+        policy = client.RetryPolicy(backoff=0.001)
+
+        with mock.patch.object(websockets, 'connect', server.connect):
+            listener = client.ReconnectingListener(
+                responses.ENDPOINT,
+                network_type=NETWORK_TYPE,
+                retry=policy,
+                http=chain,
+            )
+            async with listener:
+                await listener.new_block()
+                heights = []
+                async for item in listener:
+                    heights.append(item.message.height)
+                    if len(heights) == 2:
+                        # Backfilled blocks are delivered as they are downloaded.
+                        self.assertEqual(chain.yielded, 1)
+                    if len(heights) == 500:
+                        break
+
+        self.assertEqual(heights, list(range(1, 501)))
+        self.assertEqual(chain.yielded, 498)
+
+    async def test_lazy_backfill(self):
+        block = load_block()
+        message = lambda x: json.dumps(block.replace(height=x).to_dto(NETWORK_TYPE))
+        first = Session('A', [message(1)])
+        second = Session('B', [message(3)])
+        server = Server(first, second)
+        chain = Chain(block, 2)
+        policy = client.RetryPolicy(backoff=0.001)
+
+        with mock.patch.object(websockets, 'connect', server.connect):
+            listener = client.ReconnectingListener(
+                responses.ENDPOINT,
+                network_type=NETWORK_TYPE,
+                retry=policy,
+                http=chain,
+                lazy=True,
+            )
+            async with listener:
+                await listener.new_block()
+                items = []
+                async for item in listener:
+                    items.append(item)
+                    if len(items) == 3:
+                        break
+
+        # Backfilled blocks are wrapped like the live blocks.
+        self.assertEqual(chain.starts, [2])
+        self.assertTrue(all(isinstance(i, abc.LazyListenerMessage) for i in items))
+        self.assertEqual([i.height for i in items], [1, 2, 3])
+        backfilled = items[1]
+        self.assertEqual((backfilled.channel, backfilled.hash), ('block', block.hash))
+        self.assertEqual(backfilled.signer, block.signer.public_key)
+        self.assertEqual(json.loads(backfilled.raw), json.loads(message(2)))
+        self.assertEqual(backfilled.decode(), abc.ListenerMessage('block', block.replace(height=2), 'block'))
+
+    async def test_unsubscribe(self):
+        address = models.Address('SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54')
+        first = Session('A', [])
+        second = Session('B', [])
+        server = Server(first, second, OSError('Connection refused'), OSError('Connection refused'))
+        policy = client.RetryPolicy(attempts=2, backoff=0.001)
+
+        with mock.patch.object(websockets, 'connect', server.connect):
+            listener = client.ReconnectingListener(responses.ENDPOINT, network_type=NETWORK_TYPE, retry=policy)
+            async with listener:
+                await listener.status(address)
+                await listener.confirmed(address)
+                await listener.unsubscribe(f'status/{address.address}')
+                self.assertEqual(listener.channels, (f'confirmedAdded/{address.address}',))
+                with self.assertRaises(OSError):
+                    await listener.__anext__()
+
+        self.assertEqual(second.sent, [{'uid': 'B', 'subscribe': f'confirmedAdded/{address.address}'}])
+        self.assertEqual(listener.reconnects, 1)
+
+
+class TestLazyListenerMessage(harness.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.codec = client.DEFAULT_CODEC
+        self.transaction = json.loads(responses.TRANSACTION['Ok']['content'])
+        self.transaction['meta']['channelName'] = 'confirmedAdded'
+        self.transaction['meta']['address'] = 'SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54'
+
+    def test_transaction(self):
+        raw = json.dumps(self.transaction)
+        message = abc.LazyListenerMessage(raw, self.codec)
+        self.assertIs(message.raw, raw)
+        self.assertEqual(message.kind, 'transaction')
+        self.assertEqual(message.channel_name, 'confirmedAdded')
+        self.assertEqual(message.channel, 'confirmedAdded/SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54')
+        self.assertEqual(message.hash, '47490969DB1960AD8565E67700C47FE41BBE07C6F490A66D3001AC46B6684600')
+        self.assertEqual(message.height, 158158)
+        self.assertEqual(message.signer, self.transaction['transaction']['signer'])
+        self.assertIsNone(message._decoded)
+
+        eager = abc.decode_message(json.loads(raw))
+        self.assertIs(message.message, message.message)
+        self.assertEqual(message.decode(), eager)
+        self.assertIsInstance(message.message, models.TransferTransaction)
+
+    def test_block(self):
+        block = load_block().replace(height=7)
+        message = abc.LazyListenerMessage(json.dumps(block.to_dto(NETWORK_TYPE)), self.codec)
+        self.assertEqual((message.kind, message.channel_name, message.channel), ('block', 'block', 'block'))
+        self.assertEqual((message.height, message.signer), (7, block.signer.public_key))
+        self.assertEqual(message.hash, block.hash)
+        self.assertEqual(message.message, block)
+
+    def test_meta(self):
+        raw = json.dumps({'meta': {'channelName': 'unconfirmedRemoved', 'hash': 'AB' * 32}})
+        message = abc.LazyListenerMessage(raw, self.codec)
+        self.assertEqual((message.kind, message.channel), ('meta', 'unconfirmedRemoved'))
+        self.assertEqual(message.hash, 'AB' * 32)
+        self.assertIsNone(message.height)
+        self.assertIsNone(message.signer)
+        self.assertEqual(message.message, 'AB' * 32)
+
+    def test_invalid(self):
+        message = abc.LazyListenerMessage('{"unknown": 1}', self.codec)
+        with self.assertRaises(ValueError):
+            message.channel
+
+    async def test_listener(self):
+        block = load_block()
+        session = Session('A', [json.dumps(block.replace(height=2).to_dto(NETWORK_TYPE))])
+        server = Server(session)
+        with mock.patch.object(websockets, 'connect', server.connect):
+            async with client.Listener(responses.ENDPOINT, network_type=NETWORK_TYPE, lazy=True) as listener:
+                await listener.new_block()
+                message = await listener.__anext__()
+        self.assertIsInstance(message, abc.LazyListenerMessage)
+        self.assertEqual(message.height, 2)
+
+
+class TestBulkSubscribe(harness.TestCase):
+
+    async def test_subscribe_many(self):
+        addresses = [f'SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRI{i:03d}' for i in range(1500)]
+        channels = [f'{name}/{i}' for i in addresses for name in ('confirmedAdded', 'status')]
+        session = Session('A', [])
+        server = Server(session)
+        reports = []
+        with mock.patch.object(websockets, 'connect', server.connect):
+            async with client.Listener(responses.ENDPOINT, network_type=NETWORK_TYPE) as listener:
+                await listener.new_block()
+                progress = lambda *x: reports.append(x)
+                added = await listener.subscribe_many(['block', *channels, *channels], progress=progress)
+                self.assertEqual(added, channels)
+                self.assertEqual(reports, [(1000, 3000), (2000, 3000), (3000, 3000)])
+                self.assertEqual(len(listener.channels), 3001)
+
+                # Only the difference is sent.
+                session.sent.clear()
+                kept = channels[:10] + ['block']
+                added, removed = await listener.update_channels(kept + ['unconfirmedAdded/' + addresses[0]])
+                self.assertEqual(added, ['unconfirmedAdded/' + addresses[0]])
+                self.assertEqual(removed, channels[10:])
+                self.assertEqual(len(session.sent), 2991)
+                self.assertEqual(session.sent[0], {'uid': 'A', 'unsubscribe': channels[10]})
+                self.assertEqual(session.sent[-1], {'uid': 'A', 'subscribe': 'unconfirmedAdded/' + addresses[0]})
+
+                removed = await listener.unsubscribe_many(['block', 'block', 'unknown'])
+                self.assertEqual(removed, ['block'])
+                self.assertEqual(listener.channels, tuple(channels[:10]) + ('unconfirmedAdded/' + addresses[0],))
+
+    async def test_rate(self):
+        session = Session('A', [])
+        server = Server(session)
+        with mock.patch.object(websockets, 'connect', server.connect):
+            async with client.Listener(responses.ENDPOINT, network_type=NETWORK_TYPE) as listener:
+                with self.assertRaises(ValueError):
+                    await listener.subscribe_many(['block'], rate=0)
+                loop = asyncio.get_event_loop()
+                start = loop.time()
+                await listener.subscribe_many([f'status/{i}' for i in range(6)], rate=100)
+                self.assertGreaterEqual(loop.time() - start, 0.05)
+        self.assertEqual(len(session.sent), 6)
+
+    async def test_pipelined(self):
+        session = SlowSession('A', [], 0.05)
+        server = Server(session)
+        channels = [f'status/{i}' for i in range(250)]
+        with mock.patch.object(websockets, 'connect', server.connect):
+            async with client.Listener(responses.ENDPOINT, network_type=NETWORK_TYPE) as listener:
+                loop = asyncio.get_event_loop()
+                start = loop.time()
+                await listener.subscribe_many(channels)
+                # Frames do not wait on each other, only on their batch.
+                self.assertLess(loop.time() - start, 1)
+                self.assertEqual(session.concurrency, abc.SEND_BATCH)
+                self.assertEqual([i['subscribe'] for i in session.sent], channels)
+                self.assertEqual(listener.channels, tuple(channels))
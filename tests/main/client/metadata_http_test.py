@@ -88,7 +88,7 @@ from xpxchain import util
         {
             'name': 'test_get_metadatas',
             'response': responses.METADATAS["Ok"],
-            'params': [[models.Address('SCV36Q2G5CJ2R2SOIIGG3O46X2N6SGAM2QCW5KRI')]],
+            'params': [['SCV36Q2G5CJ2R2SOIIGG3O46X2N6SGAM2QCW5KRI']],
             'method': 'get_metadatas',
             'validation': [
                 lambda x: (len(x), 1),
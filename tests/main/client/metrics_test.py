@@ -0,0 +1,121 @@
+import aiohttp
+import requests
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+from tests import responses
+from tests.main.client.retry_test import Server
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+
+
+class TestRequestMetrics(harness.TestCase):
+
+    def test_snapshot(self):
+        metrics = client.RequestMetrics(buckets=(0.1, 0.01, 1))
+        self.assertEqual(metrics.buckets, (0.01, 0.1, 1))
+        metrics.record('get_block_by_height', 0.05, 0.002, 100)
+        metrics.record('get_block_by_height', 2.0, 0.5, 50)
+        metrics.record('get_block_by_height', 0.1, error=True)
+        metrics.record('get_account_info', 0.005, 0.001, 10)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(list(snapshot), ['get_account_info', 'get_block_by_height'])
+        stats = snapshot['get_block_by_height']
+        self.assertEqual((stats.requests, stats.errors, stats.bytes), (3, 1, 150))
+        self.assertAlmostEqual(stats.network_time, 2.15)
+        self.assertAlmostEqual(stats.decode_time, 0.502)
+        self.assertEqual(stats.network_histogram, (0, 2, 0, 1))
+        self.assertEqual(stats.decode_histogram, (1, 0, 1, 0))
+
+        # Snapshots are not affected by later requests.
+        metrics.record('get_account_info', 0.005)
+        self.assertEqual(snapshot['get_account_info'].requests, 1)
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_prometheus(self):
+        metrics = client.RequestMetrics(buckets=(0.01, 0.1))
+        self.assertNotIn('{', metrics.prometheus())
+        metrics.record('get_account_info', 0.05, 0.002, 10)
+        metrics.record('get_account_info', 0.5, error=True)
+        lines = metrics.prometheus('nem').splitlines()
+        self.assertIn('# TYPE nem_requests_total counter', lines)
+        self.assertIn('nem_requests_total{name="get_account_info"} 2', lines)
+        self.assertIn('nem_request_errors_total{name="get_account_info"} 1', lines)
+        self.assertIn('nem_response_bytes_total{name="get_account_info"} 10', lines)
+        self.assertIn('# TYPE nem_request_duration_seconds histogram', lines)
+        labels = 'name="get_account_info",phase="network"'
+        self.assertIn(f'nem_request_duration_seconds_bucket{{{labels},le="0.01"}} 0', lines)
+        self.assertIn(f'nem_request_duration_seconds_bucket{{{labels},le="0.1"}} 1', lines)
+        self.assertIn(f'nem_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2', lines)
+        self.assertIn(f'nem_request_duration_seconds_count{{{labels}}} 2', lines)
+        labels = 'name="get_account_info",phase="decode"'
+        self.assertIn(f'nem_request_duration_seconds_bucket{{{labels},le="0.01"}} 1', lines)
+        self.assertIn(f'nem_request_duration_seconds_sum{{{labels}}} 0.002', lines)
+
+
+class TestInstrumentedHTTP(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.AccountHTTP, requests, {}, client.HTTPError),
+        async_data=(client.AsyncAccountHTTP, aiohttp, {'loop': None}, client.AsyncHTTPError)
+    )
+    async def test_requests(self, data, await_cb, with_cb):
+        metrics = client.RequestMetrics()
+        address = models.Address('SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54')
+        http = data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, metrics=metrics, **data[2])
+        async with with_cb(http) as http:
+            self.assertIs(http.raw.metrics, metrics)
+            with data[1].default_response(200, **responses.ACCOUNT_INFO["Ok"]):
+                await await_cb(http.get_account_info(address))
+            with data[1].default_response(404, **responses.ACCOUNT_INFO["Ok"]):
+                with self.assertRaises(data[3]):
+                    await await_cb(http.get_account_info(address))
+
+        stats = metrics.snapshot()['get_account_info']
+        self.assertEqual((stats.requests, stats.errors), (2, 1))
+        self.assertEqual(stats.bytes, len(responses.ACCOUNT_INFO["Ok"]['content']))
+        self.assertEqual(sum(stats.network_histogram), 2)
+        self.assertEqual(sum(stats.decode_histogram), 1)
+        self.assertGreater(stats.decode_time, 0)
+
+    @harness.async_test(
+        sync_data=(client.AccountHTTP, requests, {}),
+        async_data=(client.AsyncAccountHTTP, aiohttp, {'loop': None})
+    )
+    async def test_decode_error(self, data, await_cb, with_cb):
+        metrics = client.RequestMetrics()
+        address = models.Address('SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54')
+        http = data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, metrics=metrics, **data[2])
+        async with with_cb(http) as http:
+            with data[1].default_response(200, content=b'{"account": '):
+                with self.assertRaises(ValueError):
+                    await await_cb(http.get_account_info(address))
+
+        stats = metrics.snapshot()['get_account_info']
+        self.assertEqual((stats.requests, stats.errors), (1, 1))
+        self.assertEqual(sum(stats.decode_histogram), 0)
+
+    @harness.async_test(
+        sync_data=(client.AccountHTTP, requests, 'request', 'sync', requests.ConnectionError),
+        async_data=(client.AsyncAccountHTTP, aiohttp, '_request', 'async_', aiohttp.ServerDisconnectedError)
+    )
+    async def test_retries(self, data, await_cb, with_cb):
+        metrics = client.RequestMetrics()
+        policy = client.RetryPolicy(backoff=0.1, jitter=False)
+        address = models.Address('SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54')
+        http = data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, metrics=metrics, retry=policy)
+        async with with_cb(http) as http:
+            session = http.raw._session
+            server = Server(getattr(session, data[2]), [data[4](), data[4]()])
+            with mock.patch.object(session, data[2], getattr(server, data[3])):
+                with data[1].default_response(200, **responses.ACCOUNT_INFO["Ok"]):
+                    await await_cb(http.get_account_info(address))
+
+        # Each attempt is recorded, without the delays between retries.
+        stats = metrics.snapshot()['get_account_info']
+        self.assertEqual((stats.requests, stats.errors), (3, 2))
+        self.assertLess(stats.network_time, 0.1)
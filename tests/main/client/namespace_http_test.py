@@ -59,6 +59,16 @@ from tests import responses
                 lambda x: (x[0].meta_id, '5C7C07005CC1FE000176FA2B'),
             ]
         },
+        {
+            'name': 'test_get_namespaces_from_accounts_bulk',
+            'response': responses.NAMESPACES["nem"],
+            'params': [[models.Address('SD3MA6SM7GWRX4DEJVAZEGFXF7G7D36MA6TMSIBM')] * 3, 2],
+            'method': 'get_namespaces_from_accounts_bulk',
+            'validation': [
+                lambda x: (len(x), 2),
+                lambda x: (x[1].meta_id, '5C7C07005CC1FE000176FA2B'),
+            ]
+        },
         {
             'name': 'test_get_linked_mosaic_id',
             'response': responses.NAMESPACE["nem"],
@@ -0,0 +1,162 @@
+import aiohttp
+import requests
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+from tests import responses
+from tests.main.client.account_http_test import take
+from tests.main.client.blocks_test import FakeChain, collect
+
+ENDPOINTS = [f'{responses.ENDPOINT}/{i}' for i in range(3)]
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+PUBLIC_ACCOUNT = models.PublicAccount.create_from_public_key(
+    '7A562888C7AE1E082579951D6D93BF931DE979360ACCA4C4085D754E5E122808',
+    NETWORK_TYPE,
+)
+
+
+class TestNodeStats(harness.TestCase):
+
+    def test_record(self):
+        stats = client.NodeStats(ENDPOINTS[0])
+        stats.record_success(1.0, 0.5)
+        self.assertEqual(stats.latency, 1.0)
+        stats.record_success(2.0, 0.5)
+        self.assertEqual(stats.latency, 1.5)
+        stats.record_error(0.5)
+        self.assertEqual(stats.error_rate, 0.5)
+        stats.record_success(1.5, 0.5)
+        self.assertEqual(stats.error_rate, 0.25)
+        self.assertEqual(stats.requests, 4)
+        self.assertEqual(stats.errors, 1)
+
+
+class TestNodePool(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.NodePool, requests, client.HTTPError),
+        async_data=(client.AsyncNodePool, aiohttp, client.AsyncHTTPError)
+    )
+    async def test_routing(self, data, await_cb, with_cb):
+        pool = data[0](
+            ENDPOINTS,
+            network_type=models.NetworkType.MIJIN_TEST,
+            interval=None,
+            max_error_rate=0.1,
+        )
+        with data[1].default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+            async with with_cb(pool) as pool:
+                # Probed on entry.
+                stats = pool.stats
+                self.assertEqual([stats[i].height for i in ENDPOINTS], [53577] * 3)
+                self.assertEqual([stats[i].requests for i in ENDPOINTS], [1] * 3)
+
+                # Inject latencies, so the routing does not depend on
+                # the latency of the mocked requests.
+                for index, endpoint in enumerate(ENDPOINTS):
+                    pool._stats[endpoint].latency = 10.0 * index
+                self.assertEqual(pool.rank(), ENDPOINTS)
+                self.assertEqual(await await_cb(pool.get_blockchain_height()), 53577)
+                self.assertEqual(pool.stats[ENDPOINTS[0]].requests, 2)
+                self.assertEqual(pool.best, ENDPOINTS[0])
+
+                # Node errors mark the node as unhealthy.
+                best = ENDPOINTS[0]
+                with data[1].default_exception(data[2]):
+                    with self.assertRaises(data[2]):
+                        await await_cb(pool.get_blockchain_height())
+                self.assertFalse(pool.is_healthy(best))
+                self.assertEqual(pool.best, ENDPOINTS[1])
+                self.assertEqual(pool.rank()[-1], best)
+
+                # Probes let the node recover.
+                for _ in range(10):
+                    await await_cb(pool.refresh())
+                self.assertTrue(pool.is_healthy(best))
+
+    @harness.async_test(
+        sync_data=(client.NodePool, requests),
+        async_data=(client.AsyncNodePool, aiohttp)
+    )
+    async def test_height_lag(self, data, await_cb, with_cb):
+        pool = data[0](ENDPOINTS, network_type=models.NetworkType.MIJIN_TEST, interval=None)
+        with data[1].default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+            async with with_cb(pool) as pool:
+                pool._record_height(ENDPOINTS[1], 53580)
+                self.assertEqual(pool.best, ENDPOINTS[1])
+                self.assertFalse(pool.is_healthy(ENDPOINTS[0]))
+                self.assertFalse(pool.is_healthy(ENDPOINTS[2]))
+
+    def test_empty(self):
+        with self.assertRaises(ValueError):
+            client.NodePool([])
+
+
+class TestNodePoolRequests(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.NodePool, requests),
+        async_data=(client.AsyncNodePool, aiohttp)
+    )
+    async def test_bulk(self, data, await_cb, with_cb):
+        pool = data[0](ENDPOINTS, network_type=NETWORK_TYPE, interval=None)
+        address = models.Address('SCBO3CAFOVAOGYBAHQKPUOGLAYWFLNJUFFCH3RYY')
+        with data[1].default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+            async with with_cb(pool) as pool:
+                with data[1].default_response(200, **responses.ACCOUNTS_INFO["Ok"]):
+                    infos = await await_cb(pool.get_accounts_info_bulk([address] * 5, 2))
+                self.assertEqual(len(infos), 3)
+                # 3 probes and 1 request per chunk.
+                self.assertEqual(sum(i.requests for i in pool.stats.values()), 6)
+
+    @harness.async_test(
+        sync_data=(client.NodePool, requests),
+        async_data=(client.AsyncNodePool, aiohttp)
+    )
+    async def test_paginate(self, data, await_cb, with_cb):
+        pool = data[0](ENDPOINTS, network_type=NETWORK_TYPE, interval=None)
+        with data[1].default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+            async with with_cb(pool) as pool:
+                with data[1].default_response(200, **responses.BLOCK_TRANSACTIONS["Ok"]):
+                    transactions = await take(pool.iter_transactions(PUBLIC_ACCOUNT, page_size=1), 3)
+                self.assertEqual(len(transactions), 3)
+                # 3 probes and 1 request per page, with the next page
+                # possibly prefetched.
+                self.assertIn(sum(i.requests for i in pool.stats.values()), (6, 7))
+
+    @harness.async_test(
+        sync_data=(client.NodePool, requests),
+        async_data=(client.AsyncNodePool, aiohttp)
+    )
+    async def test_iter_blocks(self, data, await_cb, with_cb):
+        pool = data[0](ENDPOINTS, network_type=NETWORK_TYPE, interval=None)
+        chain = FakeChain(30, missing=(4,))
+        with data[1].default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+            async with with_cb(pool) as pool:
+                with chain.patch():
+                    blocks = await collect(pool.iter_blocks(1, 21, limit=5, concurrency=2))
+                self.assertEqual([i.height for i in blocks], list(range(1, 21)))
+                self.assertIn(('block', 4), chain.calls)
+                # 3 probes, 4 windows and 1 missing block.
+                self.assertEqual(sum(i.requests for i in pool.stats.values()), 8)
+
+    @harness.async_test(
+        sync_data=(client.NodePool, requests, client.HTTPError),
+        async_data=(client.AsyncNodePool, aiohttp, client.AsyncHTTPError)
+    )
+    async def test_stream(self, data, await_cb, with_cb):
+        pool = data[0](ENDPOINTS, network_type=NETWORK_TYPE, interval=None)
+        with data[1].default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+            async with with_cb(pool) as pool:
+                with data[1].default_response(200, **responses.BLOCK_TRANSACTIONS["Ok"]):
+                    expected = await await_cb(pool.get_block_transactions(1))
+                    transactions = await collect(pool.stream_block_transactions(1))
+                self.assertEqual(transactions, expected)
+
+                # Errors while streaming are recorded against the node.
+                best = pool.best
+                with data[1].default_exception(data[2]):
+                    with self.assertRaises(data[2]):
+                        await collect(pool.stream_block_transactions(1))
+                self.assertEqual(pool.stats[best].errors, 1)
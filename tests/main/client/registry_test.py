@@ -0,0 +1,104 @@
+import aiohttp
+import asyncio
+import requests
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client import registry
+from tests import harness
+from tests import responses
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+GENERATION_HASH = '7CCDF81A60B0A03A3B30D715C5C7513916319C09215E22C67B0A81106FB21445'
+
+
+class TestNetworkRegistry(harness.TestCase):
+
+    def test_endpoint_key(self):
+        self.assertEqual(registry.endpoint_key('//localhost:3000'), 'localhost:3000')
+        self.assertEqual(registry.endpoint_key('http://LOCALHOST:3000/path'), 'localhost:3000')
+        self.assertEqual(registry.endpoint_key('ws://localhost:3000/ws'), 'localhost:3000')
+        self.assertEqual(registry.endpoint_key('https://localhost'), 'localhost:443')
+        self.assertEqual(registry.endpoint_key('wss://localhost'), 'localhost:443')
+
+    def test_seed(self):
+        networks = client.NetworkRegistry()
+        self.assertIsNone(networks.get('//localhost:3000', 'network_type'))
+        networks.seed('//localhost:3000', network_type=NETWORK_TYPE)
+        self.assertEqual(networks.get('http://localhost:3000', 'network_type'), NETWORK_TYPE)
+        self.assertIsNone(networks.get('//localhost:3000', 'generation_hash'))
+
+        networks.load({
+            'ws://localhost:3000/ws': {'networkType': 'public', 'generationHash': GENERATION_HASH},
+            '//localhost:3001': {'network_type': int(NETWORK_TYPE)},
+        })
+        self.assertEqual(networks.get('//localhost:3000', 'network_type'), models.NetworkType.MAIN_NET)
+        self.assertEqual(networks.get('//localhost:3000', 'generation_hash'), GENERATION_HASH)
+        self.assertEqual(networks.get('//localhost:3001', 'network_type'), NETWORK_TYPE)
+        self.assertIn('//localhost:3001', networks)
+
+        networks.clear('//localhost:3001')
+        self.assertNotIn('//localhost:3001', networks)
+        networks.clear()
+        self.assertNotIn('//localhost:3000', networks)
+
+
+class TestRegistryHTTP(harness.TestCase):
+
+    def setUp(self):
+        client.NETWORK_REGISTRY.clear()
+
+    def tearDown(self):
+        client.NETWORK_REGISTRY.clear()
+
+    @harness.async_test(
+        sync_data=(client.HTTP, requests, {}),
+        async_data=(client.AsyncHTTP, aiohttp, {'loop': None})
+    )
+    async def test_shared(self, data, await_cb, with_cb):
+        async with with_cb(data[0](responses.ENDPOINT, **data[2])) as http:
+            with data[1].default_response(200, **responses.NETWORK_TYPE["MIJIN_TEST"]):
+                self.assertEqual(await await_cb(http.account.network_type), NETWORK_TYPE)
+            with data[1].default_response(200, **responses.BLOCK_INFO["Ok"]):
+                generation_hash = await await_cb(http.generation_hash)
+            self.assertEqual(generation_hash, GENERATION_HASH)
+
+        # Resolved once for every client to the same node.
+        async with with_cb(data[0](responses.ENDPOINT, **data[2])) as http:
+            self.assertEqual(await await_cb(http.transaction.network_type), NETWORK_TYPE)
+            self.assertEqual(await await_cb(http.generation_hash), GENERATION_HASH)
+
+    @harness.async_test(
+        sync_data=(client.HTTP, requests, {}),
+        async_data=(client.AsyncHTTP, aiohttp, {'loop': None})
+    )
+    async def test_seeded(self, data, await_cb, with_cb):
+        client.NETWORK_REGISTRY.seed(responses.ENDPOINT, network_type='mijinTest')
+        async with with_cb(data[0](responses.ENDPOINT, **data[2])) as http:
+            self.assertEqual(await await_cb(http.network_type), NETWORK_TYPE)
+
+    async def test_coalesced(self):
+        resolve = mock.Mock(wraps=registry.async_network_type)
+        with mock.patch.object(registry, 'async_network_type', resolve):
+            with aiohttp.default_response(200, **responses.NETWORK_TYPE["MIJIN_TEST"]):
+                clients = [client.AsyncHTTP(responses.ENDPOINT) for _ in range(4)]
+                for http in clients:
+                    await http.__aenter__()
+                try:
+                    network_types = await asyncio.gather(*(i.network_type for i in clients))
+                finally:
+                    for http in clients:
+                        await http.close()
+        self.assertEqual(network_types, [NETWORK_TYPE] * 4)
+        self.assertEqual(resolve.call_count, 1)
+
+    async def test_listener(self):
+        client.NETWORK_REGISTRY.seed(
+            responses.ENDPOINT,
+            network_type=NETWORK_TYPE,
+            generation_hash=GENERATION_HASH,
+        )
+        listener = client.Listener(f'{responses.ENDPOINT}/ws')
+        self.assertEqual(await listener.network_type, NETWORK_TYPE)
+        self.assertEqual(await listener.generation_hash, GENERATION_HASH)
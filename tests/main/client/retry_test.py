@@ -0,0 +1,194 @@
+import aiohttp
+import asyncio
+import requests
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+from tests import responses
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+ADDRESS = models.Address('SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54')
+
+
+class Server:
+    """Wrap a mocked session, failing or delaying some requests."""
+
+    def __init__(self, request, errors=(), delays=None):
+        self.request = request
+        self.errors = list(errors)
+        self.delays = delays or {}
+        self.urls = []
+        self.timeouts = []
+
+    def sync(self, method, url, **kwds):
+        self.urls.append(url)
+        self.timeouts.append(kwds.get('timeout'))
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.request(method, url, **kwds)
+
+    async def async_(self, method, url, **kwds):
+        self.urls.append(url)
+        for prefix, delay in self.delays.items():
+            if url.startswith(prefix):
+                await asyncio.sleep(delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        return await self.request(method, url, **kwds)
+
+
+def http_error(status):
+    return requests.HTTPError(f'Error: {status}', response=requests.Response.mock(status))
+
+
+class TestRetryPolicy(harness.TestCase):
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            client.RetryPolicy(attempts=0)
+        with self.assertRaises(ValueError):
+            client.RetryPolicy(hedge_percentile=1)
+
+    def test_delay(self):
+        policy = client.RetryPolicy(backoff=0.1, max_backoff=0.5, jitter=False)
+        self.assertEqual([policy.delay(i) for i in range(1, 6)], [0.1, 0.2, 0.4, 0.5, 0.5])
+        policy = client.RetryPolicy(backoff=0.1, max_backoff=0.5)
+        for _ in range(20):
+            self.assertTrue(0 <= policy.delay(3) <= 0.4)
+
+    def test_is_retryable(self):
+        policy = client.RetryPolicy(statuses={503})
+        self.assertTrue(policy.is_retryable(http_error(503)))
+        self.assertFalse(policy.is_retryable(http_error(500)))
+        self.assertFalse(policy.is_retryable(http_error(404)))
+        self.assertTrue(policy.is_retryable(aiohttp.ClientResponseError(status=503)))
+        self.assertTrue(policy.is_retryable(requests.ConnectionError()))
+        self.assertTrue(policy.is_retryable(asyncio.TimeoutError()))
+        self.assertTrue(policy.is_retryable(aiohttp.ServerDisconnectedError()))
+        self.assertFalse(policy.is_retryable(ValueError()))
+
+
+class TestRetryHTTP(harness.TestCase):
+
+    def get_account_info(self, policy, errors):
+        with client.AccountHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, retry=policy) as http:
+            server = Server(http.raw._session.request, errors)
+            with mock.patch.object(http.raw._session, 'request', server.sync):
+                with requests.default_response(200, **responses.ACCOUNT_INFO["Ok"]):
+                    try:
+                        return http.get_account_info(ADDRESS)
+                    finally:
+                        self.attempts = len(server.urls)
+
+    def test_sync(self):
+        policy = client.RetryPolicy(backoff=0.001)
+        info = self.get_account_info(policy, [requests.ConnectionError(), http_error(503)])
+        self.assertIsInstance(info, models.AccountInfo)
+        self.assertEqual((self.attempts, policy.retries), (3, 2))
+
+        with self.assertRaises(requests.HTTPError):
+            self.get_account_info(policy, [http_error(503)] * 3)
+        self.assertEqual(self.attempts, 3)
+
+        with self.assertRaises(requests.HTTPError):
+            self.get_account_info(policy, [http_error(404)])
+        self.assertEqual(self.attempts, 1)
+
+    def test_budget(self):
+        policy = client.RetryPolicy(attempts=10, backoff=0.05, jitter=False, budget=0.1)
+        with self.assertRaises(requests.ConnectionError):
+            self.get_account_info(policy, [requests.ConnectionError()] * 10)
+        # Retries after 0.05s, then the 0.1s delay exceeds the budget.
+        self.assertEqual(self.attempts, 2)
+
+    def test_budget_timeout(self):
+        policy = client.RetryPolicy(backoff=0.05, jitter=False, budget=0.5)
+        with client.AccountHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, retry=policy, timeout=5) as http:
+            server = Server(http.raw._session.request, [requests.ConnectionError()])
+            with mock.patch.object(http.raw._session, 'request', server.sync):
+                with requests.default_response(200, **responses.ACCOUNT_INFO["Ok"]):
+                    http.get_account_info(ADDRESS)
+                    http.get_account_info(ADDRESS, timeout=(0.1, 1))
+        # Each attempt is capped to the time left in the budget.
+        self.assertTrue(0.45 < server.timeouts[0] <= 0.5)
+        self.assertLess(server.timeouts[1], server.timeouts[0] - 0.04)
+        self.assertEqual(server.timeouts[2][0], 0.1)
+        self.assertTrue(0.45 < server.timeouts[2][1] <= 0.5)
+
+    def test_not_idempotent(self):
+        policy = client.RetryPolicy(backoff=0.001)
+        with client.TransactionHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, retry=policy) as http:
+            server = Server(http.raw._session.request, [requests.ConnectionError()])
+            with mock.patch.object(http.raw._session, 'request', server.sync):
+                with self.assertRaises(requests.ConnectionError):
+                    http.announce(models.SignedTransaction('00', '00' * 32, '00' * 32, 0x4154, NETWORK_TYPE))
+        self.assertEqual(len(server.urls), 1)
+
+    async def test_async(self):
+        policy = client.RetryPolicy(backoff=0.001)
+        async with client.AsyncAccountHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, retry=policy) as http:
+            self.assertIs(http.raw.retry, policy)
+            errors = [aiohttp.ServerDisconnectedError(), aiohttp.ClientResponseError(status=502)]
+            server = Server(http.raw._session._request, errors)
+            with mock.patch.object(http.raw._session, '_request', server.async_):
+                with aiohttp.default_response(200, **responses.ACCOUNT_INFO["Ok"]):
+                    info = await http.get_account_info(ADDRESS)
+                with aiohttp.default_response(404, **responses.ACCOUNT_INFO["Ok"]):
+                    with self.assertRaises(client.AsyncHTTPError):
+                        await http.get_account_info(ADDRESS)
+        self.assertIsInstance(info, models.AccountInfo)
+        self.assertEqual(len(server.urls), 4)
+        self.assertEqual(policy.retries, 2)
+
+    async def test_async_budget(self):
+        policy = client.RetryPolicy(budget=0.1)
+        async with client.AsyncAccountHTTP('//localhost:3000', network_type=NETWORK_TYPE, retry=policy) as http:
+            server = Server(http.raw._session._request, delays={'http://localhost:3000': 1})
+            with mock.patch.object(http.raw._session, '_request', server.async_):
+                with aiohttp.default_response(200, **responses.ACCOUNT_INFO["Ok"]):
+                    loop = asyncio.get_event_loop()
+                    start = loop.time()
+                    with self.assertRaises(asyncio.TimeoutError):
+                        await http.get_account_info(ADDRESS)
+                    self.assertLess(loop.time() - start, 0.5)
+        self.assertEqual(len(server.urls), 1)
+
+    async def test_hedge_latency(self):
+        policy = client.RetryPolicy(hedge_endpoints=['//localhost:3001'])
+        limiter = client.AdaptiveLimiter(initial=1, maximum=1)
+        async with client.AsyncAccountHTTP(
+            '//localhost:3000',
+            network_type=NETWORK_TYPE,
+            retry=policy,
+            limiter=limiter,
+        ) as http:
+            server = Server(http.raw._session._request, delays={'http://localhost:3000': 0.01})
+            with mock.patch.object(http.raw._session, '_request', server.async_):
+                with aiohttp.default_response(200, **responses.ACCOUNT_INFO["Ok"]):
+                    await asyncio.gather(*[http.get_account_info(ADDRESS) for _ in range(20)])
+        # Time queued behind the limiter is not counted as latency.
+        self.assertLess(policy.hedge_delay(http.raw.endpoint), 0.1)
+        self.assertEqual(policy.hedges, 0)
+
+    async def test_hedge(self):
+        policy = client.RetryPolicy(hedge_endpoints=['//localhost:3000', '//localhost:3001'])
+        async with client.AsyncAccountHTTP('//localhost:3000', network_type=NETWORK_TYPE, retry=policy) as http:
+            server = Server(http.raw._session._request)
+            with mock.patch.object(http.raw._session, '_request', server.async_):
+                with aiohttp.default_response(200, **responses.ACCOUNT_INFO["Ok"]):
+                    # Not enough samples yet to hedge.
+                    server.delays = {'http://localhost:3000': 0.001}
+                    for _ in range(20):
+                        await http.get_account_info(ADDRESS)
+                    self.assertEqual(policy.hedges, 0)
+                    self.assertIsNotNone(policy.hedge_delay(http.raw.endpoint))
+
+                    server.urls.clear()
+                    server.delays = {'http://localhost:3000': 1}
+                    info = await asyncio.wait_for(http.get_account_info(ADDRESS), 0.5)
+        self.assertIsInstance(info, models.AccountInfo)
+        self.assertEqual(policy.hedges, 1)
+        self.assertTrue(server.urls[0].startswith('http://localhost:3000/'))
+        self.assertTrue(server.urls[1].startswith('http://localhost:3001/'))
@@ -0,0 +1,90 @@
+import aiohttp
+import requests
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import models
+from tests import harness
+from tests import responses
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+
+
+class TestSessionPool(harness.TestCase):
+
+    def test_shared(self):
+        pool = client.SessionPool(pool_maxsize=64)
+        session = pool.acquire(responses.ENDPOINT)
+        self.assertIs(pool.acquire('http://LOCALHOST:3000'), session)
+        self.assertIsNot(pool.acquire('//localhost:3001'), session)
+        self.assertEqual(len(pool), 2)
+
+        adapter = session.adapters['http://']
+        self.assertEqual(adapter._pool_maxsize, 64)
+        self.assertIs(session.adapters['https://'], adapter)
+
+        # Closed once released by every client.
+        pool.release(responses.ENDPOINT)
+        self.assertFalse(adapter.closed)
+        pool.release(responses.ENDPOINT)
+        self.assertTrue(adapter.closed)
+        self.assertEqual(len(pool), 1)
+
+        pool.close()
+        self.assertEqual(len(pool), 0)
+
+    def test_keep_alive(self):
+        pool = client.SessionPool(keep_alive=False)
+        session = pool.acquire(responses.ENDPOINT)
+        self.assertEqual(session.headers['Connection'], 'close')
+        pool.close()
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            client.SessionPool(pool_maxsize=0)
+        with self.assertRaises(ValueError):
+            client.HTTP(responses.ENDPOINT, session=requests.Session(), pool=client.SessionPool())
+
+
+class TestSessionHTTP(harness.TestCase):
+
+    def test_pool(self):
+        pool = client.SessionPool()
+        with client.HTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, pool=pool) as first:
+            with client.HTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, pool=pool) as second:
+                self.assertIs(first.raw._session, second.raw._session)
+                with requests.default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                    self.assertEqual(second.blockchain.get_blockchain_height(), 53577)
+            self.assertEqual(len(pool), 1)
+        self.assertEqual(len(pool), 0)
+
+    def test_session(self):
+        session = requests.Session()
+        with client.HTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, session=session) as http:
+            self.assertIs(http.raw._session, session)
+        self.assertTrue(http.raw.closed)
+        self.assertFalse(session.adapters['http://'].closed)
+
+    def test_timeout(self):
+        with client.HTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, timeout=5) as http:
+            request = mock.Mock(wraps=http.raw._session.request)
+            with mock.patch.object(http.raw._session, 'request', request):
+                with requests.default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                    http.blockchain.get_blockchain_height()
+                    http.blockchain.get_blockchain_height(timeout=1)
+        self.assertEqual(request.call_args_list[0][1]['timeout'], 5)
+        self.assertEqual(request.call_args_list[1][1]['timeout'], 1)
+
+    async def test_async_session(self):
+        session = aiohttp.ClientSession()
+        async with client.AsyncHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE, session=session) as http:
+            self.assertIs(http.raw._session, session)
+            with aiohttp.default_response(200, **responses.CHAIN_HEIGHT["Ok"]):
+                self.assertEqual(await http.blockchain.get_blockchain_height(), 53577)
+        self.assertTrue(http.raw.closed)
+        self.assertFalse(session.closed)
+        await session.close()
+
+    def test_async_invalid(self):
+        with self.assertRaises(ValueError):
+            client.AsyncHTTP(responses.ENDPOINT, session=aiohttp.ClientSession(), connector=object())
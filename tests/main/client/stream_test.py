@@ -0,0 +1,107 @@
+import aiohttp
+import json
+import requests
+
+from xpxchain import client
+from xpxchain import models
+from xpxchain.client.stream import JSONArrayDecoder
+from tests import harness
+from tests import responses
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+
+
+def decode(data: bytes, chunk_size: int):
+    decoder = JSONArrayDecoder()
+    items = []
+    for index in range(0, len(data), chunk_size):
+        items += decoder.feed(data[index:index + chunk_size])
+    decoder.close()
+    return items
+
+
+async def collect(iterator):
+    if hasattr(iterator, '__aiter__'):
+        return [i async for i in iterator]
+    return list(iterator)
+
+
+class TestJSONArrayDecoder(harness.TestCase):
+
+    def test_decode(self):
+        documents = [
+            b'[]',
+            b' [ ]\n',
+            b'[1, 2.5, null, true, "a"]',
+            b'[{"a": "x,]}\\"", "b": [1, {"c": "\\\\"}]}, {"d": []}]',
+            json.dumps([{'key': 'a\\"' * i, 'list': list(range(i))} for i in range(20)]).encode(),
+        ]
+        for document in documents:
+            for chunk_size in (1, 2, 7, 1024):
+                self.assertEqual(decode(document, chunk_size), json.loads(document))
+
+    def test_incremental(self):
+        decoder = JSONArrayDecoder()
+        self.assertEqual(decoder.feed(b'[{"a": 1}, {"b"'), [{'a': 1}])
+        self.assertEqual(decoder.feed(b': 2}'), [])
+        self.assertEqual(decoder.feed(b']'), [{'b': 2}])
+        self.assertTrue(decoder.done)
+
+    def test_invalid(self):
+        for document in (b'{"a": 1}', b'x[1]', b'[1] x'):
+            with self.assertRaises(ValueError):
+                decode(document, 2)
+        with self.assertRaises(ValueError):
+            decode(b'[1, 2', 2)
+
+    def test_malformed(self):
+        documents = [
+            b'[1}',
+            b'[{"a": 1]}',
+            b'[[1}]',
+            b'[1,,2]',
+            b'[,1]',
+            b'[1,]',
+            b'[,]',
+            b'[1 2]',
+            b']',
+            b',[1]',
+        ]
+        for document in documents:
+            with self.assertRaises(ValueError):
+                json.loads(document)
+            for chunk_size in (1, 3, 1024):
+                with self.assertRaises(ValueError):
+                    decode(document, chunk_size)
+
+
+class TestStreamedHTTP(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, requests, {}),
+        async_data=(client.AsyncBlockchainHTTP, aiohttp, {'loop': None})
+    )
+    async def test_stream_blocks(self, data, await_cb, with_cb):
+        http = data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, **data[2])
+        async with with_cb(http) as http:
+            with data[1].default_response(200, **responses.BLOCKS_INFO["Ok"]):
+                expected = await await_cb(http.get_blocks_by_height_with_limit(1, 25))
+                blocks = await collect(http.stream_blocks_by_height_with_limit(1, 25, chunk_size=64))
+        self.assertEqual(blocks, expected)
+        self.assertTrue(all(isinstance(i, models.BlockInfo) for i in blocks))
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, requests, {}, client.HTTPError),
+        async_data=(client.AsyncBlockchainHTTP, aiohttp, {'loop': None}, client.AsyncHTTPError)
+    )
+    async def test_stream_transactions(self, data, await_cb, with_cb):
+        http = data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, **data[2])
+        async with with_cb(http) as http:
+            with data[1].default_response(200, **responses.BLOCK_TRANSACTIONS["Ok"]):
+                expected = await await_cb(http.get_block_transactions(1))
+                transactions = await collect(http.stream_block_transactions(1, chunk_size=100))
+            self.assertEqual(transactions, expected)
+
+            with data[1].default_response(404, **responses.BLOCK_TRANSACTIONS["Ok"]):
+                with self.assertRaises(data[3]):
+                    await collect(http.stream_block_transactions(1))
@@ -0,0 +1,214 @@
+import datetime
+import os
+import requests
+import tempfile
+from unittest import mock
+
+from xpxchain import client
+from xpxchain import index
+from xpxchain import models
+from xpxchain.client import nis
+from tests import harness
+from tests import responses
+
+NETWORK_TYPE = models.NetworkType.MIJIN_TEST
+SIGNER = models.PublicAccount.create_from_public_key(
+    '1b153f8b76ef60a4bfe152f4de3698bd230bac9dc239d4e448715aa46bd58955',
+    NETWORK_TYPE
+)
+EVEN = models.Address('SD5DT3CH4BLABL5HIMEKP2TAPUKF4NY3L5HRIR54')
+ODD = models.Address('SARNASAS2BIAB6LMFA3FPMGBPGIJGK6IJETM3ZSP')
+
+
+def load_model(response, method):
+    with client.BlockchainHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE) as http:
+        with requests.default_response(200, **response):
+            return getattr(http, method)(1)
+
+
+def transfer(height: int) -> models.TransferTransaction:
+    return models.TransferTransaction(
+        network_type=NETWORK_TYPE,
+        version=models.TransactionVersion.TRANSFER,
+        deadline=models.Deadline(datetime.datetime(2019, 3, 8, 0, 18, 57)),
+        max_fee=0,
+        signature='00' * 64,
+        signer=SIGNER,
+        recipient=EVEN if height % 2 == 0 else ODD,
+        mosaics=[models.Mosaic(models.MosaicId(5 + height % 3), 1000)],
+        message=models.PlainMessage(b'Hello world!'),
+        transaction_info=models.TransactionInfo(
+            height=height,
+            index=0,
+            id=f'{height:024x}',
+            hash=f'{height:064x}',
+            merkle_component_hash=f'{height:064x}',
+        )
+    )
+
+
+def aggregate(height: int) -> models.AggregateCompleteTransaction:
+    # Inner transactions loaded from the API have no deadline, fee, signature or metadata.
+    inner = transfer(height).to_aggregate(SIGNER).replace(
+        deadline=None,
+        max_fee=None,
+        signature=None,
+        transaction_info=None,
+    )
+    return models.AggregateCompleteTransaction(
+        network_type=NETWORK_TYPE,
+        type=models.TransactionType.AGGREGATE_COMPLETE,
+        version=models.TransactionVersion.AGGREGATE_COMPLETE,
+        deadline=models.Deadline(datetime.datetime(2019, 3, 8, 0, 18, 57)),
+        max_fee=0,
+        signature='00' * 64,
+        signer=SIGNER,
+        inner_transactions=[inner],
+        cosignatures=[models.AggregateTransactionCosignature('00' * 64, SIGNER)],
+        transaction_info=transfer(height).transaction_info,
+    )
+
+
+class FakeChain:
+    """Fake blockchain endpoints, with a single transaction per block."""
+
+    def __init__(self, height, transaction=transfer):
+        self.height = height
+        self.transaction = transaction
+        self.block = load_model(responses.BLOCK_INFO["Ok"], 'get_block_by_height')
+        self.receipts = load_model(responses.BLOCK_RECEIPTS["Ok"], 'get_block_receipts')
+        self.starts = []
+
+    def blocks(self, height, limit):
+        self.starts.append(height)
+        end = min(height + limit, self.height + 1)
+        return [self.block.replace(height=i) for i in range(height, end)]
+
+    def patch(self):
+        def callbacks(cb):
+            def sync(client, network_type, *args, **kwds):
+                return cb(*args)
+
+            async def async_(client, network_type, *args, **kwds):
+                await network_type
+                return cb(*args)
+
+            return (sync, async_)
+
+        return mock.patch.multiple(
+            nis,
+            get_blocks_by_height_with_limit=callbacks(self.blocks),
+            get_block_by_height=callbacks(lambda height: self.block.replace(height=height)),
+            get_block_transactions=callbacks(lambda height: [self.transaction(height)]),
+            get_block_receipts=callbacks(lambda height: self.receipts),
+            get_blockchain_height=callbacks(lambda: self.height),
+        )
+
+
+class TestChainIndex(harness.TestCase):
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, {}, 'sync'),
+        async_data=(client.AsyncBlockchainHTTP, {'loop': None}, 'async_sync')
+    )
+    async def test_sync(self, data, await_cb, with_cb):
+        chain = FakeChain(30)
+        http = data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, **data[1])
+        async with with_cb(http) as http:
+            with chain.patch(), index.ChainIndex(depth=0) as db:
+                sync = getattr(db, data[2])
+                self.assertEqual(await await_cb(sync(http, batch_size=7)), 30)
+                self.assertEqual(db.height, 30)
+                self.assertEqual(db.network_type, NETWORK_TYPE)
+
+                # Resume from the last indexed block.
+                chain.height = 45
+                self.assertEqual(await await_cb(sync(http, limit=100)), 15)
+                self.assertEqual(chain.starts[-1], 31)
+                self.assertEqual(await await_cb(sync(http)), 0)
+                self.assertEqual(db.height, 45)
+
+                self.assertEqual(db.get_block(12), chain.block.replace(height=12))
+                self.assertIsNone(db.get_block(46))
+                self.assertEqual([i.height for i in db.get_blocks(40, 100)], list(range(40, 46)))
+                self.assertEqual(db.get_receipts(3), chain.receipts)
+                self.assertEqual(db.get_transaction(f'{7:064X}'), transfer(7))
+                self.assertIsNone(db.get_transaction('00'))
+
+    @harness.async_test(
+        sync_data=(client.BlockchainHTTP, {}, 'sync'),
+        async_data=(client.AsyncBlockchainHTTP, {'loop': None}, 'async_sync')
+    )
+    async def test_resync(self, data, await_cb, with_cb):
+        chain = FakeChain(30)
+        http = data[0](responses.ENDPOINT, network_type=NETWORK_TYPE, **data[1])
+        async with with_cb(http) as http:
+            with chain.patch(), index.ChainIndex(depth=10) as db:
+                sync = getattr(db, data[2])
+                # Blocks within `depth` of the chain height are not final.
+                self.assertEqual(await await_cb(sync(http)), 20)
+                self.assertEqual(db.height, 20)
+                self.assertEqual(await await_cb(sync(http)), 0)
+
+                # Syncing the same range again replaces the indexed blocks.
+                self.assertEqual(await await_cb(sync(http, start=15, batch_size=4)), 6)
+                self.assertEqual(await await_cb(sync(http, start=1, end=11)), 10)
+                self.assertEqual(db.height, 10)
+                self.assertIsNone(db.get_block(11))
+                self.assertEqual([i.height for i in db.get_blocks(1, 100)], list(range(1, 11)))
+                heights = [i.transaction_info.height for i in db.get_transactions(SIGNER.address)]
+                self.assertEqual(heights, list(range(1, 11)))
+                self.assertEqual(db.get_transactions(EVEN, start=11), [])
+
+                with self.assertRaises(ValueError):
+                    await await_cb(sync(http, start=12))
+
+    def test_queries(self):
+        chain = FakeChain(60)
+        with client.BlockchainHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE) as http:
+            with chain.patch(), index.ChainIndex(receipts=False, depth=0) as db:
+                db.sync(http)
+                self.assertIsNone(db.get_receipts(1))
+
+                heights = lambda x: [i.transaction_info.height for i in x]
+                self.assertEqual(heights(db.get_transactions(EVEN, start=10, end=20)), list(range(10, 20, 2)))
+                self.assertEqual(heights(db.get_transactions(EVEN.address, incoming=True, limit=3)), [2, 4, 6])
+                self.assertEqual(db.get_transactions(EVEN, incoming=False), [])
+                self.assertEqual(len(db.get_transactions(SIGNER.address, incoming=False)), 60)
+
+                mosaic = models.MosaicId(5)
+                self.assertEqual(heights(db.get_transactions(mosaic=mosaic, end=10)), [3, 6, 9])
+                self.assertEqual(heights(db.get_transactions(ODD, mosaic=6, end=10)), [1, 7])
+                transfers = db.get_transactions(type=models.TransactionType.TRANSFER)
+                self.assertEqual(heights(transfers), list(range(1, 61)))
+                self.assertEqual(db.get_transactions(type=models.TransactionType.REGISTER_NAMESPACE), [])
+
+    def test_aggregate(self):
+        chain = FakeChain(10, transaction=aggregate)
+        with client.BlockchainHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE) as http:
+            with chain.patch(), index.ChainIndex(depth=0) as db:
+                self.assertEqual(db.sync(http), 10)
+                self.assertEqual(db.get_transaction(f'{7:064X}'), aggregate(7))
+
+                # Inner transactions are indexed with the aggregate.
+                heights = lambda x: [i.transaction_info.height for i in x]
+                self.assertEqual(heights(db.get_transactions(EVEN, incoming=True)), [2, 4, 6, 8, 10])
+                transfers = db.get_transactions(type=models.TransactionType.TRANSFER)
+                self.assertEqual(transfers, [aggregate(i) for i in range(1, 11)])
+
+    def test_persistence(self):
+        chain = FakeChain(10)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'chain.db')
+            with client.BlockchainHTTP(responses.ENDPOINT, network_type=NETWORK_TYPE) as http:
+                with chain.patch():
+                    with index.ChainIndex(path, depth=0) as db:
+                        db.sync(http)
+                    with index.ChainIndex(path, depth=0) as db:
+                        self.assertEqual(db.height, 10)
+                        self.assertEqual(db.sync(http), 0)
+
+            with client.BlockchainHTTP(responses.ENDPOINT, network_type=models.NetworkType.MIJIN) as http:
+                with index.ChainIndex(path, depth=0) as db:
+                    with self.assertRaises(ValueError):
+                        db.sync(http)
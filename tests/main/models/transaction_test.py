@@ -3,6 +3,7 @@ import random
 
 from xpxchain import util
 from xpxchain import models
+from xpxchain.models.transaction import format
 from tests import harness
 
 
@@ -462,6 +463,282 @@ class TestInnnerTransaction(harness.TestCase):
             self.assertEqual(transaction.type, type)
 
 
+class TestTransactionHeader(harness.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.network_type = models.NetworkType.MIJIN_TEST
+        self.account = models.Account.create_from_private_key(
+            '97131746d864f4c9001b1b86044d765ba08d7fddc7a0fa3abbc8ce2a99b4ac63',
+            self.network_type,
+        )
+        self.transaction = models.TransferTransaction.create(
+            deadline=models.Deadline(datetime.datetime(2019, 3, 8, 0, 18, 57)),
+            recipient=self.account.address,
+            network_type=self.network_type,
+        )
+
+    def test_compile_header(self):
+        self.assertEqual(models.Transaction.HEADER.size, models.Transaction.catbuffer_size_shared())
+        self.assertEqual(models.InnerTransaction.HEADER.size, models.InnerTransaction.catbuffer_size_shared())
+        slices = models.Transaction.CATBUFFER.slices
+        with self.assertRaises(ValueError):
+            format.compile_header(slices, ('size', 'signer'))
+
+    def test_signed(self):
+        signed = self.transaction.sign_with(self.account, '00' * 32, util.FeeCalculationStrategy.ZERO)
+        transaction = models.Transaction.create_from_catbuffer(signed.payload, self.network_type)
+        self.assertEqual(transaction.signer, self.account.public_account)
+        self.assertEqual(transaction.signature.upper(), signed.payload[8:136].upper())
+        self.assertEqual(transaction.version, models.TransactionVersion.TRANSFER)
+        self.assertEqual(transaction.deadline, self.transaction.deadline)
+        self.assertEqual(transaction.replace(signature=None, signer=None), self.transaction)
+
+    def test_inner(self):
+        inner = self.transaction.to_aggregate(self.account.public_account)
+        data = inner.to_catbuffer()
+        self.assertEqual(data[:4], len(data).to_bytes(4, 'little'))
+        transaction = models.InnerTransaction.create_from_catbuffer(data)
+        self.assertEqual(transaction.signer, self.account.public_account)
+        self.assertEqual(transaction.version, inner.version)
+        self.assertEqual(transaction.network_type, inner.network_type)
+        self.assertEqual(transaction.recipient, inner.recipient)
+
+    def test_memoryview(self):
+        signed = self.transaction.sign_with(self.account, '00' * 32, util.FeeCalculationStrategy.ZERO)
+        payload = util.unhexlify(signed.payload)
+        data = memoryview(payload * 3 + b'\x01')
+        transactions, rest = models.Transaction.sequence_from_catbuffer_pair(data, 3, self.network_type)
+        self.assertEqual([i.signer for i in transactions], [self.account.public_account] * 3)
+        self.assertIsInstance(rest, memoryview)
+        self.assertEqual(rest, b'\x01')
+
+        # Bytes input still returns bytes.
+        transaction, rest = models.Transaction.create_from_catbuffer_pair(payload + b'\x01')
+        self.assertEqual(rest, b'\x01')
+        self.assertIsInstance(rest, bytes)
+
+    def test_inner_transactions_bytes(self):
+        inner = [self.transaction.to_aggregate(self.account.public_account) for _ in range(3)]
+        aggregate = models.AggregateTransaction.create_complete(
+            deadline=self.transaction.deadline,
+            inner_transactions=inner,
+            network_type=self.network_type,
+        )
+        data = aggregate.to_inner_transactions_bytes(self.network_type)
+        transaction = aggregate.replace(inner_transactions=[])
+        rest = transaction.load_inner_transactions_bytes(data + b'\x01', len(data), self.network_type)
+        self.assertEqual(rest, b'\x01')
+        self.assertEqual(len(transaction.inner_transactions), 3)
+        self.assertEqual([i.recipient for i in transaction.inner_transactions], [i.recipient for i in inner])
+
+
+class TestAggregateTransaction(harness.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.network_type = models.NetworkType.MIJIN_TEST
+        self.initiator = models.Account.create_from_private_key(
+            '97131746d864f4c9001b1b86044d765ba08d7fddc7a0fa3abbc8ce2a99b4ac63',
+            self.network_type,
+        )
+        self.cosignatory = models.Account.create_from_private_key(
+            '26b64cb10f005e5988a36744ca19e20d835ccc7c105aaa5f3b212da593180930',
+            self.network_type,
+        )
+        transaction = models.TransferTransaction.create(
+            deadline=models.Deadline(datetime.datetime(2019, 3, 8, 0, 18, 57)),
+            recipient=self.cosignatory.address,
+            message=models.PlainMessage(b'Hello'),
+            network_type=self.network_type,
+        )
+        self.aggregate = models.AggregateTransaction.create_bonded(
+            deadline=transaction.deadline,
+            inner_transactions=[
+                transaction.to_aggregate(self.initiator.public_account),
+                transaction.to_aggregate(self.cosignatory.public_account),
+            ],
+            network_type=self.network_type,
+        )
+        signed = self.aggregate.sign_transaction_with_cosignatories(
+            self.initiator,
+            '00' * 32,
+            [self.cosignatory],
+            util.FeeCalculationStrategy.ZERO,
+        )
+        self.payload = util.unhexlify(signed.payload)
+
+    def test_catbuffer(self):
+        transaction = models.Transaction.create_from_catbuffer(self.payload, self.network_type)
+        self.assertIsInstance(transaction, models.AggregateBondedTransaction)
+        self.assertEqual(transaction.signer, self.initiator.public_account)
+        signers = [i.signer for i in transaction.inner_transactions]
+        self.assertEqual(signers, [self.initiator.public_account, self.cosignatory.public_account])
+        self.assertEqual(len(transaction.cosignatures), 1)
+        self.assertEqual(transaction.cosignatures[0].signer, self.cosignatory.public_account)
+        self.assertEqual(transaction.catbuffer_size(), len(self.payload))
+        self.assertEqual(transaction.to_catbuffer(fee_strategy=util.FeeCalculationStrategy.ZERO), self.payload)
+
+        with self.assertRaises(ValueError):
+            models.Transaction.create_from_catbuffer(self.payload[:-1], self.network_type)
+
+    def test_resign(self):
+        fee_strategy = util.FeeCalculationStrategy.ZERO
+        hash = '437cb4f88575d3b6d87ba4adbd23c3458ef195a0a47b4f4c0d0ae3816d9dff14'
+        self.assertEqual(models.AggregateTransaction.transaction_hash(self.payload, '00' * 32), hash)
+
+        # Loaded cosignatures are not signed, only announced.
+        transaction = models.Transaction.create_from_catbuffer(self.payload, self.network_type)
+        signed = transaction.sign_transaction_with_cosignatories(self.initiator, '00' * 32, [], fee_strategy)
+        self.assertEqual(signed.hash, hash)
+        self.assertEqual(util.unhexlify(signed.payload), self.payload)
+        signed = transaction.sign_with(self.initiator, '00' * 32, fee_strategy)
+        self.assertEqual(signed.hash, hash)
+        self.assertEqual(util.unhexlify(signed.payload), self.payload)
+
+        # New cosignatures are appended after the loaded ones.
+        signed = transaction.sign_transaction_with_cosignatories(
+            self.initiator,
+            '00' * 32,
+            [self.initiator],
+            fee_strategy,
+        )
+        self.assertEqual(signed.hash, hash)
+        transaction = models.Transaction.create_from_catbuffer(util.unhexlify(signed.payload), self.network_type)
+        signers = [i.signer for i in transaction.cosignatures]
+        self.assertEqual(signers, [self.cosignatory.public_account, self.initiator.public_account])
+
+    def test_lazy(self):
+        transaction = models.Transaction.create_from_catbuffer(self.payload, self.network_type, lazy=True)
+        inner = transaction.inner_transactions
+        self.assertIsInstance(inner, models.LazyInnerTransactionList)
+        self.assertEqual((len(inner), inner.decoded), (2, 0))
+        self.assertEqual(transaction.to_catbuffer(fee_strategy=util.FeeCalculationStrategy.ZERO), self.payload)
+        self.assertEqual(inner.decoded, 0)
+
+        self.assertEqual(inner[-1].signer, self.cosignatory.public_account)
+        self.assertEqual(inner.decoded, 1)
+        self.assertIs(inner[1], inner[-1])
+        self.assertEqual(inner.raw(0).tobytes()[4:36], util.unhexlify(self.initiator.public_key))
+        with self.assertRaises(IndexError):
+            inner[2]
+        self.assertEqual(transaction, models.Transaction.create_from_catbuffer(self.payload))
+
+    def test_dto(self):
+        transaction = models.Transaction.create_from_catbuffer(self.payload, self.network_type)
+        dto = transaction.to_dto(self.network_type)
+        self.assertEqual(len(dto['transaction']['transactions']), 2)
+        self.assertEqual(dto['transaction']['cosignatures'][0]['signer'], self.cosignatory.public_key)
+        self.assertEqual(models.Transaction.create_from_dto(dto, self.network_type), transaction)
+        self.assertEqual(self.aggregate.to_dto()['transaction']['cosignatures'], [])
+
+    def test_cache(self):
+        fee_strategy = util.FeeCalculationStrategy.ZERO
+        data = self.aggregate.to_catbuffer(fee_strategy=fee_strategy)
+        self.assertIs(self.aggregate.to_catbuffer(fee_strategy=fee_strategy), data)
+        inner = self.aggregate.inner_transactions[0]
+        self.assertIs(inner.to_catbuffer(), inner.to_catbuffer())
+        self.assertEqual(self.aggregate.catbuffer_size(), len(data))
+
+        # Replacing fields creates a model with an empty cache.
+        transaction = self.aggregate.replace(inner_transactions=self.aggregate.inner_transactions[:1])
+        self.assertEqual(transaction.catbuffer_size(), len(data) - inner.catbuffer_size())
+        data = transaction.to_catbuffer(fee_strategy=fee_strategy)
+        self.assertEqual(data[-inner.catbuffer_size():], inner.to_catbuffer())
+
+    def test_cache_invalidation(self):
+        size = self.aggregate.catbuffer_size()
+        inner = self.aggregate.inner_transactions[0]
+        inner_transactions = list(self.aggregate.inner_transactions)
+
+        # Setting the inner transactions.
+        self.aggregate._set('inner_transactions', inner_transactions + [inner])
+        self.assertEqual(self.aggregate.catbuffer_size(), size + inner.catbuffer_size())
+        self.aggregate._set('inner_transactions', inner_transactions)
+        self.assertEqual(self.aggregate.catbuffer_size(), size)
+
+        # Setting fields internally.
+        cosignature = models.AggregateTransactionCosignature('00' * 64, self.cosignatory.public_account)
+        self.aggregate._set('cosignatures', [cosignature])
+        self.assertEqual(self.aggregate.catbuffer_size(), size + 96)
+        self.aggregate._set('cosignatures', [])
+
+        # Serialized data.
+        fee_strategy = util.FeeCalculationStrategy.ZERO
+        data = self.aggregate.to_catbuffer(fee_strategy=fee_strategy)
+        self.aggregate._set('inner_transactions', inner_transactions + [inner])
+        modified = self.aggregate.to_catbuffer(fee_strategy=fee_strategy)
+        self.assertEqual(modified[-inner.catbuffer_size():], inner.to_catbuffer())
+        self.aggregate._set('inner_transactions', inner_transactions)
+        self.assertEqual(self.aggregate.to_catbuffer(fee_strategy=fee_strategy), data)
+
+        # Loading the inner transactions.
+        transaction = models.Transaction.create_from_catbuffer(self.payload, self.network_type)
+        size = transaction.catbuffer_size()
+        transaction.load_inner_transactions_bytes(inner.to_catbuffer(), inner.catbuffer_size(), self.network_type)
+        self.assertEqual(transaction.catbuffer_size(), size - inner.catbuffer_size())
+
+
+class TestSequenceFromDtoFast(harness.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.network_type = models.NetworkType.MIJIN_TEST
+        account = models.Account.create_from_private_key(
+            '97131746d864f4c9001b1b86044d765ba08d7fddc7a0fa3abbc8ce2a99b4ac63',
+            self.network_type,
+        )
+        self.dtos = []
+        for amount in range(3):
+            transaction = models.TransferTransaction.create(
+                deadline=models.Deadline(datetime.datetime(2019, 3, 8, 0, 18, 57)),
+                recipient=account.address,
+                mosaics=[models.Mosaic(models.MosaicId(5), amount)],
+                network_type=self.network_type,
+            )
+            signed = transaction.sign_with(account, '00' * 32, util.FeeCalculationStrategy.ZERO)
+            transaction = models.Transaction.create_from_catbuffer(signed.payload)
+            self.dtos.append(transaction.to_dto(self.network_type))
+        aggregate = models.AggregateTransaction.create_complete(
+            deadline=transaction.deadline,
+            inner_transactions=[transaction.to_aggregate(account.public_account)] * 2,
+            network_type=self.network_type,
+        )
+        self.dtos.append(aggregate.to_dto(self.network_type))
+
+    def test_sequence(self):
+        transactions = models.Transaction.sequence_from_dto_fast(self.dtos, self.network_type)
+        self.assertEqual(transactions, models.Transaction.sequence_from_dto(self.dtos, self.network_type))
+        self.assertIsInstance(transactions[-1], models.AggregateCompleteTransaction)
+        self.assertIs(transactions[0].signer, transactions[1].signer)
+        inner = transactions[-1].inner_transactions
+        self.assertIs(inner[0].signer, inner[1].signer)
+
+        accounts = {}
+        transfers = models.TransferTransaction.sequence_from_dto_fast(self.dtos[:3], accounts=accounts)
+        self.assertEqual(transfers, transactions[:3])
+        self.assertEqual(list(accounts.values()), [transactions[0].signer])
+
+    def test_invalid(self):
+        dtos = [{**self.dtos[0], 'extra': None}]
+        with self.assertRaises(ValueError):
+            models.Transaction.sequence_from_dto_fast(dtos)
+        # Trusted data is not validated.
+        transactions = models.Transaction.sequence_from_dto_fast(dtos, trusted=True)
+        self.assertEqual(transactions[0], models.Transaction.create_from_dto(self.dtos[0]))
+
+        with self.assertRaises(ValueError):
+            models.Transaction.sequence_from_dto_fast(self.dtos, models.NetworkType.MAIN_NET)
+        dto = {'transaction': {**self.dtos[0]['transaction'], 'type': 0}}
+        with self.assertRaises(ValueError):
+            models.Transaction.sequence_from_dto_fast([dto])
+
+    def test_raw_type_map(self):
+        for base in (models.Transaction, models.InnerTransaction):
+            self.assertEqual(base.RAW_TYPE_MAP, {int(k): v for k, v in base.TYPE_MAP.items()})
+        self.assertIs(models.Transaction.RAW_TYPE_MAP[0x4154], models.TransferTransaction)
+
+
 @harness.enum_test_case({
     'type': models.LinkAction,
     'enums': [
@@ -24,7 +24,9 @@
 
 # type: ignore
 from .default import *
+from .pool import *
 
 __all__ = (
     default.__all__
+    + pool.__all__
 )
@@ -23,11 +23,13 @@
 """
 
 from __future__ import annotations
-import json
+import asyncio
+import collections
 import typing
 
 from . import client
 from . import nis
+from .registry import NETWORK_REGISTRY
 from .. import models
 from .. import util
 
@@ -40,6 +42,152 @@ MessageType = typing.Union[
     models.TransactionStatusError,
     str,
 ]
+ProgressCallback = typing.Callable[[int, int], None]
+
+# Maximum number of identifiers the REST server accepts in a single
+# POST body, and the default number of chunks requested at once.
+BULK_CHUNK_SIZE = 100
+BULK_CONCURRENCY = 4
+# Maximum page size accepted by the REST server for transaction lists.
+PAGE_SIZE = 100
+# Maximum number of blocks the REST server returns for a height range.
+BLOCKS_LIMIT = 100
+# Number of websockets frames sent between progress reports.
+PROGRESS_INTERVAL = 1000
+# Maximum number of websockets frames written concurrently.
+SEND_BATCH = 100
+
+
+def chunked(items: typing.Sequence[T], size: int) -> typing.Iterator[typing.Sequence[T]]:
+    """Split sequence into consecutive chunks of at most `size` items."""
+
+    if size <= 0:
+        raise ValueError("Chunk size must be positive.")
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
+
+
+def page_kwds(kwds: dict, page_size: int, last_id: typing.Optional[str]) -> dict:
+    """Get request keywords for the page following the transaction ID."""
+
+    params = dict(kwds.get('params') or {})
+    params['pageSize'] = page_size
+    if last_id is not None:
+        params['id'] = last_id
+    return {**kwds, 'params': params}
+
+
+def is_page_end(
+    transaction: models.Transaction,
+    stop_id: typing.Optional[str],
+    stop_height: typing.Optional[int],
+) -> bool:
+    """Check if paging must stop before yielding the transaction."""
+
+    info = transaction.transaction_info
+    if info is None:
+        return False
+    if stop_id is not None and info.id == stop_id:
+        return True
+    return stop_height is not None and info.height < stop_height
+
+
+def block_windows(start: int, end: int, limit: int) -> typing.List[typing.Tuple[int, int]]:
+    """Split the heights in [start, end) into consecutive windows of `limit` blocks."""
+
+    if limit <= 0:
+        raise ValueError("Block limit must be positive.")
+    return [(i, min(i + limit, end)) for i in range(start, end, limit)]
+
+
+def window_blocks(
+    blocks: typing.Sequence[models.BlockInfo],
+    low: int,
+    high: int,
+) -> typing.Dict[int, models.BlockInfo]:
+    """Get blocks by height within [low, high) from a block range response."""
+
+    return {i.height: i for i in blocks if low <= i.height < high}
+
+
+@util.dataclass(frozen=True, transactions=None, receipts=None)
+class BlockData(util.Object):
+    """Block with its transactions and receipts, from a block range download."""
+
+    block: models.BlockInfo
+    transactions: typing.Optional[typing.Sequence[models.Transaction]]
+    receipts: typing.Optional[models.Statements]
+
+
+async def fetch_window(
+    call: typing.Callable[..., typing.Awaitable],
+    http: typing.Any,
+    low: int,
+    high: int,
+    limit: int,
+    transactions: bool,
+    receipts: bool,
+) -> list:
+    """
+    Fetch the blocks within [low, high), requesting blocks missing from the range individually.
+
+    :param call: Callback to make a request, from the client, callbacks and arguments.
+    :param http: Client for the node serving the window.
+    :param low: First height in the window.
+    :param high: Height after the last in the window.
+    :param limit: Number of blocks to request for the range.
+    :param transactions: Also fetch the transactions for each block.
+    :param receipts: Also fetch the receipts for each block.
+    """
+
+    page = await call(http, nis.get_blocks_by_height_with_limit, low, limit)
+    blocks = window_blocks(page, low, high)
+    missing = [i for i in range(low, high) if i not in blocks]
+    found = await asyncio.gather(*(call(http, nis.get_block_by_height, i) for i in missing))
+    blocks.update(zip(missing, found))
+    if not (transactions or receipts):
+        return [blocks[i] for i in range(low, high)]
+
+    async def block_data(height):
+        return BlockData(
+            blocks[height],
+            await call(http, nis.get_block_transactions, height) if transactions else None,
+            await call(http, nis.get_block_receipts, height) if receipts else None,
+        )
+
+    return await asyncio.gather(*(block_data(i) for i in range(low, high)))
+
+
+async def ordered_windows(
+    fetch: typing.Callable[[int], typing.Awaitable[list]],
+    count: int,
+    concurrency: int,
+) -> typing.AsyncIterator:
+    """
+    Yield the items of each window in order, fetching up to `concurrency` windows at once.
+
+    Windows complete out of order, and wait in their futures until
+    all previous windows have been yielded. At most `concurrency`
+    windows are buffered at once.
+
+    :param fetch: Callback to fetch the items of a window from its index.
+    :param count: Number of windows.
+    :param concurrency: Maximum number of windows fetched at once.
+    """
+
+    pending: typing.Deque[asyncio.Future] = collections.deque()
+    scheduled = 0
+    try:
+        while pending or scheduled < count:
+            while scheduled < count and len(pending) < concurrency:
+                pending.append(asyncio.ensure_future(fetch(scheduled)))
+                scheduled += 1
+            for item in await pending.popleft():
+                yield item
+    finally:
+        for task in pending:
+            task.cancel()
+
 
 # HTTP
 # ----
@@ -52,6 +200,7 @@ class HTTPSharedBase(util.Object):
     _client: client.ClientSharedBase
     _index: int
     _network_type: typing.Optional[models.NetworkType] = None
+    _children: typing.Dict[type, HTTPSharedBase]
 
     @property
     def index(self) -> int:
@@ -73,6 +222,11 @@ class HTTPSharedBase(util.Object):
         """Get network type for client."""
         raise util.AbstractMethodError
 
+    @property
+    def generation_hash(self):
+        """Get nemesis generation hash for client."""
+        raise util.AbstractMethodError
+
     @classmethod
     def create_from_http(cls: typing.Type[T], http) -> T:
         """
@@ -87,6 +241,28 @@ class HTTPSharedBase(util.Object):
         inst._network_type = http._network_type
         return typing.cast(T, inst)
 
+    def _child(self, cls: typing.Type[T]) -> T:
+        """
+        Get a memoized client of type `cls` sharing this client's session.
+
+        Clients are cached per client wrapper, so they are rebuilt once
+        the client is re-entered.
+
+        :param cls: HTTP client type.
+        """
+
+        client = self._client
+        try:
+            children = self._children
+        except AttributeError:
+            children = self._children = {}
+        inst = children.get(cls)
+        if inst is None or inst._client is not client:
+            inst = children[cls] = cls.create_from_http(self)
+        elif inst._network_type is None:
+            inst._network_type = self._network_type
+        return typing.cast(T, inst)
+
     def close(self):
         """Close the client session."""
         raise util.AbstractMethodError
@@ -104,6 +280,67 @@ class HTTPSharedBase(util.Object):
 
         return typing.cast(T, cb(self.raw, network_type, *args, **kwds))
 
+    def _bulk(self, cbs, items, chunk_size, concurrency, **kwds):
+        """
+        Invoke a NIS callback over chunks of items and merge the results.
+
+        The results are merged in chunk order, but each chunk keeps the
+        order of the server response, which is not guaranteed to match
+        the items, and may omit unknown items or return several results
+        per item.
+
+        :param cbs: NIS callbacks accepting a sequence of items.
+        :param items: Sequence of items to split into chunks.
+        :param chunk_size: Maximum number of items per request.
+        :param concurrency: Maximum number of requests in flight.
+        :return: Merged list of results, in chunk order.
+        """
+        raise util.AbstractMethodError
+
+    def _paginate(self, cbs, item, page_size, stop_id, stop_height, **kwds):
+        """
+        Iterate over all transactions from a paged NIS callback.
+
+        Pages are requested by the ID of the last transaction of the
+        previous page, from newest to oldest.
+
+        :param cbs: NIS callbacks returning a page of transactions.
+        :param item: Item identifying the resource to page.
+        :param page_size: Number of transactions per page.
+        :param stop_id: Stop before the transaction with this ID.
+        :param stop_height: Stop before the first transaction below this height.
+        :return: Iterator over transactions.
+        """
+        raise util.AbstractMethodError
+
+    def _iter_blocks(self, start, end, limit, concurrency, transactions, receipts, nodes, **kwds):
+        """
+        Iterate over blocks in [start, end), in height order.
+
+        Blocks are requested in windows of `limit` blocks, distributed
+        round-robin over this client and `nodes`. Heights missing from a
+        window are requested individually.
+
+        :param start: Height of the first block.
+        :param end: Height after the last block, or None for the chain height.
+        :param limit: Number of blocks per window.
+        :param concurrency: Maximum number of requests in flight.
+        :param transactions: Also request the transactions for each block.
+        :param receipts: Also request the receipts for each block.
+        :param nodes: Additional blockchain clients to distribute windows over.
+        :return: Iterator over blocks, or `BlockData` with transactions or receipts.
+        """
+        raise util.AbstractMethodError
+
+    def _stream(self, cbs, *args, **kwds):
+        """
+        Iterate over the models of a streamed list response.
+
+        :param cbs: NIS callbacks streaming a list response.
+        :return: Iterator over models, decoded as the response arrives.
+        """
+        raise util.AbstractMethodError
+
     @property
     def _none(self):
         """Generate `None` with same evaluation as `network_type`."""
@@ -133,10 +370,55 @@ class HTTPBase(HTTPSharedBase):
     @property
     def network_type(self) -> models.NetworkType:
         if self._network_type is None:
-            network = self.root.network
-            self._network_type = network.get_network_type()
+            self._network_type = NETWORK_REGISTRY.network_type(self)
         return self._network_type
 
+    @property
+    def generation_hash(self) -> str:
+        return NETWORK_REGISTRY.generation_hash(self)
+
+    def _bulk(self, cbs, items, chunk_size, concurrency, **kwds):
+        result: list = []
+        for chunk in chunked(items, chunk_size):
+            result.extend(self(cbs, chunk, **kwds))
+        return result
+
+    def _paginate(self, cbs, item, page_size, stop_id, stop_height, **kwds):
+        last_id = None
+        while True:
+            page = self(cbs, item, **page_kwds(kwds, page_size, last_id))
+            for transaction in page:
+                if is_page_end(transaction, stop_id, stop_height):
+                    return
+                yield transaction
+            if len(page) < page_size:
+                return
+            last_id = page[-1].transaction_info.id
+
+    def _iter_blocks(self, start, end, limit, concurrency, transactions, receipts, nodes, **kwds):
+        if end is None:
+            end = self(nis.get_blockchain_height, **kwds) + 1
+        nodes = [self, *nodes]
+        for index, (low, high) in enumerate(block_windows(start, end, limit)):
+            http = nodes[index % len(nodes)]
+            page = http(nis.get_blocks_by_height_with_limit, low, limit, **kwds)
+            blocks = window_blocks(page, low, high)
+            for height in range(low, high):
+                block = blocks.get(height)
+                if block is None:
+                    block = http(nis.get_block_by_height, height, **kwds)
+                if not (transactions or receipts):
+                    yield block
+                    continue
+                yield BlockData(
+                    block,
+                    http(nis.get_block_transactions, height, **kwds) if transactions else None,
+                    http(nis.get_block_receipts, height, **kwds) if receipts else None,
+                )
+
+    def _stream(self, cbs, *args, **kwds):
+        return cbs[self.index](self.raw, self.network_type, *args, **kwds)
+
     @property
     def _none(self) -> None:
         return None
@@ -185,7 +467,7 @@ class AsyncHTTPBase(HTTPSharedBase):
     @classmethod
     def create_from_http(cls: typing.Type[T], http) -> T:
         inst = super(AsyncHTTPBase, cls).create_from_http(http)  # type: ignore
-        setattr(inst, '_loop', getattr(http, '_loop'))
+        inst._loop = http._loop
         return inst  # type: ignore
 
     @property
@@ -196,10 +478,76 @@ class AsyncHTTPBase(HTTPSharedBase):
     @property
     async def network_type(self) -> models.NetworkType:
         if self._network_type is None:
-            network = self.root.network
-            self._network_type = await network.get_network_type()
+            self._network_type = await NETWORK_REGISTRY.async_network_type(self)
         return self._network_type
 
+    @property
+    async def generation_hash(self) -> str:
+        return await NETWORK_REGISTRY.async_generation_hash(self)
+
+    async def _bulk(self, cbs, items, chunk_size, concurrency, **kwds):
+        if concurrency <= 0:
+            raise ValueError("Concurrency must be positive.")
+        # Resolve the network type once, so the chunks do not all
+        # race to request it.
+        await self.network_type
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(chunk):
+            async with semaphore:
+                return await self(cbs, chunk, **kwds)
+
+        chunks = await asyncio.gather(*(fetch(i) for i in chunked(items, chunk_size)))
+        return [i for chunk in chunks for i in chunk]
+
+    async def _paginate(self, cbs, item, page_size, stop_id, stop_height, **kwds):
+        fetch = lambda x: asyncio.ensure_future(self(cbs, item, **page_kwds(kwds, page_size, x)))
+        task: typing.Optional[asyncio.Future] = fetch(None)
+        try:
+            while task is not None:
+                page = await task
+                # Prefetch the next page while the caller consumes this one.
+                task = None
+                if len(page) == page_size:
+                    task = fetch(page[-1].transaction_info.id)
+                for transaction in page:
+                    if is_page_end(transaction, stop_id, stop_height):
+                        return
+                    yield transaction
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def _iter_blocks(self, start, end, limit, concurrency, transactions, receipts, nodes, **kwds):
+        if concurrency <= 0:
+            raise ValueError("Concurrency must be positive.")
+        if end is None:
+            end = await self(nis.get_blockchain_height, **kwds) + 1
+        nodes = [self, *nodes]
+        windows = block_windows(start, end, limit)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(http, cbs, *args):
+            async with semaphore:
+                return await http(cbs, *args, **kwds)
+
+        def fetch(index):
+            low, high = windows[index]
+            http = nodes[index % len(nodes)]
+            return fetch_window(call, http, low, high, limit, transactions, receipts)
+
+        blocks = ordered_windows(fetch, len(windows), concurrency)
+        try:
+            async for block in blocks:
+                yield block
+        finally:
+            await blocks.aclose()
+
+    async def _stream(self, cbs, *args, **kwds):
+        network_type = await self.network_type
+        async for item in cbs[self.index](self.raw, network_type, *args, **kwds):
+            yield item
+
     @property
     async def _none(self) -> None:
         return None
@@ -288,6 +636,27 @@ class AccountHTTP(HTTPSharedBase):
         """
         return self(nis.get_accounts_info, addresses, **kwds)
 
+    def get_accounts_info_bulk(
+        self,
+        addresses: typing.Sequence[models.Address],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        concurrency: int = BULK_CONCURRENCY,
+        **kwds
+    ):
+        """
+        Get info for an arbitrary number of accounts.
+
+        The addresses are split into requests of at most `chunk_size`
+        addresses, of which up to `concurrency` are in flight at once
+        for asynchronous clients.
+
+        :param addresses: Sequence of account addresses.
+        :param chunk_size: (Optional) Maximum addresses per request.
+        :param concurrency: (Optional) Maximum concurrent requests.
+        :return: List of account info objects, merged in chunk order.
+        """
+        return self._bulk(nis.get_accounts_info, addresses, chunk_size, concurrency, **kwds)
+
     def get_account_properties(
         self,
         address: models.Address,
@@ -314,6 +683,23 @@ class AccountHTTP(HTTPSharedBase):
         """
         return self(nis.get_accounts_properties, addresses, **kwds)
 
+    def get_accounts_properties_bulk(
+        self,
+        addresses: typing.Sequence[models.Address],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        concurrency: int = BULK_CONCURRENCY,
+        **kwds
+    ):
+        """
+        Get properties information for an arbitrary number of accounts.
+
+        :param addresses: Sequence of account addresses.
+        :param chunk_size: (Optional) Maximum addresses per request.
+        :param concurrency: (Optional) Maximum concurrent requests.
+        :return: List of AccountProperties objects, merged in chunk order.
+        """
+        return self._bulk(nis.get_accounts_properties, addresses, chunk_size, concurrency, **kwds)
+
     def get_multisig_account_info(
         self,
         address: models.Address,
@@ -353,6 +739,46 @@ class AccountHTTP(HTTPSharedBase):
         """
         return self(nis.get_account_transactions, public_account, **kwds)
 
+    def stream_transactions(
+        self,
+        public_account: models.PublicAccount,
+        **kwds
+    ):
+        """
+        Stream all transactions for account.
+
+        The response is decoded incrementally, and transaction objects are yielded
+        as they arrive rather than materialized in a single list.
+
+        :param public_account: Public key and address for account.
+        :return: Iterator, or asynchronous iterator, over transaction objects.
+        """
+        return self._stream(nis.stream_account_transactions, public_account, **kwds)
+
+    def iter_transactions(
+        self,
+        public_account: models.PublicAccount,
+        page_size: int = PAGE_SIZE,
+        stop_id: typing.Optional[str] = None,
+        stop_height: typing.Optional[int] = None,
+        **kwds
+    ):
+        """
+        Iterate over all transactions for account, page by page.
+
+        Transactions are yielded from newest to oldest, holding a single
+        page in memory. Asynchronous clients request the next page while
+        the current one is consumed.
+
+        :param public_account: Public key and address for account.
+        :param page_size: (Optional) Number of transactions per page.
+        :param stop_id: (Optional) Stop before the transaction with this ID.
+        :param stop_height: (Optional) Stop before the first transaction below this height.
+        :return: Iterator, or asynchronous iterator, over transaction objects.
+        """
+        cb = nis.get_account_transactions
+        return self._paginate(cb, public_account, page_size, stop_id, stop_height, **kwds)
+
     def incoming_transactions(
         self,
         public_account: models.PublicAccount,
@@ -366,6 +792,42 @@ class AccountHTTP(HTTPSharedBase):
         """
         return self(nis.get_account_incoming_transactions, public_account, **kwds)
 
+    def stream_incoming_transactions(
+        self,
+        public_account: models.PublicAccount,
+        **kwds
+    ):
+        """
+        Stream all incoming transactions for account.
+
+        The response is decoded incrementally, and transaction objects are yielded
+        as they arrive rather than materialized in a single list.
+
+        :param public_account: Public key and address for account.
+        :return: Iterator, or asynchronous iterator, over transaction objects.
+        """
+        return self._stream(nis.stream_account_incoming_transactions, public_account, **kwds)
+
+    def iter_incoming_transactions(
+        self,
+        public_account: models.PublicAccount,
+        page_size: int = PAGE_SIZE,
+        stop_id: typing.Optional[str] = None,
+        stop_height: typing.Optional[int] = None,
+        **kwds
+    ):
+        """
+        Iterate over all incoming transactions for account, page by page.
+
+        :param public_account: Public key and address for account.
+        :param page_size: (Optional) Number of transactions per page.
+        :param stop_id: (Optional) Stop before the transaction with this ID.
+        :param stop_height: (Optional) Stop before the first transaction below this height.
+        :return: Iterator, or asynchronous iterator, over transaction objects.
+        """
+        cb = nis.get_account_incoming_transactions
+        return self._paginate(cb, public_account, page_size, stop_id, stop_height, **kwds)
+
     def outgoing_transactions(
         self,
         public_account: models.PublicAccount,
@@ -379,6 +841,42 @@ class AccountHTTP(HTTPSharedBase):
         """
         return self(nis.get_account_outgoing_transactions, public_account, **kwds)
 
+    def stream_outgoing_transactions(
+        self,
+        public_account: models.PublicAccount,
+        **kwds
+    ):
+        """
+        Stream all outgoing transactions for account.
+
+        The response is decoded incrementally, and transaction objects are yielded
+        as they arrive rather than materialized in a single list.
+
+        :param public_account: Public key and address for account.
+        :return: Iterator, or asynchronous iterator, over transaction objects.
+        """
+        return self._stream(nis.stream_account_outgoing_transactions, public_account, **kwds)
+
+    def iter_outgoing_transactions(
+        self,
+        public_account: models.PublicAccount,
+        page_size: int = PAGE_SIZE,
+        stop_id: typing.Optional[str] = None,
+        stop_height: typing.Optional[int] = None,
+        **kwds
+    ):
+        """
+        Iterate over all outgoing transactions for account, page by page.
+
+        :param public_account: Public key and address for account.
+        :param page_size: (Optional) Number of transactions per page.
+        :param stop_id: (Optional) Stop before the transaction with this ID.
+        :param stop_height: (Optional) Stop before the first transaction below this height.
+        :return: Iterator, or asynchronous iterator, over transaction objects.
+        """
+        cb = nis.get_account_outgoing_transactions
+        return self._paginate(cb, public_account, page_size, stop_id, stop_height, **kwds)
+
     def unconfirmed_transactions(
         self,
         public_account: models.PublicAccount,
@@ -392,6 +890,22 @@ class AccountHTTP(HTTPSharedBase):
         """
         return self(nis.get_account_unconfirmed_transactions, public_account, **kwds)
 
+    def stream_unconfirmed_transactions(
+        self,
+        public_account: models.PublicAccount,
+        **kwds
+    ):
+        """
+        Stream all unconfirmed transactions for account.
+
+        The response is decoded incrementally, and unconfirmed transaction objects are yielded
+        as they arrive rather than materialized in a single list.
+
+        :param public_account: Public key and address for account.
+        :return: Iterator, or asynchronous iterator, over unconfirmed transaction objects.
+        """
+        return self._stream(nis.stream_account_unconfirmed_transactions, public_account, **kwds)
+
     def aggregate_bonded_transactions(
         self,
         public_account: models.PublicAccount,
@@ -404,6 +918,42 @@ class AccountHTTP(HTTPSharedBase):
         :return: List of aggregate bonded transaction objects.
         """
         return self(nis.get_account_partial_transactions, public_account, **kwds)
+
+    def stream_aggregate_bonded_transactions(
+        self,
+        public_account: models.PublicAccount,
+        **kwds
+    ):
+        """
+        Stream all aggregate bonded transactions for account.
+
+        The response is decoded incrementally, and aggregate bonded transaction objects are yielded
+        as they arrive rather than materialized in a single list.
+
+        :param public_account: Public key and address for account.
+        :return: Iterator, or asynchronous iterator, over aggregate bonded transaction objects.
+        """
+        return self._stream(nis.stream_account_partial_transactions, public_account, **kwds)
+
+    def iter_aggregate_bonded_transactions(
+        self,
+        public_account: models.PublicAccount,
+        page_size: int = PAGE_SIZE,
+        stop_id: typing.Optional[str] = None,
+        stop_height: typing.Optional[int] = None,
+        **kwds
+    ):
+        """
+        Iterate over all aggregate bonded transactions for account, page by page.
+
+        :param public_account: Public key and address for account.
+        :param page_size: (Optional) Number of transactions per page.
+        :param stop_id: (Optional) Stop before the transaction with this ID.
+        :param stop_height: (Optional) Stop before the first transaction below this height.
+        :return: Iterator, or asynchronous iterator, over transaction objects.
+        """
+        cb = nis.get_account_partial_transactions
+        return self._paginate(cb, public_account, page_size, stop_id, stop_height, **kwds)
 # TODO: Check when stabilized
 #     def contracts(
 #         self,
@@ -431,6 +981,23 @@ class AccountHTTP(HTTPSharedBase):
         """
         return self(nis.get_account_names, addresses, **kwds)
 
+    def get_account_names_bulk(
+        self,
+        addresses: typing.Sequence[models.Address],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        concurrency: int = BULK_CONCURRENCY,
+        **kwds
+    ):
+        """
+        Get friendly names of an arbitrary number of accounts.
+
+        :param addresses: Sequence of account addresses.
+        :param chunk_size: (Optional) Maximum addresses per request.
+        :param concurrency: (Optional) Maximum concurrent requests.
+        :return: List of AccountNames objects, merged in chunk order.
+        """
+        return self._bulk(nis.get_account_names, addresses, chunk_size, concurrency, **kwds)
+
 
 class BlockchainHTTP(HTTPSharedBase):
     """Abstract base class for the blockchain HTTP client."""
@@ -454,6 +1021,50 @@ class BlockchainHTTP(HTTPSharedBase):
         """
         return self(nis.get_blocks_by_height_with_limit, height, limit, **kwds)
 
+    def iter_blocks(
+        self,
+        start: int,
+        end: typing.Optional[int] = None,
+        limit: int = BLOCKS_LIMIT,
+        concurrency: int = BULK_CONCURRENCY,
+        transactions: bool = False,
+        receipts: bool = False,
+        nodes: typing.Sequence[BlockchainHTTP] = (),
+        **kwds
+    ):
+        """
+        Iterate over all blocks in [start, end), in height order.
+
+        The range is split into windows of `limit` blocks, distributed
+        round-robin over this client and `nodes`. Asynchronous clients
+        request up to `concurrency` windows at once and reorder them,
+        synchronous clients request windows one at a time.
+
+        :param start: Height of the first block.
+        :param end: (Optional) Height after the last block, defaults to the chain height.
+        :param limit: (Optional) Number of blocks per window.
+        :param concurrency: (Optional) Maximum concurrent requests.
+        :param transactions: (Optional) Also request the transactions for each block.
+        :param receipts: (Optional) Also request the receipts for each block.
+        :param nodes: (Optional) Additional blockchain clients to share the load.
+        :return: Iterator, or asynchronous iterator, over block information models,
+            or `BlockData` if transactions or receipts are requested.
+        """
+        return self._iter_blocks(start, end, limit, concurrency, transactions, receipts, nodes, **kwds)
+
+    def stream_blocks_by_height_with_limit(self, height: int, limit: int, **kwds):
+        """
+        Stream information for blocks between [height, height+limit].
+
+        The response is decoded incrementally, and blocks are yielded
+        as they arrive rather than materialized in a single list.
+
+        :param height: Block height.
+        :param limit: Maximum number of blocks to return.
+        :return: Iterator, or asynchronous iterator, over block information models.
+        """
+        return self._stream(nis.stream_blocks_by_height_with_limit, height, limit, **kwds)
+
     def get_block_transactions(self, height: int, **kwds):
         """
         Get information for all transactions included in a block by height.
@@ -463,6 +1074,15 @@ class BlockchainHTTP(HTTPSharedBase):
         """
         return self(nis.get_block_transactions, height, **kwds)
 
+    def stream_block_transactions(self, height: int, **kwds):
+        """
+        Stream information for all transactions included in a block by height.
+
+        :param height: Block height.
+        :return: Iterator, or asynchronous iterator, over transaction information models.
+        """
+        return self._stream(nis.stream_block_transactions, height, **kwds)
+
     def get_block_receipts(self, height: int, **kwds):
         """
         Get receipts for a block by height.
@@ -726,6 +1346,22 @@ class MosaicHTTP(HTTPSharedBase):
         """
         return self(nis.get_mosaic_richlist, mosaic_id, **kwds)
 
+    def stream_mosaic_richlist(
+        self,
+        mosaic_id: models.MosaicId,
+        **kwds
+    ):
+        """
+        Stream account balances in a given Mosaic.
+
+        The response is decoded incrementally, and balances are yielded
+        as they arrive rather than materialized in a single list.
+
+        :param mosaic_id: Mosaic ID.
+        :return: Iterator, or asynchronous iterator, over account balances.
+        """
+        return self._stream(nis.stream_mosaic_richlist, mosaic_id, **kwds)
+
 
 class NamespaceHTTP(HTTPSharedBase):
     """Abstract base class for the namespace HTTP client."""
@@ -769,6 +1405,23 @@ class NamespaceHTTP(HTTPSharedBase):
         """
         return self(nis.get_namespaces_from_accounts, addresses, **kwds)
 
+    def get_namespaces_from_accounts_bulk(
+        self,
+        addresses: typing.Sequence[models.Address],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        concurrency: int = BULK_CONCURRENCY,
+        **kwds
+    ):
+        """
+        Get namespaces owned by an arbitrary number of accounts.
+
+        :param addresses: Sequence of account addresses.
+        :param chunk_size: (Optional) Maximum addresses per request.
+        :param concurrency: (Optional) Maximum concurrent requests.
+        :return: List of namespace information objects, merged in chunk order.
+        """
+        return self._bulk(nis.get_namespaces_from_accounts, addresses, chunk_size, concurrency, **kwds)
+
     def get_namespaces_name(
         self,
         ids: typing.Sequence[models.NamespaceId],
@@ -906,12 +1559,216 @@ class TransactionHTTP(HTTPSharedBase):
 # ---------
 
 
-@util.dataclass(frozen=True)
+@util.dataclass(frozen=True, channel=None)
 class ListenerMessage(util.Object):
-    """Message from a listener."""
+    """
+    Message from a listener.
+
+    :param channel_name: Name of the channel (without the address).
+    :param message: Model for the message.
+    :param channel: (Optional) Subscribed channel, with the address if the node sent it.
+    """
 
     channel_name: str
     message: MessageType
+    channel: typing.Optional[str]
+
+
+def message_channel(channel_name: str, meta: dict) -> str:
+    """Get the subscribed channel from the name and metadata of a message."""
+
+    address = meta.get('address')
+    if address is None:
+        return channel_name
+    elif len(address) == 50:
+        # Hex-encoded address.
+        address = models.Address.create_from_encoded(address).address
+    return f'{channel_name}/{address.upper()}'
+
+
+def message_kind(data: dict) -> str:
+    """Get the kind of a decoded listener frame."""
+
+    if 'transaction' in data:
+        return 'transaction'
+    elif 'block' in data:
+        return 'block'
+    elif 'status' in data:
+        return 'status'
+    elif 'meta' in data:
+        return 'meta'
+    elif 'parentHash' in data:
+        return 'cosignature'
+    # Unknown data information, don't pollute the message,
+    # only send the information's keys.
+    msg = f"Unknown message from Listener subscription, keys are {data.keys()}."
+    raise ValueError(msg)
+
+
+def decode_message(data: dict) -> ListenerMessage:
+    """Build the listener message for a decoded listener frame."""
+
+    kind = message_kind(data)
+    if kind == 'transaction':
+        # New transaction data.
+        meta = dict(data['meta'])
+        channel_name = typing.cast(str, meta.pop('channelName'))
+        channel = message_channel(channel_name, meta)
+        transaction = models.Transaction.create_from_dto({**data, 'meta': meta})
+        return ListenerMessage(channel_name, transaction, channel)
+    elif kind == 'block':
+        # New block info.
+        block = models.BlockInfo.create_from_dto(data)
+        return ListenerMessage('block', block, 'block')
+    elif kind == 'status':
+        # New transaction status error.
+        error = models.TransactionStatusError.create_from_dto(data)
+        return ListenerMessage('status', error, f'status/{error.address.address}')
+    elif kind == 'meta':
+        # New metadata.
+        channel_name = typing.cast(str, data['meta']['channelName'])
+        hash = typing.cast(str, data['meta']['hash'])
+        return ListenerMessage(channel_name, hash, message_channel(channel_name, data['meta']))
+    # New cosignature for transaction.
+    cosignature = models.CosignatureSignedTransaction.create_from_dto(data)
+    return ListenerMessage('cosignature', cosignature, message_channel('cosignature', data.get('meta', {})))
+
+
+class LazyListenerMessage(util.Object):
+    """
+    Message from a listener, decoded on demand.
+
+    The channel, hash, height and signer are read from the JSON data
+    without building models, and the model is only built once `message`
+    is accessed. Invalid frames raise when first accessed.
+
+    :param raw: Raw websockets frame.
+    :param codec: JSON codec for the frame.
+    """
+
+    __slots__ = (
+        '_raw',
+        '_codec',
+        '_data',
+        '_decoded',
+    )
+
+    _raw: typing.AnyStr
+    _codec: typing.Any
+    _data: typing.Optional[dict]
+    _decoded: typing.Optional[ListenerMessage]
+
+    def __init__(self, raw: typing.AnyStr, codec: typing.Any) -> None:
+        self._raw = raw
+        self._codec = codec
+        self._data = None
+        self._decoded = None
+
+    def __repr__(self) -> str:
+        return f'LazyListenerMessage(channel={self.channel!r}, hash={self.hash!r})'
+
+    @classmethod
+    def create_from_message(
+        cls,
+        message: ListenerMessage,
+        codec: typing.Any,
+        network_type: models.NetworkType,
+    ) -> LazyListenerMessage:
+        """
+        Wrap an eager block message, such as a block requested from the REST API.
+
+        :param message: Block message from a listener.
+        :param codec: JSON codec for the frame.
+        :param network_type: Network type.
+        """
+
+        data = message.message.to_dto(network_type)
+        inst = cls(codec.dumps(data), codec)
+        inst._data = data
+        inst._decoded = message
+        return inst
+
+    @property
+    def raw(self) -> typing.AnyStr:
+        """Get the raw websockets frame."""
+        return self._raw
+
+    @property
+    def data(self) -> dict:
+        """Get the decoded JSON data."""
+        if self._data is None:
+            self._data = self._codec.loads(self._raw)
+        return self._data
+
+    @property
+    def kind(self) -> str:
+        """Get the kind of message (transaction, block, status, meta or cosignature)."""
+        return message_kind(self.data)
+
+    @property
+    def channel_name(self) -> str:
+        """Get the name of the channel (without the address)."""
+
+        kind = self.kind
+        if kind in ('transaction', 'meta'):
+            return typing.cast(str, self.data['meta']['channelName'])
+        return kind
+
+    @property
+    def channel(self) -> str:
+        """Get the subscribed channel, with the address if the node sent it."""
+
+        kind = self.kind
+        if kind == 'block':
+            return 'block'
+        return message_channel(self.channel_name, self.data.get('meta', {}))
+
+    @property
+    def hash(self) -> typing.Optional[str]:
+        """Get the transaction or block hash."""
+
+        data = self.data
+        kind = message_kind(data)
+        if kind == 'status':
+            return typing.cast(str, data['hash'])
+        elif kind == 'cosignature':
+            return typing.cast(str, data['parentHash'])
+        return typing.cast(typing.Optional[str], data['meta'].get('hash'))
+
+    @property
+    def height(self) -> typing.Optional[int]:
+        """Get the block height, or the height of a confirmed transaction."""
+
+        data = self.data
+        kind = message_kind(data)
+        if kind == 'block':
+            return util.u64_from_dto(data['block']['height'])
+        elif kind == 'transaction' and 'height' in data['meta']:
+            return util.u64_from_dto(data['meta']['height'])
+        return None
+
+    @property
+    def signer(self) -> typing.Optional[str]:
+        """Get the public key of the transaction, block or cosignature signer."""
+
+        data = self.data
+        kind = message_kind(data)
+        if kind in ('transaction', 'block'):
+            return typing.cast(str, data[kind]['signer'])
+        elif kind == 'cosignature':
+            return typing.cast(str, data['signer'])
+        return None
+
+    @property
+    def message(self) -> MessageType:
+        """Get the model for the message, building it on first access."""
+        return self.decode().message
+
+    def decode(self) -> ListenerMessage:
+        """Build the eager listener message."""
+        if self._decoded is None:
+            self._decoded = decode_message(self.data)
+        return self._decoded
 
 
 @util.observable
@@ -922,11 +1779,16 @@ class Listener(util.Object):
     :param endpoint: Domain name and port for the endpoint.
     """
 
+    _endpoint: str
     _client: client.WebsocketClient
     _iter_: typing.AsyncIterator[bytes]
     _conn: typing.AsyncContextManager
     _loop: util.OptionalLoopType
+    _network_type: typing.Optional[models.NetworkType] = None
+    _codec: typing.Any
     _uid: typing.Optional[str] = None
+    _lazy: bool = False
+    _channels: typing.Dict[str, None]
 
     def __enter__(self) -> Listener:
         raise TypeError("Only use async with.")
@@ -959,49 +1821,39 @@ class Listener(util.Object):
         """Get if client session has been closed."""
         return self.raw.closed
 
+    @property
+    def channels(self) -> typing.Sequence[str]:
+        """Get the subscribed channels."""
+        return tuple(self._channels)
+
+    @property
+    async def network_type(self) -> models.NetworkType:
+        """Get network type for the node, shared with HTTP clients."""
+        raise util.AbstractMethodError
+
+    @property
+    async def generation_hash(self) -> str:
+        """Get nemesis generation hash for the node, shared with HTTP clients."""
+        raise util.AbstractMethodError
+
     @property
     async def uid(self) -> str:
         """Get UUID (unique identifier) for WS requests."""
 
         if self._uid is None:
-            self._uid = json.loads(await self.raw.recv())['uid']
+            self._uid = self._codec.loads(await self.raw.recv())['uid']
         return self._uid
 
     def __aiter__(self) -> Listener:
         return self
 
-    async def __anext__(self) -> typing.Optional[ListenerMessage]:
+    async def __anext__(self) -> typing.Union[ListenerMessage, LazyListenerMessage, None]:
         """Iterate over subscribed messages."""
 
         message: bytes = await self._iter.__anext__()
-        data = json.loads(message)
-        if 'transaction' in data:
-            # New transaction data.
-            channel_name = typing.cast(str, data['meta'].pop('channelName'))
-            transaction = models.Transaction.create_from_dto(data)
-            return ListenerMessage(channel_name, transaction)
-        elif 'block' in data:
-            # New block info.
-            block = models.BlockInfo.create_from_dto(data)
-            return ListenerMessage('block', block)
-        elif 'status' in data:
-            # New transaction status error.
-            error = models.TransactionStatusError.create_from_dto(data)
-            return ListenerMessage('status', error)
-        elif 'meta' in data:
-            # New metadata.
-            channel_name = typing.cast(str, data['meta']['channelName'])
-            hash = typing.cast(str, data['meta']['hash'])
-            return ListenerMessage(channel_name, hash)
-        elif 'parentHash' in data:
-            # New cosignature for transaction.
-            cosignature = models.CosignatureSignedTransaction.create_from_dto(data)
-            return ListenerMessage('cosignature', cosignature)
-        else:
-            # Unknown data information, don't pollute the message,
-            # only send the information's keys.
-            msg = f"Unknown message from Listener subscription, keys are {data.keys()}."
-            raise ValueError(msg)
+        if self._lazy:
+            return LazyListenerMessage(message, self._codec)
+        return decode_message(self._codec.loads(message))
 
     @util.observable
     async def new_block(self) -> None:
@@ -1051,17 +1903,137 @@ class Listener(util.Object):
     async def subscribe(self, channel: str) -> None:
         """Subscribe to websockets channel."""
 
-        message = json.dumps({
+        message = self._codec.dumps({
             'uid': await self.uid,
             'subscribe': channel
         })
         await self.raw.send(message)
+        self._channels[channel] = None
 
     async def unsubscribe(self, channel: str) -> None:
         """Unsubscribe from websockets channel."""
 
-        message = json.dumps({
+        message = self._codec.dumps({
             'uid': await self.uid,
             'unsubscribe': channel
         })
         await self.raw.send(message)
+        self._channels.pop(channel, None)
+
+    async def subscribe_many(
+        self,
+        channels: typing.Iterable[str],
+        rate: typing.Optional[float] = None,
+        progress: typing.Optional[ProgressCallback] = None,
+    ) -> typing.List[str]:
+        """
+        Subscribe to many websockets channels, skipping subscribed channels.
+
+        :param channels: Channels to subscribe to.
+        :param rate: (Optional) Maximum number of frames sent per second.
+        :param progress: (Optional) Callback with the number of frames sent and the total.
+        :return: Newly subscribed channels.
+        """
+
+        added = [i for i in dict.fromkeys(channels) if i not in self._channels]
+        await self._send_many([('subscribe', i) for i in added], rate, progress)
+        return added
+
+    async def unsubscribe_many(
+        self,
+        channels: typing.Iterable[str],
+        rate: typing.Optional[float] = None,
+        progress: typing.Optional[ProgressCallback] = None,
+    ) -> typing.List[str]:
+        """
+        Unsubscribe from many websockets channels, skipping unsubscribed channels.
+
+        :param channels: Channels to unsubscribe from.
+        :param rate: (Optional) Maximum number of frames sent per second.
+        :param progress: (Optional) Callback with the number of frames sent and the total.
+        :return: Unsubscribed channels.
+        """
+
+        removed = [i for i in dict.fromkeys(channels) if i in self._channels]
+        await self._send_many([('unsubscribe', i) for i in removed], rate, progress)
+        return removed
+
+    async def update_channels(
+        self,
+        channels: typing.Iterable[str],
+        rate: typing.Optional[float] = None,
+        progress: typing.Optional[ProgressCallback] = None,
+    ) -> typing.Tuple[typing.List[str], typing.List[str]]:
+        """
+        Change the subscribed channels, only sending frames for the difference.
+
+        :param channels: Channels to be subscribed to, all others are unsubscribed.
+        :param rate: (Optional) Maximum number of frames sent per second.
+        :param progress: (Optional) Callback with the number of frames sent and the total.
+        :return: Newly subscribed and unsubscribed channels.
+        """
+
+        channels = dict.fromkeys(channels)
+        added = [i for i in channels if i not in self._channels]
+        removed = [i for i in self._channels if i not in channels]
+        frames = [('unsubscribe', i) for i in removed] + [('subscribe', i) for i in added]
+        await self._send_many(frames, rate, progress)
+        return added, removed
+
+    async def _send_many(
+        self,
+        frames: typing.Sequence[typing.Tuple[str, str]],
+        rate: typing.Optional[float] = None,
+        progress: typing.Optional[ProgressCallback] = None,
+    ) -> None:
+        """
+        Send subscribe or unsubscribe frames in pipelined batches.
+
+        The uid is read once, and each batch of up to `SEND_BATCH` frames
+        is written concurrently, rather than awaiting each frame in turn,
+        pacing them to at most `rate` frames per second. The subscribed
+        channels are updated for each frame sent, so a failed call may
+        be repeated to send the remaining frames.
+        """
+
+        if rate is not None and rate <= 0:
+            raise ValueError("Rate must be positive.")
+        uid = await self.uid
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        total = len(frames)
+        index = 0
+        while index < total:
+            count = SEND_BATCH
+            if rate is not None:
+                delay = start + index / rate - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                # Release every frame whose time slot has passed.
+                due = int((loop.time() - start) * rate) + 1 - index
+                count = max(1, min(count, due))
+            await self._send_batch(uid, frames[index:index + count])
+            sent = index + count
+            if progress is not None and (sent // PROGRESS_INTERVAL > index // PROGRESS_INTERVAL or sent >= total):
+                progress(min(sent, total), total)
+            index = sent
+
+    async def _send_batch(self, uid: str, frames: typing.Sequence[typing.Tuple[str, str]]) -> None:
+        """Write frames concurrently, tracking the channels of the frames sent."""
+
+        dumps = self._codec.dumps
+        send = self.raw.send
+        results = await asyncio.gather(
+            *[send(dumps({'uid': uid, action: channel})) for action, channel in frames],
+            return_exceptions=True,
+        )
+        error = None
+        for (action, channel), result in zip(frames, results):
+            if isinstance(result, BaseException):
+                error = error or result
+            elif action == 'subscribe':
+                self._channels[channel] = None
+            else:
+                self._channels.pop(channel, None)
+        if error is not None:
+            raise error
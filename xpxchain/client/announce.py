@@ -0,0 +1,321 @@
+"""
+    announce
+    ========
+
+    Pipeline to announce many signed transactions and track their outcome.
+
+    Transactions are announced by a bounded pool of workers, and then
+    tracked until they are confirmed, rejected or time out. Outcomes are
+    polled in batches with `get_transaction_statuses`, and, with a
+    listener, also received as soon as the node reports them over the
+    `status` and `confirmedAdded` websockets channels.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import typing
+
+from . import abc
+from .. import errors
+from .. import models
+from .. import util
+
+__all__ = ['AnnouncePipeline']
+
+# Default number of concurrent announce requests.
+ANNOUNCE_CONCURRENCY = 16
+# Default number of hashes per transaction statuses request.
+STATUS_BATCH_SIZE = 100
+
+
+class PendingTransaction(util.Object):
+    """Signed transaction awaiting its outcome."""
+
+    __slots__ = ('transaction', 'future', 'announced')
+
+    transaction: models.SignedTransaction
+    future: asyncio.Future
+    announced: typing.Optional[float]
+
+    def __init__(self, transaction: models.SignedTransaction, future: asyncio.Future) -> None:
+        self.transaction = transaction
+        self.future = future
+        self.announced = None
+
+    @property
+    def address(self) -> models.Address:
+        """Get the address of the transaction signer."""
+        signer = self.transaction.signer
+        network_type = self.transaction.network_type
+        return models.PublicAccount.create_from_public_key(signer, network_type).address
+
+
+def retrieve_exception(future: asyncio.Future) -> None:
+    """Mark the outcome of a future as retrieved, since callers may never await it."""
+
+    if not future.cancelled():
+        future.exception()
+
+
+class AnnouncePipeline(util.Object):
+    """
+    Announce signed transactions and resolve a future with each outcome.
+
+    Each future resolves to the confirmed `TransactionStatus`, or raises
+    `TransactionError` if the transaction is rejected, `asyncio.TimeoutError`
+    if it is not confirmed within `timeout`, or the error from the
+    announce request.
+
+    :param http: Asynchronous transaction client.
+    :param listener: (Optional) Open listener to receive outcomes from, used exclusively by the pipeline.
+    :param concurrency: (Optional) Maximum number of concurrent announce requests.
+    :param batch_size: (Optional) Number of hashes per transaction statuses request.
+    :param poll_interval: (Optional) Delay between transaction statuses polls (in seconds).
+    :param timeout: (Optional) Time to wait for each outcome after announcing (in seconds).
+    """
+
+    __slots__ = (
+        '_http',
+        '_listener',
+        '_concurrency',
+        '_batch_size',
+        '_poll_interval',
+        '_timeout',
+        '_queue',
+        '_pending',
+        '_channels',
+        '_tasks',
+        'announced',
+        'confirmed',
+        'failed',
+    )
+
+    _http: abc.TransactionHTTP
+    _listener: typing.Optional[abc.Listener]
+    _concurrency: int
+    _batch_size: int
+    _poll_interval: float
+    _timeout: typing.Optional[float]
+    _queue: asyncio.Queue
+    _pending: typing.Dict[str, PendingTransaction]
+    _channels: typing.Set[str]
+    _tasks: typing.List[asyncio.Future]
+    announced: int
+    confirmed: int
+    failed: int
+
+    def __init__(
+        self,
+        http: abc.TransactionHTTP,
+        listener: typing.Optional[abc.Listener] = None,
+        concurrency: int = ANNOUNCE_CONCURRENCY,
+        batch_size: int = STATUS_BATCH_SIZE,
+        poll_interval: float = 1.0,
+        timeout: typing.Optional[float] = None,
+    ) -> None:
+        if concurrency <= 0:
+            raise ValueError("Concurrency must be positive.")
+        self._http = http
+        self._listener = listener
+        self._concurrency = concurrency
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._timeout = timeout
+        self._pending = {}
+        self._channels = set()
+        self._tasks = []
+        self.announced = 0
+        self.confirmed = 0
+        self.failed = 0
+
+    async def __aenter__(self) -> AnnouncePipeline:
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                await self.join()
+        finally:
+            await self.close()
+
+    def __len__(self) -> int:
+        """Get the number of transactions awaiting their outcome."""
+        return len(self._pending)
+
+    def start(self) -> None:
+        """Start the announce workers and outcome tracking."""
+
+        if self._tasks:
+            raise RuntimeError("Pipeline already started.")
+        self._queue = asyncio.Queue(maxsize=self._concurrency * 2)
+        self._tasks = [asyncio.ensure_future(self._announce()) for _ in range(self._concurrency)]
+        self._tasks.append(asyncio.ensure_future(self._poll()))
+        if self._listener is not None:
+            self._tasks.append(asyncio.ensure_future(self._listen()))
+
+    async def submit(self, transaction: models.SignedTransaction) -> asyncio.Future:
+        """
+        Queue a signed transaction to announce, waiting while the queue is full.
+
+        :param transaction: Signed transaction.
+        :return: Future resolving to the outcome of the transaction.
+        """
+
+        if not self._tasks:
+            raise RuntimeError("Pipeline must be started.")
+        hash = transaction.hash.upper()
+        pending = self._pending.get(hash)
+        if pending is not None:
+            return pending.future
+        future = asyncio.get_event_loop().create_future()
+        # Avoid "exception was never retrieved" warnings for dropped futures.
+        future.add_done_callback(retrieve_exception)
+        self._pending[hash] = PendingTransaction(transaction, future)
+        await self._queue.put(hash)
+        return future
+
+    async def submit_all(
+        self,
+        transactions: typing.Iterable[models.SignedTransaction],
+    ) -> typing.List[asyncio.Future]:
+        """
+        Queue many signed transactions to announce.
+
+        :param transactions: Signed transactions.
+        :return: Futures resolving to the outcome of each transaction.
+        """
+
+        return [await self.submit(i) for i in transactions]
+
+    async def join(self) -> None:
+        """Wait until every submitted transaction has an outcome."""
+
+        while self._pending:
+            futures = [i.future for i in self._pending.values()]
+            await asyncio.wait(futures)
+
+    async def close(self) -> None:
+        """Stop the pipeline, cancelling transactions without an outcome."""
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for pending in self._pending.values():
+            pending.future.cancel()
+        self._pending.clear()
+
+    # WORKERS
+
+    async def _announce(self) -> None:
+        loop = asyncio.get_event_loop()
+        while True:
+            hash = await self._queue.get()
+            pending = self._pending.get(hash)
+            try:
+                if pending is None:
+                    continue
+                if self._listener is not None:
+                    # Subscribe before announcing, so no outcome is missed.
+                    await self._subscribe(pending.address)
+                await self._http.announce(pending.transaction)
+            except Exception as exc:
+                self._resolve(hash, exc=exc)
+            else:
+                pending.announced = loop.time()
+                self.announced += 1
+            finally:
+                self._queue.task_done()
+
+    async def _subscribe(self, address: models.Address) -> None:
+        listener = typing.cast(abc.Listener, self._listener)
+        if address.address not in self._channels:
+            self._channels.add(address.address)
+            await listener.status(address)
+            await listener.confirmed(address)
+
+    async def _poll(self) -> None:
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            now = loop.time()
+            hashes = []
+            for hash, pending in list(self._pending.items()):
+                if pending.announced is None:
+                    continue
+                if self._timeout is not None and now - pending.announced >= self._timeout:
+                    self._resolve(hash, exc=asyncio.TimeoutError(f"Transaction {hash} has no outcome."))
+                else:
+                    hashes.append(hash)
+
+            for chunk in abc.chunked(hashes, self._batch_size):
+                try:
+                    statuses = await self._http.get_transaction_statuses(chunk)
+                except Exception:
+                    # Transient failure, try again on the next poll.
+                    continue
+                for status in statuses:
+                    self._update(status)
+
+    async def _listen(self) -> None:
+        listener = typing.cast(abc.Listener, self._listener)
+        try:
+            async for message in listener:
+                if message.channel_name == 'status':
+                    self._resolve(message.message.hash, exc=errors.TransactionError(message.message))
+                elif message.channel_name == 'confirmedAdded':
+                    transaction = message.message
+                    info = transaction.transaction_info
+                    status = models.TransactionStatus(
+                        models.TransactionStatusGroup.CONFIRMED,
+                        'Success',
+                        info.hash,
+                        transaction.deadline,
+                        info.height,
+                    )
+                    self._update(status)
+        except Exception:
+            # Lost the connection, keep polling for outcomes.
+            pass
+
+    # HELPERS
+
+    def _update(self, status: models.TransactionStatus) -> None:
+        hash = status.hash.upper()
+        pending = self._pending.get(hash)
+        if pending is None:
+            return
+        if status.group == models.TransactionStatusGroup.CONFIRMED:
+            self._resolve(hash, result=status)
+        elif status.group == models.TransactionStatusGroup.FAILED:
+            error = models.TransactionStatusError(hash, status.status, status.deadline, 'status', pending.address)
+            self._resolve(hash, exc=errors.TransactionError(error))
+
+    def _resolve(self, hash: str, result=None, exc: typing.Optional[BaseException] = None) -> None:
+        pending = self._pending.pop(hash.upper(), None)
+        if pending is None or pending.future.done():
+            return
+        if exc is None:
+            self.confirmed += 1
+            pending.future.set_result(result)
+        else:
+            self.failed += 1
+            pending.future.set_exception(exc)
@@ -0,0 +1,284 @@
+"""
+    cache
+    =====
+
+    Opt-in response cache for immutable NIS resources.
+
+    Confirmed blocks, their transactions and receipts, and confirmed
+    transactions never change once they are deep enough below the chain
+    height that they cannot be rolled back. The cache only stores
+    responses whose height is proven to be at least `depth` blocks below
+    the latest chain height seen through `get_blockchain_height`. When
+    a response is not yet proven final, the client requests the chain
+    height again, at most once every `refresh` seconds.
+
+    Decoded models are kept in a size-bounded LRU in memory. Optionally,
+    the raw responses are also persisted to an SQLite database, and
+    decoded again when loaded from disk.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import collections
+import json
+import sqlite3
+import threading
+import time
+import typing
+
+from .. import util
+
+__all__ = ['ResponseCache']
+
+# Sentinel for a cache miss, since `None` may be a valid response.
+MISSING = object()
+# Keywords that do not change the response for a request.
+TRANSPARENT_KWDS = frozenset({'timeout'})
+
+
+def transaction_height(args, result) -> typing.Optional[int]:
+    """Get the height of a confirmed transaction."""
+
+    info = result.transaction_info
+    if info is None or not info.is_confirmed():
+        return None
+    return info.height
+
+
+def blocks_height(args, result) -> typing.Optional[int]:
+    """Get the height of the last block, if the page of blocks is complete."""
+
+    height, limit = args
+    if len(result) != limit:
+        return None
+    return max(i.height for i in result)
+
+
+# Callbacks returning the height of an immutable response, or `None`
+# if the response cannot be proven to be immutable.
+CACHE_HEIGHT = {
+    'get_block_by_height': lambda args, result: args[0],
+    'get_blocks_by_height_with_limit': blocks_height,
+    'get_block_transactions': lambda args, result: args[0],
+    'get_block_receipts': lambda args, result: args[0],
+    'get_transaction': transaction_height,
+}
+
+
+class ResponseCache(util.Object):
+    """
+    Size-bounded LRU cache for immutable NIS responses.
+
+    :param maxsize: (Optional) Maximum number of responses held in memory.
+    :param depth: (Optional) Number of blocks below the chain height considered final.
+    :param path: (Optional) Path to an SQLite database to persist responses.
+    :param refresh: (Optional) Minimum delay (in seconds) between chain height requests.
+    """
+
+    __slots__ = (
+        '_maxsize',
+        '_depth',
+        '_height',
+        '_refresh',
+        '_refreshed',
+        '_lock',
+        '_memory',
+        '_db',
+        'hits',
+        'misses',
+    )
+
+    _maxsize: int
+    _depth: int
+    _height: typing.Optional[int]
+    _refresh: float
+    _refreshed: typing.Optional[float]
+    _lock: threading.Lock
+    _memory: collections.OrderedDict
+    _db: typing.Optional[sqlite3.Connection]
+    hits: int
+    misses: int
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        depth: int = 360,
+        path: typing.Optional[str] = None,
+        refresh: float = 10.0,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("Cache size must be positive.")
+        self._maxsize = maxsize
+        self._depth = depth
+        self._height = None
+        self._refresh = refresh
+        self._refreshed = None
+        self._lock = threading.Lock()
+        self._memory = collections.OrderedDict()
+        self._db = None
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses '
+                '(key TEXT PRIMARY KEY, status INTEGER, json TEXT)'
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    @property
+    def depth(self) -> int:
+        """Get number of blocks below the chain height considered final."""
+        return self._depth
+
+    @property
+    def height(self) -> typing.Optional[int]:
+        """Get latest known chain height."""
+        return self._height
+
+    @height.setter
+    def height(self, height: int) -> None:
+        with self._lock:
+            if self._height is None or height > self._height:
+                self._height = height
+
+    def key(self, name: str, network_type, args: tuple, kwds: dict) -> typing.Optional[str]:
+        """
+        Get the cache key for a request, or `None` if it is not cacheable.
+
+        :param name: Name of the NIS callback.
+        :param network_type: Network type for the response.
+        :param args: Positional arguments for the request.
+        :param kwds: Keyword arguments for the request.
+        """
+
+        if name not in CACHE_HEIGHT or not TRANSPARENT_KWDS.issuperset(kwds):
+            return None
+        return f'{name}:{int(network_type)}:{args!r}'
+
+    def get(self, key: str, network_type, process) -> typing.Any:
+        """
+        Get the cached response for a key, or `MISSING`.
+
+        :param key: Cache key for the request.
+        :param network_type: Network type for the response.
+        :param process: Callback to decode a response loaded from disk.
+        """
+
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+            row = None
+            if self._db is not None:
+                query = 'SELECT status, json FROM responses WHERE key = ?'
+                row = self._db.execute(query, (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return MISSING
+            self.hits += 1
+
+        result = process(row[0], json.loads(row[1]), network_type)
+        with self._lock:
+            self._insert(key, result)
+        return result
+
+    def needs_height(self, name: str, args: tuple, result) -> bool:
+        """
+        Check if a newer chain height may prove a response immutable.
+
+        Reserves the refresh when it returns `True`, so the chain height
+        is requested at most once every `refresh` seconds.
+
+        :param name: Name of the NIS callback.
+        :param args: Positional arguments for the request.
+        :param result: Decoded response.
+        """
+
+        height = CACHE_HEIGHT[name](args, result)
+        now = time.monotonic()
+        with self._lock:
+            if height is None or self._is_final(height):
+                return False
+            if self._refreshed is not None and now - self._refreshed < self._refresh:
+                return False
+            self._refreshed = now
+            return True
+
+    def put(self, name: str, key: str, args: tuple, status: int, data, result) -> bool:
+        """
+        Store a response if it is proven to be immutable.
+
+        :param name: Name of the NIS callback.
+        :param key: Cache key for the request.
+        :param args: Positional arguments for the request.
+        :param status: Status code for HTTP response.
+        :param data: JSON data for response message.
+        :param result: Decoded response.
+        :return: If the response was stored.
+        """
+
+        height = CACHE_HEIGHT[name](args, result)
+        with self._lock:
+            if not self._is_final(height):
+                return False
+            self._insert(key, result)
+            if self._db is not None:
+                query = 'INSERT OR REPLACE INTO responses VALUES (?, ?, ?)'
+                self._db.execute(query, (key, status, json.dumps(data)))
+                self._db.commit()
+        return True
+
+    def observe(self, name: str, result) -> None:
+        """Track the chain height from responses passing through the client."""
+
+        if name == 'get_blockchain_height':
+            self.height = result
+
+    def clear(self) -> None:
+        """Remove all cached responses, including those on disk."""
+
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM responses')
+                self._db.commit()
+
+    def close(self) -> None:
+        """Close the on-disk backend."""
+
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _is_final(self, height: typing.Optional[int]) -> bool:
+        if height is None or self._height is None:
+            return False
+        return height <= self._height - self._depth
+
+    def _insert(self, key: str, result) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._maxsize:
+            self._memory.popitem(last=False)
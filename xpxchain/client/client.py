@@ -7,10 +7,17 @@
 """
 
 from __future__ import annotations
+import copy
 import typing
 import urllib.error
 import urllib3
 
+from .cache import ResponseCache
+from .codec import DEFAULT_CODEC, JSONCodec
+from .coalesce import RequestCoalescer
+from .limiter import AdaptiveLimiter
+from .metrics import RequestMetrics
+from .retry import RetryPolicy
 from .. import util
 
 # UTILITY
@@ -60,10 +67,73 @@ class ClientSharedBase(util.Object):
 
     _session: typing.Any
     _endpoint: str
-
-    def __init__(self, session, endpoint) -> None:
+    _cache: typing.Optional[ResponseCache]
+    _timeout: typing.Optional[typing.Any]
+    _release: typing.Optional[typing.Callable[[], None]]
+    _codec: JSONCodec
+    _retry: typing.Optional[RetryPolicy]
+    _metrics: typing.Optional[RequestMetrics]
+
+    def __init__(
+        self,
+        session,
+        endpoint,
+        cache=None,
+        timeout=None,
+        release=None,
+        codec=None,
+        retry=None,
+        metrics=None,
+    ) -> None:
         self._session = session
         self._endpoint = parse_http_url(endpoint).url
+        self._cache = cache
+        self._timeout = timeout
+        self._release = release
+        self._codec = codec or DEFAULT_CODEC
+        self._retry = retry
+        self._metrics = metrics
+
+    @property
+    def endpoint(self) -> str:
+        """Get URL for the endpoint."""
+        return self._endpoint
+
+    @property
+    def cache(self) -> typing.Optional[ResponseCache]:
+        """Get cache for immutable responses."""
+        return self._cache
+
+    @property
+    def codec(self) -> JSONCodec:
+        """Get JSON codec for request bodies and responses."""
+        return self._codec
+
+    @property
+    def timeout(self) -> typing.Optional[typing.Any]:
+        """Get default timeout for requests."""
+        return self._timeout
+
+    @property
+    def retry(self) -> typing.Optional[RetryPolicy]:
+        """Get retry policy for idempotent requests."""
+        return self._retry
+
+    @property
+    def metrics(self) -> typing.Optional[RequestMetrics]:
+        """Get metrics recorder for requests."""
+        return self._metrics
+
+    def with_endpoint(self, endpoint: str) -> ClientSharedBase:
+        """
+        Get a client sharing this session, for requests to another endpoint.
+
+        :param endpoint: Domain name and port for the endpoint.
+        """
+
+        inst = copy.copy(self)
+        inst._endpoint = parse_http_url(endpoint).url
+        return inst
 
     def close(self):
         """Close the client session."""
@@ -74,6 +144,15 @@ class ClientSharedBase(util.Object):
         """Get if client session has been closed."""
         raise util.AbstractMethodError
 
+    def _kwds(self, kwds: dict) -> dict:
+        if self._timeout is not None and 'timeout' not in kwds:
+            kwds['timeout'] = self._timeout
+        if kwds.get('json') is not None:
+            # Serialize request bodies with the client codec.
+            kwds['data'] = self._codec.dumps(kwds.pop('json'))
+            kwds['headers'] = {**kwds.get('headers', {}), 'Content-Type': 'application/json'}
+        return kwds
+
     def delete(self, relative_path, *args, **kwds):
         """
         Make DELETE request from relative path.
@@ -84,7 +163,7 @@ class ClientSharedBase(util.Object):
         """
 
         path = self._endpoint + relative_path
-        return self._session.delete(path, *args, **kwds)
+        return self._session.delete(path, *args, **self._kwds(kwds))
 
     def get(self, relative_path, *args, **kwds):
         """
@@ -96,7 +175,7 @@ class ClientSharedBase(util.Object):
         """
 
         path = self._endpoint + relative_path
-        return self._session.get(path, *args, **kwds)
+        return self._session.get(path, *args, **self._kwds(kwds))
 
     def head(self, relative_path, *args, **kwds):
         """
@@ -108,7 +187,7 @@ class ClientSharedBase(util.Object):
         """
 
         path = self._endpoint + relative_path
-        return self._session.head(path, *args, **kwds)
+        return self._session.head(path, *args, **self._kwds(kwds))
 
     def options(self, relative_path, *args, **kwds):
         """
@@ -120,7 +199,7 @@ class ClientSharedBase(util.Object):
         """
 
         path = self._endpoint + relative_path
-        return self._session.options(path, *args, **kwds)
+        return self._session.options(path, *args, **self._kwds(kwds))
 
     def patch(self, relative_path, *args, **kwds):
         """
@@ -132,7 +211,7 @@ class ClientSharedBase(util.Object):
         """
 
         path = self._endpoint + relative_path
-        return self._session.patch(path, *args, **kwds)
+        return self._session.patch(path, *args, **self._kwds(kwds))
 
     def post(self, relative_path, *args, **kwds):
         """
@@ -144,7 +223,7 @@ class ClientSharedBase(util.Object):
         """
 
         path = self._endpoint + relative_path
-        return self._session.post(path, *args, **kwds)
+        return self._session.post(path, *args, **self._kwds(kwds))
 
     def put(self, relative_path, *args, **kwds):
         """
@@ -156,7 +235,7 @@ class ClientSharedBase(util.Object):
         """
 
         path = self._endpoint + relative_path
-        return self._session.put(path, *args, **kwds)
+        return self._session.put(path, *args, **self._kwds(kwds))
 
 
 @util.inherit_doc
@@ -166,12 +245,28 @@ class Client(ClientSharedBase):
 
     :param session: Requests or aiohttp-like HTTP client session.
     :param endpoint: Domain name and port for the endpoint.
+    :param cache: (Optional) Cache for immutable responses.
+    :param timeout: (Optional) Default timeout for requests (in seconds).
+    :param release: (Optional) Callback to release a session the client does not own.
+    :param codec: (Optional) JSON codec for request bodies and responses.
+    :param retry: (Optional) Retry policy for idempotent requests.
+    :param metrics: (Optional) Metrics recorder for requests.
     """
 
     _closed: bool
 
-    def __init__(self, session, endpoint) -> None:
-        super().__init__(session, endpoint)
+    def __init__(
+        self,
+        session,
+        endpoint,
+        cache=None,
+        timeout=None,
+        release=None,
+        codec=None,
+        retry=None,
+        metrics=None,
+    ) -> None:
+        super().__init__(session, endpoint, cache, timeout, release, codec, retry, metrics)
         self._closed = False
 
     def __enter__(self) -> Client:
@@ -181,8 +276,13 @@ class Client(ClientSharedBase):
         self.close()
 
     def close(self) -> None:
+        if self._closed:
+            return
         self._closed = True
-        self._session.close()
+        if self._release is None:
+            self._session.close()
+        else:
+            self._release()
 
     @property
     def closed(self) -> bool:
@@ -196,11 +296,46 @@ class AsyncClient(ClientSharedBase):
 
     :param session: Requests or aiohttp-like HTTP client session.
     :param endpoint: Domain name and port for the endpoint.
-    :param loop: Event loop.
+    :param cache: (Optional) Cache for immutable responses.
+    :param coalescer: (Optional) Coalescer for identical in-flight requests.
+    :param timeout: (Optional) Default timeout for requests (in seconds).
+    :param release: (Optional) Callback to release a session the client does not own.
+    :param codec: (Optional) JSON codec for request bodies and responses.
+    :param limiter: (Optional) Adaptive concurrency limiter for requests.
+    :param retry: (Optional) Retry and hedging policy for idempotent requests.
+    :param metrics: (Optional) Metrics recorder for requests.
     """
 
-    def __init__(self, session, endpoint) -> None:
-        super().__init__(session, endpoint)
+    _coalescer: typing.Optional[RequestCoalescer]
+    _limiter: typing.Optional[AdaptiveLimiter]
+    _released: bool = False
+
+    def __init__(
+        self,
+        session,
+        endpoint,
+        cache=None,
+        coalescer=None,
+        timeout=None,
+        release=None,
+        codec=None,
+        limiter=None,
+        retry=None,
+        metrics=None,
+    ) -> None:
+        super().__init__(session, endpoint, cache, timeout, release, codec, retry, metrics)
+        self._coalescer = coalescer
+        self._limiter = limiter
+
+    @property
+    def coalescer(self) -> typing.Optional[RequestCoalescer]:
+        """Get coalescer for identical in-flight requests."""
+        return self._coalescer
+
+    @property
+    def limiter(self) -> typing.Optional[AdaptiveLimiter]:
+        """Get adaptive concurrency limiter for requests."""
+        return self._limiter
 
     def __enter__(self) -> AsyncClient:
         raise TypeError("Only use async with.")
@@ -215,11 +350,15 @@ class AsyncClient(ClientSharedBase):
         await self.close()
 
     async def close(self) -> None:
-        await self._session.close()
+        if self._release is None:
+            await self._session.close()
+        elif not self._released:
+            self._released = True
+            self._release()
 
     @property
     def closed(self) -> bool:
-        return typing.cast(bool, self._session.closed)
+        return self._released or typing.cast(bool, self._session.closed)
 
 
 # WEBSOCKETS
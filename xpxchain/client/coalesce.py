@@ -0,0 +1,106 @@
+"""
+    coalesce
+    ========
+
+    Single-flight coalescing of identical in-flight asynchronous requests.
+
+    When many tasks concurrently issue the same read-only request to the
+    same endpoint, only the first one reaches the node. The others await
+    the same in-flight future and receive the same response (or
+    exception). Requests are only shared while in flight, nothing is
+    cached once the response has been delivered.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import typing
+
+from .. import util
+
+__all__ = ['RequestCoalescer']
+
+
+class RequestCoalescer(util.Object):
+    """
+    Share a single in-flight request between identical concurrent calls.
+
+    Only read-only requests are coalesced. Callers sharing a request
+    receive the same decoded response, which must not be mutated.
+    A coalescer may be shared by clients to different endpoints.
+    """
+
+    __slots__ = (
+        '_pending',
+        'requests',
+        'deduplicated',
+    )
+
+    _pending: typing.Dict[str, asyncio.Future]
+    requests: int
+    deduplicated: int
+
+    def __init__(self) -> None:
+        self._pending = {}
+        self.requests = 0
+        self.deduplicated = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def key(self, endpoint: str, name: str, network_type, args: tuple, kwds: dict) -> typing.Optional[str]:
+        """
+        Get the coalescing key for a request, or `None` if it must not be shared.
+
+        :param endpoint: URL for the endpoint.
+        :param name: Name of the NIS callback.
+        :param network_type: Network type for the response.
+        :param args: Positional arguments for the request.
+        :param kwds: Keyword arguments for the request.
+        """
+
+        if not name.startswith('get_'):
+            return None
+        return f'{endpoint}:{name}:{int(network_type)}:{args!r}:{sorted(kwds.items())!r}'
+
+    async def run(self, key: str, fetch: typing.Callable[[], typing.Awaitable]):
+        """
+        Await the in-flight request for a key, or start it.
+
+        :param key: Coalescing key for the request.
+        :param fetch: Callback starting the request.
+        """
+
+        self.requests += 1
+        future = self._pending.get(key)
+        if future is None or future.get_loop() is not asyncio.get_event_loop():
+            future = asyncio.ensure_future(fetch())
+            self._pending[key] = future
+            future.add_done_callback(lambda x: self._remove(key, x))
+        else:
+            self.deduplicated += 1
+        # Cancelling one caller must not cancel the request shared by others.
+        return await asyncio.shield(future)
+
+    def _remove(self, key: str, future: asyncio.Future) -> None:
+        if self._pending.get(key) is future:
+            del self._pending[key]
+        if not future.cancelled():
+            # Avoid "exception was never retrieved" warnings without waiters.
+            future.exception()
@@ -0,0 +1,95 @@
+"""
+    codec
+    =====
+
+    Pluggable JSON codecs for REST and websockets traffic.
+
+    Clients encode request bodies and decode responses and websockets
+    messages through a codec, an object with `loads` and `dumps`
+    methods. The default codec uses orjson when it is installed, and
+    otherwise falls back to the standard library.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import json
+import typing
+
+from .. import util
+
+try:
+    import orjson
+except ImportError:
+    # orjson is not installed.
+    orjson = None
+
+__all__ = [
+    'JSONCodec',
+    'OrjsonCodec',
+    'DEFAULT_CODEC',
+]
+
+
+class JSONCodec(util.Object):
+    """JSON codec using the standard library."""
+
+    __slots__ = ()
+
+    name: typing.ClassVar[str] = 'json'
+
+    def loads(self, data: typing.Union[bytes, str]) -> typing.Any:
+        """
+        Decode JSON data.
+
+        :param data: Serialized JSON document.
+        :return: Decoded JSON object.
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: typing.Any) -> str:
+        """
+        Encode JSON data.
+
+        :param obj: JSON object to serialize.
+        :return: Serialized JSON document.
+        """
+        return json.dumps(obj)
+
+
+@util.inherit_doc
+class OrjsonCodec(JSONCodec):
+    """JSON codec using orjson."""
+
+    __slots__ = ()
+
+    name: typing.ClassVar[str] = 'orjson'
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed.")
+
+    def loads(self, data: typing.Union[bytes, str]) -> typing.Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: typing.Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+
+
+# Codec used by clients by default.
+DEFAULT_CODEC: JSONCodec = JSONCodec() if orjson is None else OrjsonCodec()
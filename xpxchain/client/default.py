@@ -27,13 +27,27 @@
 
 from __future__ import annotations
 import aiohttp
+import asyncio
+import contextlib
+import functools
 import requests
 import websockets
 import typing
 
 from . import abc
 from . import client
+from .announce import AnnouncePipeline
+from .cache import ResponseCache
+from .codec import JSONCodec, OrjsonCodec, DEFAULT_CODEC
+from .coalesce import RequestCoalescer
+from .hub import ListenerHub, Subscription
+from .limiter import AdaptiveLimiter, EndpointLimit
+from .registry import NetworkRegistry, NETWORK_REGISTRY
+from .metrics import RequestMetrics, RequestStats
+from .retry import RetryPolicy
+from .session import SessionPool
 from .. import util
+from ..models.blockchain.block_info import BlockInfo
 from ..models.blockchain.network_type import NetworkType
 
 __all__ = [
@@ -65,6 +79,31 @@ __all__ = [
 
     # Websockets
     'Listener',
+    'ReconnectingListener',
+    'ListenerHub',
+    'Subscription',
+    'AnnouncePipeline',
+
+    # Caching
+    'ResponseCache',
+    'RequestCoalescer',
+    'NetworkRegistry',
+    'NETWORK_REGISTRY',
+
+    # Connections
+    'SessionPool',
+    'AdaptiveLimiter',
+    'EndpointLimit',
+    'RetryPolicy',
+
+    # Instrumentation
+    'RequestMetrics',
+    'RequestStats',
+
+    # Serialization
+    'JSONCodec',
+    'OrjsonCodec',
+    'DEFAULT_CODEC',
 
     # Exceptions
     'HTTPError',
@@ -76,20 +115,77 @@ __all__ = [
 HTTPError = requests.HTTPError
 AsyncHTTPError = aiohttp.ClientResponseError
 
+# Default number of attempts to reopen a dropped websockets connection.
+RECONNECT_ATTEMPTS = 10
+# Default maximum delay between reconnect attempts (in seconds).
+RECONNECT_MAX_BACKOFF = 30.0
+
+ListenerMessageType = typing.Union[abc.ListenerMessage, abc.LazyListenerMessage]
+
 # SYNCHRONOUS
 
 
 @util.inherit_doc
 class HTTPBase(abc.HTTPBase):
-    """Abstract base class for synchronous HTTP clients."""
+    """
+    Abstract base class for synchronous HTTP clients.
+
+    :param endpoint: Domain name and port for the endpoint.
+    :param network_type: (Optional) Network type for the endpoint.
+    :param cache: (Optional) Cache for immutable responses.
+    :param session: (Optional) Session owned by the caller, which is not closed with the client.
+    :param pool: (Optional) Pool of sessions shared between clients to the same endpoint.
+    :param timeout: (Optional) Default timeout for requests (in seconds).
+    :param codec: (Optional) JSON codec for request bodies and responses.
+    :param retry: (Optional) Retry policy for idempotent requests.
+    :param metrics: (Optional) Metrics recorder for requests.
+    """
 
-    def __init__(self, endpoint: str, network_type: typing.Optional[NetworkType] = None) -> None:
+    def __init__(
+        self,
+        endpoint: str,
+        network_type: typing.Optional[NetworkType] = None,
+        cache: typing.Optional[ResponseCache] = None,
+        session: typing.Optional[requests.Session] = None,
+        pool: typing.Optional[SessionPool] = None,
+        timeout: typing.Optional[float] = None,
+        codec: typing.Optional[JSONCodec] = None,
+        retry: typing.Optional[RetryPolicy] = None,
+        metrics: typing.Optional[RequestMetrics] = None,
+    ) -> None:
+        if session is not None and pool is not None:
+            raise ValueError("Cannot use both a session and a session pool.")
         self._endpoint = endpoint
         self._index = 0
         self._network_type = network_type
+        self._cache = cache
+        self._session = session
+        self._pool = pool
+        self._timeout = timeout
+        self._codec = codec
+        self._retry = retry
+        self._metrics = metrics
 
     def __enter__(self) -> HTTPBase:
-        self._client = client.Client(requests.Session(), self._endpoint)
+        session = self._session
+        release = None
+        if session is not None:
+            release = lambda: None
+        elif self._pool is not None:
+            session = self._pool.acquire(self._endpoint)
+            release = functools.partial(self._pool.release, self._endpoint)
+        else:
+            session = requests.Session()
+        self._client = client.Client(
+            session,
+            self._endpoint,
+            self._cache,
+            self._timeout,
+            release,
+            self._codec,
+            self._retry,
+            self._metrics,
+        )
         return self
 
     def __exit__(self, exc_type, exc, tb) -> None:
@@ -97,7 +193,7 @@ class HTTPBase(abc.HTTPBase):
 
     @property
     def root(self) -> HTTP:
-        return HTTP.create_from_http(self)
+        return self._child(HTTP)
 
 
 @util.inherit_doc
@@ -106,43 +202,43 @@ class HTTP(HTTPBase, abc.HTTP):
 
     @property
     def account(self) -> AccountHTTP:
-        return AccountHTTP.create_from_http(self)
+        return self._child(AccountHTTP)
 
     @property
     def blockchain(self) -> BlockchainHTTP:
-        return BlockchainHTTP.create_from_http(self)
+        return self._child(BlockchainHTTP)
 
     @property
     def contract(self) -> ContractHTTP:
-        return ContractHTTP.create_from_http(self)
+        return self._child(ContractHTTP)
 
     @property
     def metadata(self) -> MetadataHTTP:
-        return MetadataHTTP.create_from_http(self)
+        return self._child(MetadataHTTP)
 
     @property
     def config(self) -> ConfigHTTP:
-        return ConfigHTTP.create_from_http(self)
+        return self._child(ConfigHTTP)
 
     @property
     def node(self) -> NodeHTTP:
-        return NodeHTTP.create_from_http(self)
+        return self._child(NodeHTTP)
 
     @property
     def mosaic(self) -> MosaicHTTP:
-        return MosaicHTTP.create_from_http(self)
+        return self._child(MosaicHTTP)
 
     @property
     def namespace(self) -> NamespaceHTTP:
-        return NamespaceHTTP.create_from_http(self)
+        return self._child(NamespaceHTTP)
 
     @property
     def network(self) -> NetworkHTTP:
-        return NetworkHTTP.create_from_http(self)
+        return self._child(NetworkHTTP)
 
     @property
     def transaction(self) -> TransactionHTTP:
-        return TransactionHTTP.create_from_http(self)
+        return self._child(TransactionHTTP)
 
 
 @util.inherit_doc
@@ -200,22 +296,75 @@ class TransactionHTTP(HTTPBase, abc.TransactionHTTP):
 
 @util.inherit_doc
 class AsyncHTTPBase(abc.AsyncHTTPBase):
-    """Abstract base class for synchronous HTTP clients."""
+    """
+    Abstract base class for asynchronous HTTP clients.
+
+    :param endpoint: Domain name and port for the endpoint.
+    :param loop: (Optional) Event loop for the client.
+    :param network_type: (Optional) Network type for the endpoint.
+    :param cache: (Optional) Cache for immutable responses.
+    :param coalescer: (Optional) Coalescer for identical in-flight requests.
+    :param session: (Optional) Session owned by the caller, which is not closed with the client.
+    :param connector: (Optional) Connector owned by the caller, shared by the client session.
+    :param timeout: (Optional) Default timeout for requests (in seconds).
+    :param codec: (Optional) JSON codec for request bodies and responses.
+    :param limiter: (Optional) Adaptive concurrency limiter for requests.
+    :param retry: (Optional) Retry and hedging policy for idempotent requests.
+    :param metrics: (Optional) Metrics recorder for requests.
+    """
 
     def __init__(
         self,
         endpoint: str,
         loop: util.OptionalLoopType = None,
         network_type: typing.Optional[NetworkType] = None,
+        cache: typing.Optional[ResponseCache] = None,
+        coalescer: typing.Optional[RequestCoalescer] = None,
+        session: typing.Optional[aiohttp.ClientSession] = None,
+        connector: typing.Optional[aiohttp.BaseConnector] = None,
+        timeout: typing.Optional[float] = None,
+        codec: typing.Optional[JSONCodec] = None,
+        limiter: typing.Optional[AdaptiveLimiter] = None,
+        retry: typing.Optional[RetryPolicy] = None,
+        metrics: typing.Optional[RequestMetrics] = None,
     ) -> None:
+        if session is not None and connector is not None:
+            raise ValueError("Cannot use both a session and a connector.")
         self._endpoint = endpoint
         self._index = 1
         self._loop = loop
-        self._session = aiohttp.ClientSession(loop=loop)
+        self._release = None
+        if session is None:
+            session = aiohttp.ClientSession(
+                loop=loop,
+                connector=connector,
+                connector_owner=connector is None,
+            )
+        else:
+            self._release = lambda: None
+        self._session = session
         self._network_type = network_type
+        self._cache = cache
+        self._coalescer = coalescer
+        self._timeout = timeout
+        self._codec = codec
+        self._limiter = limiter
+        self._retry = retry
+        self._metrics = metrics
 
     async def __aenter__(self) -> AsyncHTTPBase:
-        self._client = client.AsyncClient(self._session, self._endpoint)
+        self._client = client.AsyncClient(
+            self._session,
+            self._endpoint,
+            self._cache,
+            self._coalescer,
+            self._timeout,
+            self._release,
+            self._codec,
+            self._limiter,
+            self._retry,
+            self._metrics,
+        )
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
@@ -223,7 +372,7 @@ class AsyncHTTPBase(abc.AsyncHTTPBase):
 
     @property
     def root(self) -> AsyncHTTP:
-        return AsyncHTTP.create_from_http(self)
+        return self._child(AsyncHTTP)
 
 
 @util.inherit_doc
@@ -232,43 +381,43 @@ class AsyncHTTP(AsyncHTTPBase, abc.HTTP):
 
     @property
     def account(self) -> AsyncAccountHTTP:
-        return AsyncAccountHTTP.create_from_http(self)
+        return self._child(AsyncAccountHTTP)
 
     @property
     def blockchain(self) -> AsyncBlockchainHTTP:
-        return AsyncBlockchainHTTP.create_from_http(self)
+        return self._child(AsyncBlockchainHTTP)
 
     @property
     def contract(self) -> AsyncContractHTTP:
-        return AsyncContractHTTP.create_from_http(self)
+        return self._child(AsyncContractHTTP)
 
     @property
     def metadata(self) -> AsyncMetadataHTTP:
-        return AsyncMetadataHTTP.create_from_http(self)
+        return self._child(AsyncMetadataHTTP)
 
     @property
     def config(self) -> AsyncConfigHTTP:
-        return AsyncConfigHTTP.create_from_http(self)
+        return self._child(AsyncConfigHTTP)
 
     @property
     def node(self) -> AsyncNodeHTTP:
-        return AsyncNodeHTTP.create_from_http(self)
+        return self._child(AsyncNodeHTTP)
 
     @property
     def mosaic(self) -> AsyncMosaicHTTP:
-        return AsyncMosaicHTTP.create_from_http(self)
+        return self._child(AsyncMosaicHTTP)
 
     @property
     def namespace(self) -> AsyncNamespaceHTTP:
-        return AsyncNamespaceHTTP.create_from_http(self)
+        return self._child(AsyncNamespaceHTTP)
 
     @property
     def network(self) -> AsyncNetworkHTTP:
-        return AsyncNetworkHTTP.create_from_http(self)
+        return self._child(AsyncNetworkHTTP)
 
     @property
     def transaction(self) -> AsyncTransactionHTTP:
-        return AsyncTransactionHTTP.create_from_http(self)
+        return self._child(AsyncTransactionHTTP)
 
 
 @util.inherit_doc
@@ -326,18 +475,32 @@ class AsyncTransactionHTTP(AsyncHTTPBase, abc.TransactionHTTP):
 
 @util.inherit_doc
 class Listener(abc.Listener):
-    """Asynchronous websockets-based listener."""
+    """
+    Asynchronous websockets-based listener.
+
+    :param endpoint: Domain name and port for the endpoint.
+    :param loop: (Optional) Event loop for the client.
+    :param network_type: (Optional) Network type for the endpoint.
+    :param codec: (Optional) JSON codec for messages.
+    :param lazy: (Optional) Yield `LazyListenerMessage`, decoding models on demand.
+    """
 
     def __init__(
         self,
         endpoint: str,
         loop: util.OptionalLoopType = None,
         network_type: typing.Optional[NetworkType] = None,
+        codec: typing.Optional[JSONCodec] = None,
+        lazy: bool = False,
     ) -> None:
         url = client.parse_ws_url(endpoint)
+        self._endpoint = url.url
         self._loop = loop
         self._conn = websockets.connect(url.url, loop=loop)
         self._network_type = network_type
+        self._codec = codec or DEFAULT_CODEC
+        self._lazy = lazy
+        self._channels = {}
 
     async def __aenter__(self) -> Listener:
         self._session = await self._conn.__aenter__()
@@ -347,3 +510,158 @@ class Listener(abc.Listener):
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
         await self._conn.__aexit__(None, None, None)
+
+    @property
+    async def network_type(self) -> NetworkType:
+        if self._network_type is None:
+            self._network_type = await self._resolve('network_type')
+        return self._network_type
+
+    @property
+    async def generation_hash(self) -> str:
+        return await self._resolve('generation_hash')
+
+    async def _resolve(self, name: str):
+        value = NETWORK_REGISTRY.get(self._endpoint, name)
+        if value is None:
+            # Resolve through the REST API of the same node.
+            async with AsyncHTTP(self._http_endpoint, self._loop) as http:
+                value = await getattr(http, name)
+        return value
+
+    @property
+    def _http_endpoint(self) -> str:
+        """Get the REST API endpoint of the same node."""
+        url = client.parse_ws_url(self._endpoint)
+        scheme = 'https' if url.scheme == 'wss' else 'http'
+        return url._replace(scheme=scheme, path=None).url
+
+
+@util.inherit_doc
+class ReconnectingListener(Listener):
+    """
+    Websockets-based listener that reconnects when the connection drops.
+
+    Subscribed channels are remembered and subscribed again on each new
+    connection. When subscribed to new blocks, blocks added while the
+    listener was disconnected are requested from the REST API and
+    delivered, in order and as they are downloaded, before live
+    messages resume.
+
+    :param endpoint: Domain name and port for the endpoint.
+    :param loop: (Optional) Event loop for the client.
+    :param network_type: (Optional) Network type for the endpoint.
+    :param codec: (Optional) JSON codec for messages.
+    :param retry: (Optional) Policy for the number of and delay between reconnect attempts.
+    :param http: (Optional) Blockchain client to backfill missed blocks, defaults to the same node.
+    :param lazy: (Optional) Yield `LazyListenerMessage`, decoding models on demand.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        loop: util.OptionalLoopType = None,
+        network_type: typing.Optional[NetworkType] = None,
+        codec: typing.Optional[JSONCodec] = None,
+        retry: typing.Optional[RetryPolicy] = None,
+        http: typing.Optional[AsyncBlockchainHTTP] = None,
+        lazy: bool = False,
+    ) -> None:
+        super().__init__(endpoint, loop, network_type, codec, lazy)
+        self._retry = retry or RetryPolicy(attempts=RECONNECT_ATTEMPTS, max_backoff=RECONNECT_MAX_BACKOFF)
+        self._http = http
+        self._backfilling: typing.Optional[typing.AsyncIterator[ListenerMessageType]] = None
+        self._height: typing.Optional[int] = None
+        self._closing = False
+        self.reconnects = 0
+
+    async def __aenter__(self) -> ReconnectingListener:
+        self._closing = False
+        await super().__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._closing = True
+        if self._backfilling is not None:
+            await self._backfilling.aclose()
+            self._backfilling = None
+        await super().__aexit__(exc_type, exc, tb)
+
+    async def __anext__(self) -> typing.Optional[ListenerMessageType]:
+        while True:
+            if self._backfilling is not None:
+                message = await self._next_backfilled()
+                if message is None:
+                    continue
+            else:
+                try:
+                    message = await super().__anext__()
+                except (StopAsyncIteration, websockets.ConnectionClosed, OSError):
+                    if self._closing:
+                        raise StopAsyncIteration
+                    await self._reconnect()
+                    continue
+
+            if message is not None and message.channel_name == 'block':
+                if isinstance(message, abc.LazyListenerMessage):
+                    height = message.height
+                else:
+                    height = message.message.height
+                if self._height is not None and height <= self._height:
+                    # Already delivered by the backfill.
+                    continue
+                self._height = height
+            return message
+
+    async def _reconnect(self) -> None:
+        """Open a new connection, then restore subscriptions and missed blocks."""
+
+        with contextlib.suppress(Exception):
+            await self._conn.__aexit__(None, None, None)
+        for attempt in range(1, self._retry.attempts + 1):
+            try:
+                self._conn = websockets.connect(self._endpoint, loop=self._loop)
+                await self.__aenter__()
+                self._uid = None
+                await self._send_many([('subscribe', i) for i in self._channels])
+                break
+            except Exception:
+                if attempt == self._retry.attempts:
+                    raise
+            await asyncio.sleep(self._retry.delay(attempt))
+
+        self.reconnects += 1
+        if 'block' in self._channels and self._height is not None:
+            self._backfilling = self._backfill(self._height + 1)
+
+    async def _next_backfilled(self) -> typing.Optional[ListenerMessageType]:
+        """Get the next backfilled block, or None once the backfill is done."""
+
+        try:
+            return await typing.cast(typing.AsyncIterator, self._backfilling).__anext__()
+        except StopAsyncIteration:
+            self._backfilling = None
+            return None
+        except Exception:
+            self._backfilling = None
+            raise
+
+    async def _backfill(self, start: int) -> typing.AsyncIterator[ListenerMessageType]:
+        """Iterate over the blocks added after the last delivered block, as they are downloaded."""
+
+        network_type = await self.network_type
+        if self._http is not None:
+            async for block in self._http.iter_blocks(start):
+                yield self._backfilled(block, network_type)
+        else:
+            async with AsyncBlockchainHTTP(self._http_endpoint, self._loop, network_type) as http:
+                async for block in http.iter_blocks(start):
+                    yield self._backfilled(block, network_type)
+
+    def _backfilled(self, block: BlockInfo, network_type: NetworkType) -> ListenerMessageType:
+        """Wrap a backfilled block like the live blocks."""
+
+        message = abc.ListenerMessage('block', block, 'block')
+        if self._lazy:
+            return abc.LazyListenerMessage.create_from_message(message, self._codec, network_type)
+        return message
@@ -0,0 +1,367 @@
+"""
+    hub
+    ===
+
+    Fan out listener messages to many independent subscribers.
+
+    The hub owns a few websockets connections, spreads the subscribed
+    channels over them, and routes each message to the bounded queues of
+    the subscriptions to its channel. A slow subscriber only holds up the
+    connection its channel is on (with the `block` overflow policy), or
+    loses messages (with the `drop` policies), instead of stalling every
+    other subscriber.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import collections
+import typing
+
+from . import abc
+from .. import util
+
+__all__ = [
+    'ListenerHub',
+    'Subscription',
+]
+
+# Overflow policies for full subscription queues.
+OVERFLOW_POLICIES = ('block', 'drop', 'drop_oldest')
+# Default number of messages buffered per subscription.
+QUEUE_SIZE = 1000
+
+
+def normalize_channel(channel: str) -> str:
+    """Normalize the address in a channel name."""
+
+    name, sep, address = channel.partition('/')
+    return f'{name}/{address.strip().upper().replace("-", "")}' if sep else name
+
+
+class Subscription(util.Object):
+    """
+    Bounded queue of messages for a single channel.
+
+    :param channel: Subscribed channel.
+    :param maxsize: Maximum number of buffered messages.
+    :param overflow: Policy when the queue is full: wait for space (block),
+        discard the new message (drop) or discard the oldest message (drop_oldest).
+    """
+
+    __slots__ = (
+        '_channel',
+        '_queue',
+        '_overflow',
+        '_closed',
+        '_error',
+        'dropped',
+    )
+
+    _channel: str
+    _queue: asyncio.Queue
+    _overflow: str
+    _closed: bool
+    _error: typing.Optional[BaseException]
+    dropped: int
+
+    def __init__(self, channel: str, maxsize: int = QUEUE_SIZE, overflow: str = 'block') -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy {overflow!r}.")
+        self._channel = channel
+        self._queue = asyncio.Queue(maxsize)
+        self._overflow = overflow
+        self._closed = False
+        self._error = None
+        self.dropped = 0
+
+    @property
+    def channel(self) -> str:
+        """Get the subscribed channel."""
+        return self._channel
+
+    @property
+    def overflow(self) -> str:
+        """Get the overflow policy."""
+        return self._overflow
+
+    @property
+    def depth(self) -> int:
+        """Get the number of buffered messages."""
+        return self._queue.qsize()
+
+    @property
+    def closed(self) -> bool:
+        """Get if the subscription is closed."""
+        return self._closed
+
+    def __aiter__(self) -> Subscription:
+        return self
+
+    async def __anext__(self) -> abc.ListenerMessage:
+        """Get the next message, once all buffered messages are consumed after closing."""
+
+        if self._closed and self._queue.empty():
+            raise self._error or StopAsyncIteration
+        message = await self._queue.get()
+        if message is None:
+            raise self._error or StopAsyncIteration
+        return message
+
+    async def get(self) -> abc.ListenerMessage:
+        """Get the next message."""
+        try:
+            return await self.__anext__()
+        except StopAsyncIteration:
+            raise RuntimeError("Subscription is closed.")
+
+    async def put(self, message: abc.ListenerMessage) -> None:
+        """
+        Queue a message, applying the overflow policy if the queue is full.
+
+        :param message: Message from a listener.
+        """
+
+        if self._closed:
+            return
+        elif self._overflow == 'block':
+            await self._queue.put(message)
+        elif self._queue.full():
+            self.dropped += 1
+            if self._overflow == 'drop_oldest':
+                self._queue.get_nowait()
+                self._queue.put_nowait(message)
+        else:
+            self._queue.put_nowait(message)
+
+    def close(self, error: typing.Optional[BaseException] = None) -> None:
+        """
+        Close the subscription, after the buffered messages.
+
+        :param error: (Optional) Error raised to the subscriber after the buffered messages.
+        """
+
+        if self._closed:
+            return
+        self._closed = True
+        self._error = error
+        if self._queue.empty():
+            # Wake up a waiting subscriber.
+            self._queue.put_nowait(None)
+
+
+class ListenerHub(util.Object):
+    """
+    Route messages from a few listeners to many bounded subscriptions.
+
+    Each channel is subscribed on the live listener with the fewest
+    channels, and only once, however many subscriptions it has. The hub
+    enters and exits the listeners. When a listener fails or its
+    connection closes, the subscriptions to its channels are closed with
+    the error, and it is no longer used for new channels.
+
+    With the default `block` overflow policy, a full subscription pauses
+    the reader of its listener, so one slow subscriber stalls every
+    channel on the same listener. Use `drop` or `drop_oldest` for
+    subscribers that may fall behind.
+
+    :param listeners: Unopened listeners owned by the hub.
+    :param maxsize: (Optional) Default maximum number of buffered messages per subscription.
+    :param overflow: (Optional) Default overflow policy for subscriptions.
+    """
+
+    __slots__ = (
+        '_listeners',
+        '_maxsize',
+        '_overflow',
+        '_channels',
+        '_assigned',
+        '_dead',
+        '_tasks',
+    )
+
+    _listeners: typing.Sequence[abc.Listener]
+    _maxsize: int
+    _overflow: str
+    _channels: typing.Dict[str, typing.List[Subscription]]
+    _assigned: typing.Dict[str, int]
+    _dead: typing.Set[int]
+    _tasks: typing.List[asyncio.Future]
+
+    def __init__(
+        self,
+        listeners: typing.Sequence[abc.Listener],
+        maxsize: int = QUEUE_SIZE,
+        overflow: str = 'block',
+    ) -> None:
+        if not listeners:
+            raise ValueError("Must provide at least one listener.")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy {overflow!r}.")
+        self._listeners = list(listeners)
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._channels = {}
+        self._assigned = {}
+        self._dead = set()
+        self._tasks = []
+
+    async def __aenter__(self) -> ListenerHub:
+        self._dead = set()
+        for listener in self._listeners:
+            await listener.__aenter__()
+            # Read the uid before the reader starts consuming messages.
+            await listener.uid
+        self._tasks = [asyncio.ensure_future(self._read(i)) for i in range(len(self._listeners))]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @property
+    def listeners(self) -> typing.Sequence[abc.Listener]:
+        """Get the listeners owned by the hub."""
+        return tuple(self._listeners)
+
+    @property
+    def channels(self) -> typing.Sequence[str]:
+        """Get the subscribed channels."""
+        return tuple(self._channels)
+
+    @property
+    def dropped(self) -> int:
+        """Get the number of messages dropped by all open subscriptions."""
+        return sum(i.dropped for subscriptions in self._channels.values() for i in subscriptions)
+
+    def depths(self) -> typing.Dict[str, int]:
+        """Get the depth of the fullest subscription queue for each channel."""
+        return {k: max(i.depth for i in v) for k, v in self._channels.items()}
+
+    async def subscribe(
+        self,
+        channel: str,
+        maxsize: typing.Optional[int] = None,
+        overflow: typing.Optional[str] = None,
+    ) -> Subscription:
+        """
+        Subscribe to a websockets channel.
+
+        :param channel: Channel name, with the address for address channels (`confirmedAdded/SD5D...`).
+        :param maxsize: (Optional) Maximum number of buffered messages, defaults to the hub's.
+        :param overflow: (Optional) Overflow policy, defaults to the hub's.
+        :return: New subscription to the channel.
+        """
+
+        if not self._tasks:
+            raise RuntimeError('Must be used inside `async with` block.')
+        channel = normalize_channel(channel)
+        subscription = Subscription(
+            channel,
+            self._maxsize if maxsize is None else maxsize,
+            overflow or self._overflow,
+        )
+        subscriptions = self._channels.get(channel)
+        if subscriptions is None:
+            live = [i for i in range(len(self._listeners)) if i not in self._dead]
+            if not live:
+                raise ConnectionError('All listener connections are closed.')
+            counts = collections.Counter(self._assigned.values())
+            index = min(live, key=lambda x: counts[x])
+            self._channels[channel] = subscriptions = []
+            self._assigned[channel] = index
+            try:
+                await self._listeners[index].subscribe(channel)
+            except Exception:
+                del self._channels[channel]
+                del self._assigned[channel]
+                raise
+        subscriptions.append(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Close a subscription, unsubscribing from its channel once it has no subscriptions left.
+
+        :param subscription: Subscription from the hub.
+        """
+
+        subscription.close()
+        subscriptions = self._channels.get(subscription.channel, [])
+        if subscription not in subscriptions:
+            return
+        subscriptions.remove(subscription)
+        if not subscriptions:
+            del self._channels[subscription.channel]
+            index = self._assigned.pop(subscription.channel)
+            await self._listeners[index].unsubscribe(subscription.channel)
+
+    async def close(self) -> None:
+        """Close all subscriptions and listeners."""
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for subscriptions in self._channels.values():
+            for subscription in subscriptions:
+                subscription.close()
+        self._channels.clear()
+        self._assigned.clear()
+        for listener in self._listeners:
+            await listener.__aexit__(None, None, None)
+
+    # READERS
+
+    def _route(self, message: abc.ListenerMessage) -> typing.List[Subscription]:
+        """Get the subscriptions to a message's channel."""
+
+        channel = message.channel or message.channel_name
+        subscriptions = self._channels.get(channel)
+        if subscriptions is not None:
+            return list(subscriptions)
+        # The node did not send the address, so any subscription to
+        # the channel may be the recipient.
+        prefix = f'{message.channel_name}/'
+        return [i for k, v in self._channels.items() if k.startswith(prefix) for i in v]
+
+    async def _read(self, index: int) -> None:
+        listener = self._listeners[index]
+        try:
+            async for message in listener:
+                if message is None:
+                    continue
+                for subscription in self._route(message):
+                    await subscription.put(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._close_listener(index, exc)
+        else:
+            # The connection was closed cleanly, so no more messages arrive.
+            self._close_listener(index, ConnectionError('Listener connection closed.'))
+
+    def _close_listener(self, index: int, error: BaseException) -> None:
+        """Report the error to the subscriptions on a lost listener, and stop using it."""
+
+        self._dead.add(index)
+        channels = [k for k, v in self._assigned.items() if v == index]
+        for channel in channels:
+            del self._assigned[channel]
+            for subscription in self._channels.pop(channel, []):
+                subscription.close(error)
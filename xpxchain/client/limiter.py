@@ -0,0 +1,264 @@
+"""
+    limiter
+    =======
+
+    Adaptive concurrency limits for asynchronous clients.
+
+    Each endpoint gets an additive-increase, multiplicative-decrease
+    (AIMD) limit on the number of requests in flight. The limit grows
+    by about one request per round of saturated, fast responses, and
+    is cut back on overload errors (429, 5xx, timeouts, dropped
+    connections) or when latency rises well above its baseline.
+    Requests over the limit wait in a FIFO queue.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import aiohttp
+import asyncio
+import collections
+import typing
+
+from .. import util
+
+__all__ = [
+    'AdaptiveLimiter',
+    'EndpointLimit',
+]
+
+# Weight of a new sample in the moving average latency.
+SMOOTHING = 0.1
+# Weight of a slower sample in the baseline latency, so it tracks drift.
+DRIFT = 0.01
+# Latency (in seconds) below which a response never counts as a spike.
+LATENCY_FLOOR = 0.01
+
+
+def is_overload(exc: BaseException) -> bool:
+    """Get if a request error means the endpoint is overloaded."""
+
+    status = getattr(exc, 'status', None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(exc, (asyncio.TimeoutError, OSError, aiohttp.ClientConnectionError))
+
+
+class EndpointLimit(util.Object):
+    """
+    Concurrency limit and queueing metrics for a single endpoint.
+
+    :param limit: Initial concurrency limit.
+    """
+
+    __slots__ = (
+        'limit',
+        'in_flight',
+        'requests',
+        'errors',
+        'decreases',
+        'max_queued',
+        'wait_time',
+        'latency',
+        'baseline',
+        '_waiters',
+        '_generation',
+    )
+
+    limit: float
+    in_flight: int
+    requests: int
+    errors: int
+    decreases: int
+    max_queued: int
+    wait_time: float
+    latency: typing.Optional[float]
+    baseline: typing.Optional[float]
+    _waiters: typing.Deque[asyncio.Future]
+    _generation: int
+
+    def __init__(self, limit: float) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.decreases = 0
+        self.max_queued = 0
+        self.wait_time = 0.0
+        self.latency = None
+        self.baseline = None
+        self._waiters = collections.deque()
+        self._generation = 0
+
+    @property
+    def queued(self) -> int:
+        """Get the number of requests waiting for the limit."""
+        return len(self._waiters)
+
+    @property
+    def available(self) -> bool:
+        """Get if a new request may start without waiting."""
+        return self.in_flight < int(self.limit)
+
+
+class AdaptiveLimiter(util.Object):
+    """
+    AIMD concurrency limiter for requests to one or more endpoints.
+
+    :param initial: (Optional) Initial concurrency limit per endpoint.
+    :param minimum: (Optional) Lowest concurrency limit per endpoint.
+    :param maximum: (Optional) Hard cap on the concurrency limit per endpoint.
+    :param backoff: (Optional) Factor applied to the limit on overload.
+    :param tolerance: (Optional) Ratio of latency to baseline latency counted as a spike.
+    """
+
+    __slots__ = (
+        '_limits',
+        'initial',
+        'minimum',
+        'maximum',
+        'backoff',
+        'tolerance',
+    )
+
+    _limits: typing.Dict[str, EndpointLimit]
+    initial: int
+    minimum: int
+    maximum: int
+    backoff: float
+    tolerance: float
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 64,
+        backoff: float = 0.5,
+        tolerance: float = 2.0,
+    ) -> None:
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("Limits must satisfy 1 <= minimum <= initial <= maximum.")
+        if not 0 < backoff < 1:
+            raise ValueError("Backoff must be between 0 and 1.")
+        self._limits = {}
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.tolerance = tolerance
+
+    def __getitem__(self, endpoint: str) -> EndpointLimit:
+        """Get the limit for an endpoint."""
+
+        try:
+            return self._limits[endpoint]
+        except KeyError:
+            state = self._limits[endpoint] = EndpointLimit(self.initial)
+            return state
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._limits)
+
+    def __len__(self) -> int:
+        return len(self._limits)
+
+    async def run(self, endpoint: str, fetch: typing.Callable[[], typing.Awaitable]):
+        """
+        Start a request once the endpoint is under its limit, and adjust the limit.
+
+        :param endpoint: URL for the endpoint.
+        :param fetch: Callback starting the request.
+        """
+
+        state = self[endpoint]
+        loop = asyncio.get_event_loop()
+        queued = loop.time()
+        if state.available and not state._waiters:
+            state.in_flight += 1
+        else:
+            await self._wait(state, loop)
+        started = loop.time()
+        state.wait_time += started - queued
+        generation = state._generation
+        saturated = state.in_flight >= int(state.limit)
+
+        try:
+            result = await fetch()
+        except Exception as exc:
+            state.errors += 1
+            if is_overload(exc):
+                self._decrease(state, generation)
+            raise
+        else:
+            self._observe(state, loop.time() - started, generation, saturated)
+            return result
+        finally:
+            state.in_flight -= 1
+            self._wake(state)
+
+    async def _wait(self, state: EndpointLimit, loop) -> None:
+        """Wait in the queue, until `_wake` hands over a slot."""
+
+        future = loop.create_future()
+        state._waiters.append(future)
+        state.max_queued = max(state.max_queued, len(state._waiters))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Cancelled after being handed a slot, pass it on.
+                state.in_flight -= 1
+                self._wake(state)
+            else:
+                state._waiters.remove(future)
+            raise
+
+    def _wake(self, state: EndpointLimit) -> None:
+        while state._waiters and state.available:
+            future = state._waiters.popleft()
+            if not future.done():
+                state.in_flight += 1
+                future.set_result(None)
+
+    def _observe(self, state: EndpointLimit, latency: float, generation: int, saturated: bool) -> None:
+        state.requests += 1
+        if state.latency is None:
+            state.latency = latency
+        else:
+            state.latency += (latency - state.latency) * SMOOTHING
+
+        baseline = state.baseline
+        if baseline is None or latency < baseline:
+            state.baseline = latency
+        else:
+            state.baseline = baseline + (latency - baseline) * DRIFT
+
+        if baseline is not None and latency > self.tolerance * max(baseline, LATENCY_FLOOR):
+            self._decrease(state, generation)
+        elif saturated:
+            state.limit = min(self.maximum, state.limit + 1 / state.limit)
+            self._wake(state)
+
+    def _decrease(self, state: EndpointLimit, generation: int) -> None:
+        # Requests started before the previous decrease reflect the old
+        # limit, so only the first of them may shrink the limit.
+        if generation != state._generation:
+            return
+        state._generation += 1
+        state.decreases += 1
+        state.limit = max(self.minimum, state.limit * self.backoff)
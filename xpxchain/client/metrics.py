@@ -0,0 +1,186 @@
+"""
+    metrics
+    =======
+
+    Per-endpoint instrumentation for REST requests.
+
+    Each request records the time spent waiting on the node (including
+    retries) separately from the time spent decoding the JSON and
+    building models, so slow calls can be attributed to the network or
+    to the client. Metrics are exposed as snapshots, or as Prometheus
+    text exposition format.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import bisect
+import threading
+import typing
+
+from .. import util
+
+__all__ = [
+    'RequestMetrics',
+    'RequestStats',
+]
+
+# Upper bounds (in seconds) of the latency histogram buckets.
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@util.dataclass(frozen=True)
+class RequestStats(util.Object):
+    """
+    Snapshot of the metrics for a single NIS endpoint.
+
+    Histograms hold the number of requests per bucket of `RequestMetrics.buckets`,
+    with a final bucket for slower requests.
+
+    :param requests: Number of request attempts, including failed and retried attempts.
+    :param errors: Number of failed attempts, including responses that failed to decode.
+    :param bytes: Number of response body bytes received.
+    :param network_time: Total time waiting for responses, excluding queueing and retry delays (in seconds).
+    :param decode_time: Total time decoding responses (in seconds).
+    :param network_histogram: Histogram of the time waiting for each response.
+    :param decode_histogram: Histogram of the time decoding each response.
+    """
+
+    requests: int
+    errors: int
+    bytes: int
+    network_time: float
+    decode_time: float
+    network_histogram: typing.Tuple[int, ...]
+    decode_histogram: typing.Tuple[int, ...]
+
+
+class RequestMetrics(util.Object):
+    """
+    Thread-safe request metrics, shared by any number of clients.
+
+    :param buckets: (Optional) Upper bounds of the latency histogram buckets (in seconds).
+    """
+
+    __slots__ = (
+        '_buckets',
+        '_lock',
+        '_stats',
+    )
+
+    _buckets: typing.Tuple[float, ...]
+    _lock: threading.Lock
+    _stats: typing.Dict[str, list]
+
+    def __init__(self, buckets: typing.Sequence[float] = BUCKETS) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    @property
+    def buckets(self) -> typing.Tuple[float, ...]:
+        """Get upper bounds of the latency histogram buckets."""
+        return self._buckets
+
+    def record(
+        self,
+        name: str,
+        network_time: float,
+        decode_time: float = 0.0,
+        size: int = 0,
+        error: bool = False,
+    ) -> None:
+        """
+        Record a single request.
+
+        :param name: Name of the NIS endpoint.
+        :param network_time: Time waiting for the response (in seconds).
+        :param decode_time: (Optional) Time decoding the response (in seconds).
+        :param size: (Optional) Size of the response body (in bytes).
+        :param error: (Optional) If the request failed.
+        """
+
+        network_bucket = bisect.bisect_left(self._buckets, network_time)
+        decode_bucket = bisect.bisect_left(self._buckets, decode_time)
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = self._empty()
+            stats[0] += 1
+            stats[1] += error
+            stats[2] += size
+            stats[3] += network_time
+            stats[5][network_bucket] += 1
+            if not error:
+                stats[4] += decode_time
+                stats[6][decode_bucket] += 1
+
+    def snapshot(self) -> typing.Dict[str, RequestStats]:
+        """Get a snapshot of the metrics for each endpoint name."""
+
+        with self._lock:
+            return {
+                name: RequestStats(*stats[:5], tuple(stats[5]), tuple(stats[6]))
+                for name, stats in sorted(self._stats.items())
+            }
+
+    def reset(self) -> None:
+        """Clear all metrics."""
+
+        with self._lock:
+            self._stats.clear()
+
+    def prometheus(self, prefix: str = 'xpxchain') -> str:
+        """
+        Export the metrics in the Prometheus text exposition format.
+
+        :param prefix: (Optional) Prefix for the metric names.
+        """
+
+        snapshot = self.snapshot()
+        lines: typing.List[str] = []
+
+        def counter(metric, doc, field):
+            lines.append(f'# HELP {prefix}_{metric} {doc}')
+            lines.append(f'# TYPE {prefix}_{metric} counter')
+            for name, stats in snapshot.items():
+                lines.append(f'{prefix}_{metric}{{name="{name}"}} {getattr(stats, field)}')
+
+        counter('requests_total', 'Number of REST requests.', 'requests')
+        counter('request_errors_total', 'Number of failed REST requests.', 'errors')
+        counter('response_bytes_total', 'Number of response body bytes received.', 'bytes')
+
+        metric = f'{prefix}_request_duration_seconds'
+        lines.append(f'# HELP {metric} Time waiting for (network) and decoding (decode) REST responses.')
+        lines.append(f'# TYPE {metric} histogram')
+        for name, stats in snapshot.items():
+            for phase in ('network', 'decode'):
+                histogram = getattr(stats, f'{phase}_histogram')
+                labels = f'name="{name}",phase="{phase}"'
+                count = 0
+                for bound, value in zip(self._buckets + (float('inf'),), histogram):
+                    count += value
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {count}')
+                lines.append(f'{metric}_sum{{{labels}}} {getattr(stats, f"{phase}_time")}')
+                lines.append(f'{metric}_count{{{labels}}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def _empty(self) -> list:
+        return [0, 0, 0, 0.0, 0.0, [0] * (len(self._buckets) + 1), [0] * (len(self._buckets) + 1)]
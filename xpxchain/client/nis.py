@@ -26,9 +26,13 @@
 """
 
 from __future__ import annotations
+import time
 import typing
 
 from . import client
+from .cache import MISSING
+from .retry import cap_timeout
+from .stream import JSONArrayDecoder, STREAM_CHUNK_SIZE
 from .. import util
 from .. import models
 
@@ -39,17 +43,156 @@ OptionalNetworkType = typing.Optional[models.NetworkType]
 # -----------
 
 
+def cache_lookup(client, name, network_type, args, kwds):
+    """Get the cache key and the cached response for a request."""
+
+    cache = client.cache
+    if cache is None:
+        return None, MISSING
+    key = cache.key(name, network_type, args, kwds)
+    if key is None:
+        return None, MISSING
+    return key, cache.get(key, network_type, CLIENT_CB[name][1])
+
+
+def cache_store(client, name, key, args, status, json, result):
+    """Store a response in the cache, if it is immutable."""
+
+    cache = client.cache
+    if cache is not None:
+        cache.observe(name, result)
+        if key is not None:
+            cache.put(name, key, args, status, json, result)
+
+
+def refresh_height(client, name, key, args, result):
+    """Check if the cache must request the chain height to store a response."""
+
+    return key is not None and client.cache.needs_height(name, args, result)
+
+
+def sync_height(client, network_type):
+    """Request the chain height for the cache, ignoring any errors."""
+
+    try:
+        get_blockchain_height[0](client, network_type)
+    except Exception:
+        pass
+
+
+async def async_height(client, network_type):
+    """Request the chain height for the cache, ignoring any errors."""
+
+    async def resolved():
+        return network_type
+
+    try:
+        await get_blockchain_height[1](client, resolved())
+    except Exception:
+        pass
+
+
+def coalesce(client, name, network_type, args, kwds, fetch):
+    """Share an identical in-flight request, if the client coalesces requests."""
+
+    coalescer = client.coalescer
+    if coalescer is None:
+        return fetch()
+    key = coalescer.key(client.endpoint, name, network_type, args, kwds)
+    if key is None:
+        return fetch()
+    return coalescer.run(key, fetch)
+
+
+def limit(client, fetch):
+    """Wait for the endpoint's concurrency limit, if the client limits requests."""
+
+    limiter = client.limiter
+    if limiter is None:
+        return fetch()
+    return limiter.run(client.endpoint, fetch)
+
+
+def retry(client, name, attempt):
+    """Make a synchronous request, retrying it if it is idempotent."""
+
+    policy = client.retry
+    if policy is None or not name.startswith('get_'):
+        return attempt(client)
+    return policy.call(client, attempt)
+
+
+def async_retry(client, name, attempt):
+    """Make an asynchronous request, retrying or hedging it if it is idempotent."""
+
+    policy = client.retry
+    if policy is None or not name.startswith('get_'):
+        return attempt(client)
+    return policy.async_call(client, attempt)
+
+
+def record(client, name, start, received=None, size=0, error=False):
+    """Record the network and decode time of a request attempt, if the client has metrics."""
+
+    metrics = client.metrics
+    if metrics is not None:
+        now = time.perf_counter()
+        if received is None:
+            received = now
+        if error:
+            metrics.record(name, received - start, error=True)
+        else:
+            metrics.record(name, received - start, now - received, size)
+
+
+def decode(client, name, network_type, process, response):
+    """
+    Decode and process a response, recording the request if the client has metrics.
+
+    The response holds the status, content, and the start and end
+    of the network time, excluding any queueing or retry delays.
+    """
+
+    status, content, start, received = response
+    try:
+        json = client.codec.loads(content)
+        result = process(status, json, network_type)
+    except Exception:
+        record(client, name, start, received, error=True)
+        raise
+    record(client, name, start, received, len(content))
+    return status, json, result
+
+
 def synchronous_request(name, doc="", raise_for_status=True):
     """Generate wrappers for a synchronous request."""
 
     def f(client, network_type, *args, **kwds):
         request, process = CLIENT_CB[name]
-        response = request(client, *args, **kwds)
-        if raise_for_status:
-            response.raise_for_status()
-        status = response.status_code
-        json = response.json()
-        return process(status, json, network_type)
+        key, result = cache_lookup(client, name, network_type, args, kwds)
+        if result is not MISSING:
+            return result
+
+        def attempt(client, budget=None):
+            options = kwds
+            if budget is not None:
+                options = {**kwds, 'timeout': cap_timeout(kwds.get('timeout', client.timeout), budget)}
+            start = time.perf_counter()
+            try:
+                response = request(client, *args, **options)
+                if raise_for_status:
+                    response.raise_for_status()
+            except Exception:
+                record(client, name, start, error=True)
+                raise
+            return response.status_code, response.content, start, time.perf_counter()
+
+        response = retry(client, name, attempt)
+        status, json, result = decode(client, name, network_type, process, response)
+        if refresh_height(client, name, key, args, result):
+            sync_height(client, network_type)
+        cache_store(client, name, key, args, status, json, result)
+        return result
 
     f.__name__ = name
     f.__doc__ = doc
@@ -66,12 +209,32 @@ def asynchronous_request(name, doc="", raise_for_status=True):
         # don't forget to await the awaitable.
         request, process = CLIENT_CB[name]
         network_type = await network_awaitable
-        async with request(client, *args, **kwds) as response:
-            if raise_for_status:
-                response.raise_for_status()
-            status = response.status
-            json = await response.json()
-            return process(status, json, network_type)
+        key, result = cache_lookup(client, name, network_type, args, kwds)
+        if result is not MISSING:
+            return result
+
+        async def send(client):
+            # Time each attempt once the limiter lets it through.
+            start = time.perf_counter()
+            try:
+                async with request(client, *args, **kwds) as response:
+                    if raise_for_status:
+                        response.raise_for_status()
+                    return response.status, await response.read(), start, time.perf_counter()
+            except Exception:
+                record(client, name, start, error=True)
+                raise
+
+        async def fetch():
+            attempt = lambda client: limit(client, lambda: send(client))
+            response = await async_retry(client, name, attempt)
+            status, json, result = decode(client, name, network_type, process, response)
+            if refresh_height(client, name, key, args, result):
+                await async_height(client, network_type)
+            cache_store(client, name, key, args, status, json, result)
+            return result
+
+        return await coalesce(client, name, network_type, args, kwds, fetch)
 
     f.__name__ = f"async_{name}"
     f.__doc__ = doc
@@ -88,6 +251,63 @@ def request(*args, **kwds):
     return s, a
 
 
+def synchronous_stream(name, doc=""):
+    """Generate wrappers for a synchronous, streamed list request."""
+
+    def f(client, network_type, *args, chunk_size=STREAM_CHUNK_SIZE, **kwds):
+        request = CLIENT_CB[name][0]
+        model = STREAM_MODEL[name]
+        response = request(client, *args, stream=True, **kwds)
+        try:
+            response.raise_for_status()
+            decoder = JSONArrayDecoder(client.codec.loads)
+            for chunk in response.iter_content(chunk_size):
+                for item in decoder.feed(chunk):
+                    yield model.create_from_dto(item, network_type)
+            decoder.close()
+        finally:
+            response.close()
+
+    f.__name__ = f"stream_{name}"
+    f.__doc__ = doc
+    f.func_name = f"stream_{name}"
+
+    return f
+
+
+def asynchronous_stream(name, doc=""):
+    """Generate wrappers for an asynchronous, streamed list request."""
+
+    async def f(client, network_type, *args, chunk_size=STREAM_CHUNK_SIZE, **kwds):
+        request = CLIENT_CB[name][0]
+        model = STREAM_MODEL[name]
+        async with request(client, *args, **kwds) as response:
+            response.raise_for_status()
+            decoder = JSONArrayDecoder(client.codec.loads)
+            async for chunk in response.content.iter_chunked(chunk_size):
+                for item in decoder.feed(chunk):
+                    yield model.create_from_dto(item, network_type)
+            decoder.close()
+
+    f.__name__ = f"async_stream_{name}"
+    f.__doc__ = doc
+    f.func_name = f"async_stream_{name}"
+
+    return f
+
+
+def stream(*args, **kwds):
+    """
+    Generate synchronous and asynchronous streamed request wrappers.
+
+    Streamed requests bypass the response cache and request coalescing.
+    """
+
+    s = synchronous_stream(*args, **kwds)
+    a = asynchronous_stream(*args, **kwds)
+    return s, a
+
+
 # ACCOUNT HTTP
 # ------------
 
@@ -347,7 +567,7 @@ def process_get_account_transactions(
     """
 
     assert status == 200
-    return [models.Transaction.create_from_dto(i, network_type) for i in json]
+    return models.Transaction.sequence_from_dto_fast(json, network_type)
 
 
 get_account_transactions = request("get_account_transactions")
@@ -384,7 +604,7 @@ def process_get_account_incoming_transactions(
     """
 
     assert status == 200
-    return [models.Transaction.create_from_dto(i, network_type) for i in json]
+    return models.Transaction.sequence_from_dto_fast(json, network_type)
 
 
 get_account_incoming_transactions = request("get_account_incoming_transactions")
@@ -421,7 +641,7 @@ def process_get_account_outgoing_transactions(
     """
 
     assert status == 200
-    return [models.Transaction.create_from_dto(i, network_type) for i in json]
+    return models.Transaction.sequence_from_dto_fast(json, network_type)
 
 
 get_account_outgoing_transactions = request("get_account_outgoing_transactions")
@@ -458,7 +678,7 @@ def process_get_account_unconfirmed_transactions(
     """
 
     assert status == 200
-    return [models.Transaction.create_from_dto(i, network_type) for i in json]
+    return models.Transaction.sequence_from_dto_fast(json, network_type)
 
 
 get_account_unconfirmed_transactions = request("get_account_unconfirmed_transactions")
@@ -495,7 +715,7 @@ def process_get_account_partial_transactions(
     """
 
     assert status == 200
-    return [models.Transaction.create_from_dto(i, network_type) for i in json]
+    return models.Transaction.sequence_from_dto_fast(json, network_type)
 
 
 get_account_partial_transactions = request("get_account_partial_transactions")
@@ -688,7 +908,7 @@ def process_get_block_transactions(
     """
 
     assert status == 200
-    return [models.Transaction.create_from_dto(i, network_type) for i in json]
+    return models.Transaction.sequence_from_dto_fast(json, network_type)
 
 
 get_block_transactions = request("get_block_transactions")
@@ -1783,7 +2003,7 @@ def process_get_transactions(
     """
 
     assert status == 200
-    return [models.Transaction.create_from_dto(i, network_type) for i in json]
+    return models.Transaction.sequence_from_dto_fast(json, network_type)
 
 
 get_transactions = request("get_transactions")
@@ -2201,3 +2421,28 @@ CLIENT_CB = {
         process_announce_cosignature,
     ),
 }
+
+
+# STREAMING
+# ---------
+
+# Models decoded from each element of streamed list responses.
+STREAM_MODEL = {
+    'get_account_transactions': models.Transaction,
+    'get_account_incoming_transactions': models.Transaction,
+    'get_account_outgoing_transactions': models.Transaction,
+    'get_account_unconfirmed_transactions': models.Transaction,
+    'get_account_partial_transactions': models.Transaction,
+    'get_blocks_by_height_with_limit': models.BlockInfo,
+    'get_block_transactions': models.Transaction,
+    'get_mosaic_richlist': models.AccountBalance,
+}
+
+stream_account_transactions = stream("get_account_transactions")
+stream_account_incoming_transactions = stream("get_account_incoming_transactions")
+stream_account_outgoing_transactions = stream("get_account_outgoing_transactions")
+stream_account_unconfirmed_transactions = stream("get_account_unconfirmed_transactions")
+stream_account_partial_transactions = stream("get_account_partial_transactions")
+stream_blocks_by_height_with_limit = stream("get_blocks_by_height_with_limit")
+stream_block_transactions = stream("get_block_transactions")
+stream_mosaic_richlist = stream("get_mosaic_richlist")
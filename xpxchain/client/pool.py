@@ -0,0 +1,442 @@
+"""
+    pool
+    ====
+
+    Clients that route requests over a pool of nodes.
+
+    Each node is scored from the latency and error rate of the requests
+    routed to it, and from how far its chain height lags behind the
+    highest node in the pool. Every request is sent to the best healthy
+    node, and nodes are periodically probed in the background so
+    unhealthy nodes can recover.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import copy
+import math
+import threading
+import time
+import typing
+
+from . import abc
+from . import default
+from . import nis
+from .. import util
+from ..models.blockchain.network_type import NetworkType
+
+__all__ = [
+    'NodeStats',
+    'NodePool',
+    'AsyncNodePool',
+]
+
+
+def is_node_error(exc: Exception) -> bool:
+    """Check if an exception reflects on the health of the node."""
+
+    response = getattr(exc, 'response', None)
+    status = getattr(response, 'status_code', getattr(exc, 'status', None))
+    # Client errors (such as an unknown account) are not the node's fault.
+    return not isinstance(status, int) or status >= 500 or status == 429
+
+
+class NodeStats(util.Object):
+    """
+    Running health statistics for a single node.
+
+    :param endpoint: Domain name and port for the endpoint.
+    """
+
+    __slots__ = (
+        'endpoint',
+        'latency',
+        'error_rate',
+        'height',
+        'requests',
+        'errors',
+    )
+
+    endpoint: str
+    latency: typing.Optional[float]
+    error_rate: float
+    height: int
+    requests: int
+    errors: int
+
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self.latency = None
+        self.error_rate = 0.0
+        self.height = 0
+        self.requests = 0
+        self.errors = 0
+
+    def __repr__(self) -> str:
+        return (
+            f'NodeStats(endpoint={self.endpoint!r}, latency={self.latency!r}, '
+            f'error_rate={self.error_rate!r}, height={self.height!r}, '
+            f'requests={self.requests!r}, errors={self.errors!r})'
+        )
+
+    def record_success(self, latency: float, alpha: float) -> None:
+        """Record a successful request and its latency (in seconds)."""
+
+        self.requests += 1
+        self.error_rate *= 1 - alpha
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += alpha * (latency - self.latency)
+
+    def record_error(self, alpha: float) -> None:
+        """Record a failed request."""
+
+        self.requests += 1
+        self.errors += 1
+        self.error_rate += alpha * (1 - self.error_rate)
+
+
+class NodePoolBase(
+    abc.AccountHTTP,
+    abc.BlockchainHTTP,
+    abc.MetadataHTTP,
+    abc.ConfigHTTP,
+    abc.NodeHTTP,
+    abc.MosaicHTTP,
+    abc.NamespaceHTTP,
+    abc.NetworkHTTP,
+    abc.TransactionHTTP,
+):
+    """
+    Shared, abstract base class for sync and async node pools.
+
+    :param endpoints: Domain names and ports for the endpoints.
+    :param network_type: (Optional) Network type shared by all nodes.
+    :param interval: (Optional) Seconds between background probes, or None to disable.
+    :param max_lag: (Optional) Maximum blocks a healthy node may lag behind.
+    :param max_error_rate: (Optional) Maximum error rate of a healthy node.
+    :param alpha: (Optional) Smoothing factor for latency and error rate.
+    """
+
+    _endpoints: typing.Sequence[str]
+    _nodes: typing.Dict[str, abc.HTTPSharedBase]
+    _stats: typing.Dict[str, NodeStats]
+    _interval: typing.Optional[float]
+    _max_lag: int
+    _max_error_rate: float
+    _alpha: float
+
+    def __init__(
+        self,
+        endpoints: typing.Sequence[str],
+        network_type: typing.Optional[NetworkType] = None,
+        interval: typing.Optional[float] = 30.0,
+        max_lag: int = 2,
+        max_error_rate: float = 0.5,
+        alpha: float = 0.2,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("Node pool requires at least one endpoint.")
+        self._endpoints = list(endpoints)
+        self._network_type = network_type
+        self._nodes = {}
+        self._stats = {i: NodeStats(i) for i in self._endpoints}
+        self._interval = interval
+        self._max_lag = max_lag
+        self._max_error_rate = max_error_rate
+        self._alpha = alpha
+
+    @property
+    def endpoints(self) -> typing.Sequence[str]:
+        """Get endpoints in the pool."""
+        return self._endpoints
+
+    @property
+    def stats(self) -> typing.Dict[str, NodeStats]:
+        """Get snapshot of the health statistics for each node."""
+        return {k: copy.copy(v) for k, v in self._stats.items()}
+
+    def is_healthy(self, endpoint: str) -> bool:
+        """Check if node at endpoint is healthy."""
+
+        stats = self._stats[endpoint]
+        max_height = max(i.height for i in self._stats.values())
+        return (
+            stats.error_rate <= self._max_error_rate
+            and max_height - stats.height <= self._max_lag
+        )
+
+    def rank(self) -> typing.List[str]:
+        """Get endpoints ordered from best to worst node."""
+
+        max_height = max(i.height for i in self._stats.values())
+
+        def key(stats: NodeStats):
+            lag = max_height - stats.height
+            healthy = stats.error_rate <= self._max_error_rate and lag <= self._max_lag
+            latency = math.inf if stats.latency is None else stats.latency
+            if healthy:
+                return (0, 0, 0.0, latency)
+            return (1, lag, stats.error_rate, latency)
+
+        return [i.endpoint for i in sorted(self._stats.values(), key=key)]
+
+    @property
+    def best(self) -> str:
+        """Get endpoint of the best node."""
+        return self.rank()[0]
+
+    def _record_success(self, endpoint: str, latency: float) -> None:
+        self._stats[endpoint].record_success(latency, self._alpha)
+
+    def _record_error(self, endpoint: str, exc: Exception) -> None:
+        if is_node_error(exc):
+            self._stats[endpoint].record_error(self._alpha)
+
+    def _record_height(self, endpoint: str, height: int) -> None:
+        self._stats[endpoint].height = height
+
+    @property
+    def network_type(self):
+        """Get network type for pool."""
+        return self._nodes[self.best].network_type
+
+    @property
+    def generation_hash(self):
+        """Get nemesis generation hash for pool."""
+        return self._nodes[self.best].generation_hash
+
+
+@util.inherit_doc
+class NodePool(NodePoolBase):
+    """
+    Synchronous client routing requests over a pool of nodes.
+
+    Nodes are probed once when entering the `with` block, and then
+    every `interval` seconds from a background thread.
+    """
+
+    _lock: threading.Lock
+    _stop: threading.Event
+    _thread: typing.Optional[threading.Thread] = None
+
+    def __init__(self, *args, **kwds) -> None:
+        super().__init__(*args, **kwds)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def __enter__(self) -> NodePool:
+        for endpoint in self._endpoints:
+            self._nodes[endpoint] = default.HTTP(endpoint, self._network_type).__enter__()
+        self.refresh()
+        if self._interval is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __call__(self, cbs, *args, **kwds):
+        with self._lock:
+            endpoint = self.best
+        start = time.monotonic()
+        try:
+            result = self._nodes[endpoint](cbs, *args, **kwds)
+        except Exception as exc:
+            with self._lock:
+                self._record_error(endpoint, exc)
+            raise
+        with self._lock:
+            self._record_success(endpoint, time.monotonic() - start)
+        return result
+
+    # Bulk, paged and block range requests are built on `__call__`,
+    # so each of their requests is routed to the best node.
+    _bulk = abc.HTTPBase._bulk
+    _paginate = abc.HTTPBase._paginate
+    _iter_blocks = abc.HTTPBase._iter_blocks
+
+    def _stream(self, cbs, *args, **kwds):
+        # A streamed response is read from a single node.
+        with self._lock:
+            endpoint = self.best
+        try:
+            yield from self._nodes[endpoint]._stream(cbs, *args, **kwds)
+        except Exception as exc:
+            with self._lock:
+                self._record_error(endpoint, exc)
+            raise
+
+    @property
+    def stats(self) -> typing.Dict[str, NodeStats]:
+        with self._lock:
+            return super().stats
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for node in self._nodes.values():
+            node.close()
+        self._nodes.clear()
+
+    def refresh(self) -> None:
+        """Probe the chain height and latency of every node."""
+
+        for endpoint in self._endpoints:
+            self._probe(endpoint)
+
+    def _probe(self, endpoint: str) -> None:
+        node = self._nodes[endpoint]
+        start = time.monotonic()
+        try:
+            height = node(nis.get_blockchain_height, network_type=node._none)
+        except Exception as exc:
+            with self._lock:
+                self._record_error(endpoint, exc)
+        else:
+            with self._lock:
+                self._record_success(endpoint, time.monotonic() - start)
+                self._record_height(endpoint, height)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.refresh()
+
+    @property
+    def _none(self) -> None:
+        return None
+
+
+@util.inherit_doc
+class AsyncNodePool(NodePoolBase):
+    """
+    Asynchronous client routing requests over a pool of nodes.
+
+    Nodes are probed once when entering the `async with` block, and
+    then every `interval` seconds from a background task.
+
+    :param loop: (Optional) Event loop for the client.
+    """
+
+    _loop: util.OptionalLoopType
+    _task: typing.Optional[asyncio.Future] = None
+
+    def __init__(self, *args, loop: util.OptionalLoopType = None, **kwds) -> None:
+        super().__init__(*args, **kwds)
+        self._loop = loop
+
+    def __enter__(self) -> AsyncNodePool:
+        raise TypeError("Only use async with.")
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    async def __aenter__(self) -> AsyncNodePool:
+        for endpoint in self._endpoints:
+            node = default.AsyncHTTP(endpoint, self._loop, self._network_type)
+            self._nodes[endpoint] = await node.__aenter__()
+        await self.refresh()
+        if self._interval is not None:
+            self._task = asyncio.ensure_future(self._run(), loop=self._loop)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def __call__(self, cbs, *args, **kwds):
+        return self.call(cbs, *args, **kwds)
+
+    @util.observable
+    async def call(self, cbs, *args, **kwds):
+        endpoint = self.best
+        start = time.monotonic()
+        try:
+            result = await self._nodes[endpoint](cbs, *args, **kwds)
+        except Exception as exc:
+            self._record_error(endpoint, exc)
+            raise
+        self._record_success(endpoint, time.monotonic() - start)
+        return result
+
+    # Bulk, paged and block range requests are built on `__call__`,
+    # so each of their requests is routed to the best node.
+    _bulk = abc.AsyncHTTPBase._bulk
+    _paginate = abc.AsyncHTTPBase._paginate
+    _iter_blocks = abc.AsyncHTTPBase._iter_blocks
+
+    async def _stream(self, cbs, *args, **kwds):
+        # A streamed response is read from a single node.
+        endpoint = self.best
+        try:
+            async for item in self._nodes[endpoint]._stream(cbs, *args, **kwds):
+                yield item
+        except Exception as exc:
+            self._record_error(endpoint, exc)
+            raise
+
+    @property
+    def loop(self) -> util.OptionalLoopType:
+        """Get event loop."""
+        return self._loop
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for node in self._nodes.values():
+            await node.close()
+        self._nodes.clear()
+
+    async def refresh(self) -> None:
+        """Probe the chain height and latency of every node."""
+
+        await asyncio.gather(*(self._probe(i) for i in self._endpoints))
+
+    async def _probe(self, endpoint: str) -> None:
+        node = self._nodes[endpoint]
+        start = time.monotonic()
+        try:
+            height = await node(nis.get_blockchain_height, network_type=node._none)
+        except Exception as exc:
+            self._record_error(endpoint, exc)
+        else:
+            self._record_success(endpoint, time.monotonic() - start)
+            self._record_height(endpoint, height)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.refresh()
+
+    @property
+    async def network_type(self):
+        return await self._nodes[self.best].network_type
+
+    @property
+    async def generation_hash(self):
+        return await self._nodes[self.best].generation_hash
+
+    @property
+    async def _none(self) -> None:
+        return None
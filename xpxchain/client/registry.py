@@ -0,0 +1,266 @@
+"""
+    registry
+    ========
+
+    Process-wide registry of the network type and nemesis generation
+    hash for each node.
+
+    Both values are fixed for the lifetime of a network, so they are
+    resolved once per endpoint and then shared by every synchronous and
+    asynchronous client, as well as the websockets listener. Concurrent
+    resolutions for the same endpoint are coalesced into a single
+    request, both across threads and across tasks of the same event
+    loop. The registry may also be pre-seeded, for example from
+    configuration, to avoid any round trip.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import asyncio
+import collections
+import threading
+import typing
+import urllib3
+
+from . import nis
+from .. import util
+from ..models.blockchain.network_type import NetworkType
+
+__all__ = [
+    'NetworkRegistry',
+    'NETWORK_REGISTRY',
+]
+
+DEFAULT_PORT = {
+    'http': 80,
+    'https': 443,
+    'ws': 80,
+    'wss': 443
+}
+
+
+def endpoint_key(endpoint: str) -> str:
+    """
+    Normalize endpoint to the host and port of the node.
+
+    HTTP and websockets URLs for the same node share the same key.
+    """
+
+    url = urllib3.util.parse_url(endpoint)
+    scheme = url.scheme or 'http'
+    port = url.port or DEFAULT_PORT.get(scheme, 80)
+    return f'{(url.host or "").lower()}:{port}'
+
+
+def to_network_type(value) -> NetworkType:
+    """Convert a network type, its name or its identifier to a network type."""
+
+    if isinstance(value, str):
+        return nis.NETWORK_TYPE[value]
+    return NetworkType(value)
+
+
+def sync_network_type(http):
+    return http.root.network.get_network_type()
+
+
+def sync_generation_hash(http):
+    return http.root.blockchain.get_block_by_height(1).generation_hash
+
+
+async def async_network_type(http):
+    return await http.root.network.get_network_type()
+
+
+async def async_generation_hash(http):
+    block = await http.root.blockchain.get_block_by_height(1)
+    return block.generation_hash
+
+
+class NetworkRegistry(util.Object):
+    """
+    Thread- and task-safe registry of network properties by endpoint.
+
+    Endpoints are normalized to the host and port of the node, so
+    different URLs to the same node share the same entry.
+    """
+
+    __slots__ = (
+        '_entries',
+        '_lock',
+        '_locks',
+        '_pending',
+    )
+
+    _entries: typing.Dict[str, dict]
+    _lock: threading.Lock
+    _locks: typing.Dict[typing.Tuple[str, str], threading.Lock]
+    _pending: typing.Dict[typing.Tuple[str, str], asyncio.Future]
+
+    def __init__(self) -> None:
+        self._entries = collections.defaultdict(dict)
+        self._lock = threading.Lock()
+        self._locks = {}
+        self._pending = {}
+
+    def __contains__(self, endpoint: str) -> bool:
+        with self._lock:
+            return endpoint_key(endpoint) in self._entries
+
+    def get(self, endpoint: str, name: str):
+        """
+        Get a resolved network property, or `None` if it is unknown.
+
+        :param endpoint: Domain name and port for the endpoint.
+        :param name: Name of the property (network_type or generation_hash).
+        """
+
+        with self._lock:
+            return self._entries.get(endpoint_key(endpoint), {}).get(name)
+
+    def seed(
+        self,
+        endpoint: str,
+        network_type: typing.Optional[typing.Any] = None,
+        generation_hash: typing.Optional[str] = None,
+    ) -> None:
+        """
+        Pre-seed network properties for an endpoint.
+
+        :param endpoint: Domain name and port for the endpoint.
+        :param network_type: (Optional) Network type, its name or its identifier.
+        :param generation_hash: (Optional) Nemesis generation hash.
+        """
+
+        if network_type is not None:
+            self._set(endpoint_key(endpoint), 'network_type', to_network_type(network_type))
+        if generation_hash is not None:
+            self._set(endpoint_key(endpoint), 'generation_hash', generation_hash)
+
+    def load(self, config: typing.Mapping[str, typing.Mapping[str, typing.Any]]) -> None:
+        """
+        Pre-seed network properties from a configuration mapping.
+
+        Each endpoint maps to an object with optional `networkType` and
+        `generationHash` keys (the snake-case names are also accepted).
+
+        :param config: Mapping of endpoints to network properties.
+        """
+
+        for endpoint, value in config.items():
+            self.seed(
+                endpoint,
+                network_type=value.get('networkType', value.get('network_type')),
+                generation_hash=value.get('generationHash', value.get('generation_hash')),
+            )
+
+    def clear(self, endpoint: typing.Optional[str] = None) -> None:
+        """
+        Forget resolved network properties.
+
+        :param endpoint: (Optional) Only forget properties for this endpoint.
+        """
+
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(endpoint_key(endpoint), None)
+
+    def network_type(self, http) -> NetworkType:
+        """Get network type for a synchronous HTTP client, resolving it once."""
+        return self._resolve(http, 'network_type', sync_network_type)
+
+    def generation_hash(self, http) -> str:
+        """Get nemesis generation hash for a synchronous HTTP client, resolving it once."""
+        return self._resolve(http, 'generation_hash', sync_generation_hash)
+
+    async def async_network_type(self, http) -> NetworkType:
+        """Get network type for an asynchronous HTTP client, resolving it once."""
+        return await self._async_resolve(http, 'network_type', async_network_type)
+
+    async def async_generation_hash(self, http) -> str:
+        """Get nemesis generation hash for an asynchronous HTTP client, resolving it once."""
+        return await self._async_resolve(http, 'generation_hash', async_generation_hash)
+
+    def _set(self, key: str, name: str, value) -> None:
+        with self._lock:
+            self._entries[key][name] = value
+
+    def _lookup(self, key: str, name: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else entry.get(name)
+
+    def _resolve(self, http, name: str, resolver):
+        key = endpoint_key(http.raw.endpoint)
+        value = self._lookup(key, name)
+        if value is not None:
+            return value
+
+        with self._lock:
+            lock = self._locks.setdefault((key, name), threading.Lock())
+        with lock:
+            # Another thread may have resolved it while we were waiting.
+            value = self._lookup(key, name)
+            if value is None:
+                value = resolver(http)
+                self._set(key, name, value)
+        return value
+
+    async def _async_resolve(self, http, name: str, resolver):
+        key = endpoint_key(http.raw.endpoint)
+        value = self._lookup(key, name)
+        if value is not None:
+            return value
+
+        # Share a single in-flight request between tasks on the same loop.
+        # Futures are bound to a loop, so other loops resolve separately.
+        loop = asyncio.get_event_loop()
+        with self._lock:
+            future = self._pending.get((key, name))
+            owner = future is None or future.done() or future.get_loop() is not loop
+            if owner:
+                future = loop.create_future()
+                self._pending[(key, name)] = future
+        if not owner:
+            return await asyncio.shield(future)
+
+        try:
+            value = await resolver(http)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Avoid "exception was never retrieved" warnings without waiters.
+            future.exception()
+            raise
+        else:
+            self._set(key, name, value)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                if self._pending.get((key, name)) is future:
+                    del self._pending[(key, name)]
+
+
+# Registry shared by all clients in the process.
+NETWORK_REGISTRY = NetworkRegistry()
@@ -0,0 +1,281 @@
+"""
+    retry
+    =====
+
+    Retries and hedged requests for idempotent REST calls.
+
+    Failed GET requests are retried with capped exponential backoff and
+    full jitter, when they fail with a retryable status (or a timeout or
+    dropped connection), and while the retries fit in the call's time
+    budget. Each attempt's timeout is capped to the remaining budget.
+    Asynchronous clients may also hedge: once a request is slower than
+    a percentile of the recent latencies for its endpoint, a duplicate
+    is sent to another endpoint and the first response wins.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import aiohttp
+import asyncio
+import collections
+import random
+import requests
+import time
+import typing
+
+from .. import util
+
+__all__ = ['RetryPolicy']
+
+# Statuses worth retrying: rate limits and transient server errors.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Errors worth retrying when no response was received.
+CONNECTION_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    aiohttp.ClientConnectionError,
+    asyncio.TimeoutError,
+)
+# Number of recent latencies kept per endpoint for hedging.
+LATENCY_WINDOW = 100
+# Number of latencies required before hedging an endpoint.
+LATENCY_MIN_SAMPLES = 20
+
+
+def cap_timeout(timeout, budget: typing.Optional[float]):
+    """Cap a requests timeout, or (connect, read) timeouts, to the remaining budget."""
+
+    if budget is None:
+        return timeout
+    if timeout is None:
+        return budget
+    if isinstance(timeout, tuple):
+        return tuple(budget if i is None else min(i, budget) for i in timeout)
+    return min(timeout, budget)
+
+
+def error_status(exc: BaseException) -> typing.Optional[int]:
+    """Get the HTTP status from a requests or aiohttp error, if any."""
+
+    status = getattr(exc, 'status', None)
+    if status is None:
+        status = getattr(getattr(exc, 'response', None), 'status_code', None)
+    return status
+
+
+class RetryPolicy(util.Object):
+    """
+    Retry and hedging policy for idempotent requests.
+
+    :param attempts: (Optional) Maximum number of attempts per call.
+    :param backoff: (Optional) Base delay before the first retry (in seconds).
+    :param max_backoff: (Optional) Maximum delay between attempts (in seconds).
+    :param jitter: (Optional) Randomize each delay between 0 and its backoff.
+    :param statuses: (Optional) HTTP statuses to retry.
+    :param budget: (Optional) Maximum time spent per call, including retries (in seconds).
+    :param hedge_endpoints: (Optional) Endpoints for hedged requests (asynchronous only).
+    :param hedge_percentile: (Optional) Latency percentile after which to hedge.
+    """
+
+    __slots__ = (
+        'attempts',
+        'backoff',
+        'max_backoff',
+        'jitter',
+        'statuses',
+        'budget',
+        'hedge_endpoints',
+        'hedge_percentile',
+        'retries',
+        'hedges',
+        '_latencies',
+    )
+
+    attempts: int
+    backoff: float
+    max_backoff: float
+    jitter: bool
+    statuses: typing.FrozenSet[int]
+    budget: typing.Optional[float]
+    hedge_endpoints: typing.Sequence[str]
+    hedge_percentile: float
+    retries: int
+    hedges: int
+    _latencies: typing.Dict[str, typing.Deque[float]]
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: float = 0.1,
+        max_backoff: float = 2.0,
+        jitter: bool = True,
+        statuses: typing.Iterable[int] = RETRY_STATUSES,
+        budget: typing.Optional[float] = None,
+        hedge_endpoints: typing.Sequence[str] = (),
+        hedge_percentile: float = 0.95,
+    ) -> None:
+        if attempts < 1:
+            raise ValueError("Must make at least one attempt.")
+        if not 0 < hedge_percentile < 1:
+            raise ValueError("Hedge percentile must be between 0 and 1.")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.budget = budget
+        self.hedge_endpoints = hedge_endpoints
+        self.hedge_percentile = hedge_percentile
+        self.retries = 0
+        self.hedges = 0
+        self._latencies = collections.defaultdict(lambda: collections.deque(maxlen=LATENCY_WINDOW))
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        """
+        Get if a failed attempt may be retried.
+
+        :param exc: Error raised by the attempt.
+        """
+
+        status = error_status(exc)
+        if status is not None:
+            return status in self.statuses
+        return isinstance(exc, CONNECTION_ERRORS)
+
+    def delay(self, attempt: int) -> float:
+        """
+        Get the delay before a retry.
+
+        :param attempt: Number of failed attempts.
+        """
+
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def hedge_delay(self, endpoint: str) -> typing.Optional[float]:
+        """
+        Get the latency after which a request to an endpoint is hedged.
+
+        :param endpoint: URL for the endpoint.
+        :return: Delay (in seconds), or None if the endpoint has too few samples.
+        """
+
+        samples = self._latencies.get(endpoint)
+        if not samples or len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile))]
+
+    def call(self, client, attempt: typing.Callable[[typing.Any, typing.Optional[float]], typing.Any]):
+        """
+        Make a synchronous request, retrying failed attempts.
+
+        :param client: Client wrapper for the endpoint.
+        :param attempt: Callback making a single request with a client wrapper and the remaining budget.
+        """
+
+        start = time.monotonic()
+        for index in range(1, self.attempts + 1):
+            try:
+                return attempt(client, self._remaining(start, time.monotonic()))
+            except Exception as exc:
+                delay = self._retry_delay(exc, index, start, time.monotonic())
+                if delay is None:
+                    raise
+            time.sleep(delay)
+
+    async def async_call(self, client, attempt: typing.Callable[[typing.Any], typing.Awaitable]):
+        """
+        Make an asynchronous request, retrying failed attempts and hedging slow ones.
+
+        The attempt returns the response with the start and end of its
+        network time, which excludes any wait for a concurrency limiter.
+
+        :param client: Client wrapper for the endpoint.
+        :param attempt: Callback making a single request with a client wrapper.
+        """
+
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        for index in range(1, self.attempts + 1):
+            try:
+                remaining = self._remaining(start, loop.time())
+                return await asyncio.wait_for(self._hedge(client, attempt), remaining)
+            except Exception as exc:
+                delay = self._retry_delay(exc, index, start, loop.time())
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+
+    def _retry_delay(self, exc: Exception, index: int, start: float, now: float) -> typing.Optional[float]:
+        """Get the delay before retrying, or None to raise the error."""
+
+        if index >= self.attempts or not self.is_retryable(exc):
+            return None
+        delay = self.delay(index)
+        if self.budget is not None and now + delay - start >= self.budget:
+            return None
+        self.retries += 1
+        return delay
+
+    def _remaining(self, start: float, now: float) -> typing.Optional[float]:
+        """Get the time left in the budget, or None if unbounded."""
+
+        if self.budget is None:
+            return None
+        return max(0, self.budget - (now - start))
+
+    async def _timed(self, client, attempt):
+        response = await attempt(client)
+        start, received = response[-2:]
+        self._latencies[client.endpoint].append(received - start)
+        return response
+
+    async def _hedge(self, client, attempt):
+        delay = self.hedge_delay(client.endpoint)
+        if delay is None:
+            return await self._timed(client, attempt)
+        others = [client.with_endpoint(i) for i in self.hedge_endpoints]
+        others = [i for i in others if i.endpoint != client.endpoint]
+        if not others:
+            return await self._timed(client, attempt)
+
+        first = asyncio.ensure_future(self._timed(client, attempt))
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return first.result()
+
+            self.hedges += 1
+            hedge = random.choice(others)
+            pending.add(asyncio.ensure_future(self._timed(hedge, attempt)))
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                if not pending:
+                    # Both requests failed, report the original error.
+                    return first.result()
+        finally:
+            for task in pending:
+                task.cancel()
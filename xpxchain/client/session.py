@@ -0,0 +1,162 @@
+"""
+    session
+    =======
+
+    Shared HTTP sessions for the synchronous clients.
+
+    By default, every synchronous client opens its own `requests.Session`
+    with the default connection pool of 10 connections. A session pool
+    instead hands out one session per endpoint, shared by all clients
+    to that endpoint, with a configurable connection pool. Sessions are
+    reference-counted and closed once the last client is closed.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import threading
+import typing
+import requests
+
+from . import client
+from .. import util
+
+__all__ = ['SessionPool']
+
+
+def session_key(endpoint: str) -> str:
+    """Normalize endpoint to the scheme, host and port of the node."""
+
+    url = client.parse_http_url(endpoint)
+    port = url.port or client.DEFAULT_PORT[url.scheme]
+    return f'{url.scheme}://{(url.host or "").lower()}:{port}'
+
+
+class SessionPool(util.Object):
+    """
+    Thread-safe pool of shared `requests` sessions, one per endpoint.
+
+    :param pool_connections: (Optional) Number of connection pools to cache.
+    :param pool_maxsize: (Optional) Maximum number of connections per pool.
+    :param pool_block: (Optional) Block when no free connections are available.
+    :param max_retries: (Optional) Maximum retries for failed connections.
+    :param keep_alive: (Optional) Keep connections alive between requests.
+    """
+
+    __slots__ = (
+        '_pool_connections',
+        '_pool_maxsize',
+        '_pool_block',
+        '_max_retries',
+        '_keep_alive',
+        '_lock',
+        '_sessions',
+    )
+
+    _pool_connections: int
+    _pool_maxsize: int
+    _pool_block: bool
+    _max_retries: int
+    _keep_alive: bool
+    _lock: threading.Lock
+    _sessions: typing.Dict[str, typing.List]
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        max_retries: int = 0,
+        keep_alive: bool = True,
+    ) -> None:
+        if pool_connections <= 0 or pool_maxsize <= 0:
+            raise ValueError("Connection pool size must be positive.")
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self._max_retries = max_retries
+        self._keep_alive = keep_alive
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def pool_maxsize(self) -> int:
+        """Get maximum number of connections per pool."""
+        return self._pool_maxsize
+
+    def acquire(self, endpoint: str) -> requests.Session:
+        """
+        Get the shared session for an endpoint, creating it if needed.
+
+        Each call must be balanced by a call to `release`.
+
+        :param endpoint: Domain name and port for the endpoint.
+        """
+
+        key = session_key(endpoint)
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                entry = self._sessions[key] = [self._create(), 0]
+            entry[1] += 1
+            return entry[0]
+
+    def release(self, endpoint: str) -> None:
+        """
+        Release the shared session for an endpoint.
+
+        The session is closed once it has been released by every client.
+
+        :param endpoint: Domain name and port for the endpoint.
+        """
+
+        key = session_key(endpoint)
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._sessions[key]
+                entry[0].close()
+
+    def close(self) -> None:
+        """Close all sessions, even if they are still in use."""
+
+        with self._lock:
+            sessions = [i[0] for i in self._sessions.values()]
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def _create(self) -> requests.Session:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            max_retries=self._max_retries,
+            pool_block=self._pool_block,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not self._keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
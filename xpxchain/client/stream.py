@@ -0,0 +1,199 @@
+"""
+    stream
+    ======
+
+    Incremental decoding of JSON array responses.
+
+    Large list responses (rich lists, block ranges, account transactions)
+    are decoded element by element as chunks of the body arrive, so the
+    full JSON tree and every model never need to be held in memory at
+    once. Only the bytes of the current, incomplete element are buffered.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import json
+import re
+import typing
+
+from .. import util
+
+__all__ = ['JSONArrayDecoder']
+
+# Default size (in bytes) of the chunks read from a streamed response.
+STREAM_CHUNK_SIZE = 64 * 1024
+# Characters that change the structure outside and inside of strings.
+STRUCTURE = re.compile(rb'[\[\]{},"]')
+STRING = re.compile(rb'["\\]')
+# Opening bracket for each closing bracket.
+BRACKETS = {b']': b'[', b'}': b'{'}
+
+
+class JSONArrayDecoder(util.Object):
+    """
+    Incremental decoder yielding the elements of a top-level JSON array.
+
+    :param loads: (Optional) Callback to decode a single JSON element.
+    """
+
+    __slots__ = (
+        '_loads',
+        '_buffer',
+        '_pos',
+        '_start',
+        '_stack',
+        '_separated',
+        '_in_string',
+        '_done',
+    )
+
+    _loads: typing.Callable[[bytes], typing.Any]
+    _buffer: bytearray
+    _pos: int
+    _start: typing.Optional[int]
+    _stack: typing.List[bytes]
+    _separated: bool
+    _in_string: bool
+    _done: bool
+
+    def __init__(self, loads: typing.Callable[[bytes], typing.Any] = json.loads) -> None:
+        self._loads = loads
+        self._buffer = bytearray()
+        self._pos = 0
+        self._start = None
+        self._stack = []
+        self._separated = False
+        self._in_string = False
+        self._done = False
+
+    @property
+    def done(self) -> bool:
+        """Get if the closing bracket of the array has been decoded."""
+        return self._done
+
+    def feed(self, data: bytes) -> typing.List[typing.Any]:
+        """
+        Decode a chunk of the response body.
+
+        :param data: Next chunk of the response body.
+        :return: List of elements completed by the chunk.
+        """
+
+        if self._done:
+            if data.strip():
+                raise ValueError("Unexpected data after JSON array.")
+            return []
+
+        items: list = []
+        self._buffer += data
+        pos = self._pos
+        found = True
+        while found and not self._done:
+            if self._in_string:
+                pos, found = self._scan_string(pos)
+            else:
+                pos, found = self._scan_structure(pos, items)
+        self._compact(pos)
+        return items
+
+    def close(self) -> None:
+        """Check the whole array has been decoded."""
+
+        if not self._done:
+            raise ValueError("Incomplete JSON array.")
+
+    # SCANNERS
+
+    def _scan_string(self, pos: int) -> typing.Tuple[int, bool]:
+        """Scan for the end of a string, returning the next position and if more data can be scanned."""
+
+        buffer = self._buffer
+        match = STRING.search(buffer, pos)
+        if match is None:
+            return len(buffer), False
+        elif match.group() != b'\\':
+            self._in_string = False
+            return match.end(), True
+        elif match.end() == len(buffer):
+            # Wait for the escaped character.
+            return match.start(), False
+        return match.end() + 1, True
+
+    def _scan_structure(self, pos: int, items: list) -> typing.Tuple[int, bool]:
+        """Scan for the next structural character, returning the next position and if more data can be scanned."""
+
+        match = STRUCTURE.search(self._buffer, pos)
+        if match is None:
+            return len(self._buffer), False
+        char = match.group()
+        if char == b'"':
+            self._in_string = True
+        elif char in b'[{':
+            self._open(char, match.start())
+        elif char in b']}':
+            self._close(char, match.start(), items)
+        elif len(self._stack) == 1:
+            self._separate(match.start(), items)
+        elif not self._stack:
+            raise ValueError("Expected JSON array.")
+        return match.end(), True
+
+    def _open(self, char: bytes, start: int) -> None:
+        if not self._stack:
+            if char != b'[' or self._buffer[:start].strip():
+                raise ValueError("Expected JSON array.")
+            self._start = start + 1
+        self._stack.append(char)
+
+    def _close(self, char: bytes, start: int, items: list) -> None:
+        if not self._stack or self._stack.pop() != BRACKETS[char]:
+            raise ValueError("Mismatched JSON brackets.")
+        elif self._stack:
+            return
+        # Closing bracket of the array, which only has no element if empty.
+        if self._separated or self._buffer[self._start:start].strip():
+            self._emit(start, items)
+        self._done = True
+
+    def _separate(self, start: int, items: list) -> None:
+        # Comma separating two elements.
+        self._emit(start, items)
+        self._start = start + 1
+        self._separated = True
+
+    def _compact(self, pos: int) -> None:
+        """Drop the scanned data before the current element."""
+
+        buffer = self._buffer
+        if self._done:
+            rest = bytes(buffer[pos:])
+            buffer.clear()
+            if rest.strip():
+                raise ValueError("Unexpected data after JSON array.")
+        elif self._start is not None:
+            del buffer[:self._start]
+            pos -= self._start
+            self._start = 0
+        self._pos = pos
+
+    def _emit(self, end: int, items: list) -> None:
+        element = bytes(self._buffer[self._start:end]).strip()
+        if not element:
+            raise ValueError("Expected JSON value.")
+        items.append(self._loads(element))
@@ -0,0 +1,491 @@
+"""
+    sqlite
+    ======
+
+    Incremental chain indexer backed by SQLite.
+
+    Blocks, transactions and receipts are downloaded with
+    `BlockchainHTTP.iter_blocks` and stored as DTOs, alongside lookup
+    tables of the addresses, mosaics and transaction types each
+    transaction refers to. Queries return the regular models, so
+    historical lookups ("all transfers to an address between two
+    heights") never have to page through the REST API.
+
+    Every batch of blocks is committed together with the synced height,
+    so an interrupted sync resumes from the last committed block. Only
+    blocks at least `depth` blocks below the chain height are indexed,
+    since more recent blocks may still be rolled back. Syncing again
+    from an indexed height replaces the blocks from that height onwards.
+
+    License
+    -------
+
+    Copyright 2019 NEM
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import annotations
+import sqlite3
+import typing
+
+from .. import models
+from .. import util
+from ..client import abc
+from ..client.codec import DEFAULT_CODEC, JSONCodec
+
+__all__ = ['ChainIndex']
+
+# Number of blocks written per database transaction during a sync.
+BATCH_SIZE = 100
+# Number of blocks below the chain height considered final.
+DEPTH = 360
+# Tables holding data for each indexed height.
+TABLES = (
+    'transaction_addresses',
+    'transaction_mosaics',
+    'transaction_types',
+    'transactions',
+    'receipts',
+    'blocks',
+)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    height INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS receipts (
+    height INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    hash TEXT,
+    height INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    type INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transaction_addresses (
+    tx INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    incoming INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transaction_mosaics (
+    tx INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    mosaic TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transaction_types (
+    tx INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    type INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_height ON transactions (height, position);
+CREATE INDEX IF NOT EXISTS transactions_hash ON transactions (hash);
+CREATE INDEX IF NOT EXISTS transaction_addresses_address ON transaction_addresses (address, height);
+CREATE INDEX IF NOT EXISTS transaction_mosaics_mosaic ON transaction_mosaics (mosaic, height);
+CREATE INDEX IF NOT EXISTS transaction_types_type ON transaction_types (type, height);
+'''
+
+AddressType = typing.Union[models.Address, str]
+MosaicType = typing.Union[models.MosaicId, models.NamespaceId, int]
+TransactionTypeType = typing.Union[models.TransactionType, int]
+
+
+def address_key(address: AddressType) -> str:
+    """Get the plain address string used as an index key."""
+
+    if isinstance(address, models.Address):
+        return address.address
+    return models.Address(address).address
+
+
+def mosaic_key(mosaic: MosaicType) -> str:
+    """Get the hex mosaic (or alias) identifier used as an index key."""
+
+    # Identifiers are unsigned 64-bit, which overflows SQLite integers.
+    return f'{int(mosaic):016x}'
+
+
+def transaction_entries(
+    transaction: models.TransactionBase,
+) -> typing.Iterator[typing.Tuple[str, typing.Any]]:
+    """Iterate over the (kind, value) index entries of a transaction."""
+
+    yield 'type', int(transaction.type)
+    if transaction.signer is not None:
+        yield 'signer', transaction.signer.address.address
+    recipient = getattr(transaction, 'recipient', None)
+    if isinstance(recipient, models.Address):
+        yield 'recipient', recipient.address
+    for mosaic in getattr(transaction, 'mosaics', None) or ():
+        yield 'mosaic', mosaic_key(mosaic.id)
+    mosaic = getattr(transaction, 'mosaic', None)
+    if mosaic is not None:
+        yield 'mosaic', mosaic_key(mosaic.id)
+    mosaic_id = getattr(transaction, 'mosaic_id', None)
+    if mosaic_id is not None:
+        yield 'mosaic', mosaic_key(mosaic_id)
+    for inner in getattr(transaction, 'inner_transactions', None) or ():
+        yield from transaction_entries(inner)
+
+
+class ChainIndex(util.Object):
+    """
+    Local SQLite index of blocks, transactions and receipts.
+
+    :param path: (Optional) Path to the database, defaults to in-memory.
+    :param receipts: (Optional) Also index the receipts for each block.
+    :param codec: (Optional) JSON codec to store the DTOs.
+    :param depth: (Optional) Number of blocks below the chain height considered final.
+    """
+
+    __slots__ = (
+        '_connection',
+        '_receipts',
+        '_codec',
+        '_depth',
+    )
+
+    _connection: sqlite3.Connection
+    _receipts: bool
+    _codec: JSONCodec
+    _depth: int
+
+    def __init__(
+        self,
+        path: str = ':memory:',
+        receipts: bool = True,
+        codec: typing.Optional[JSONCodec] = None,
+        depth: int = DEPTH,
+    ) -> None:
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(SCHEMA)
+        self._receipts = receipts
+        self._codec = codec or DEFAULT_CODEC
+        self._depth = depth
+
+    def __enter__(self) -> ChainIndex:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database."""
+        self._connection.close()
+
+    @property
+    def height(self) -> int:
+        """Get the height of the last indexed block, or 0 if empty."""
+
+        value = self._get_meta('height')
+        return 0 if value is None else int(value)
+
+    @property
+    def network_type(self) -> typing.Optional[models.NetworkType]:
+        """Get the network type of the indexed chain."""
+
+        value = self._get_meta('network_type')
+        return None if value is None else models.NetworkType(int(value))
+
+    @property
+    def depth(self) -> int:
+        """Get number of blocks below the chain height considered final."""
+        return self._depth
+
+    # SYNC
+
+    def sync(
+        self,
+        http: abc.BlockchainHTTP,
+        end: typing.Optional[int] = None,
+        batch_size: int = BATCH_SIZE,
+        start: typing.Optional[int] = None,
+        **kwds
+    ) -> int:
+        """
+        Index all final blocks after the last indexed block.
+
+        :param http: Synchronous blockchain client.
+        :param end: (Optional) Height after the last block to index, defaults to the last final block.
+        :param batch_size: (Optional) Number of blocks committed at once.
+        :param start: (Optional) Height of the first block to index again, defaults to after the last indexed block.
+        :param kwds: (Optional) Keyword arguments for `iter_blocks`.
+        :return: Number of indexed blocks.
+        """
+
+        self._set_network_type(http.network_type)
+        start, end = self._sync_range(start, end, http.get_blockchain_height())
+        if start >= end:
+            return 0
+        iterator = http.iter_blocks(start, end, transactions=True, receipts=self._receipts, **kwds)
+        count = 0
+        batch: list = []
+        for item in iterator:
+            batch.append(item)
+            if len(batch) == batch_size:
+                count += self._write(batch)
+        return count + self._write(batch)
+
+    async def async_sync(
+        self,
+        http: abc.BlockchainHTTP,
+        end: typing.Optional[int] = None,
+        batch_size: int = BATCH_SIZE,
+        start: typing.Optional[int] = None,
+        **kwds
+    ) -> int:
+        """
+        Index all final blocks after the last indexed block.
+
+        :param http: Asynchronous blockchain client.
+        :param end: (Optional) Height after the last block to index, defaults to the last final block.
+        :param batch_size: (Optional) Number of blocks committed at once.
+        :param start: (Optional) Height of the first block to index again, defaults to after the last indexed block.
+        :param kwds: (Optional) Keyword arguments for `iter_blocks`.
+        :return: Number of indexed blocks.
+        """
+
+        self._set_network_type(await http.network_type)
+        start, end = self._sync_range(start, end, await http.get_blockchain_height())
+        if start >= end:
+            return 0
+        iterator = http.iter_blocks(start, end, transactions=True, receipts=self._receipts, **kwds)
+        count = 0
+        batch: list = []
+        async for item in iterator:
+            batch.append(item)
+            if len(batch) == batch_size:
+                count += self._write(batch)
+        return count + self._write(batch)
+
+    # QUERIES
+
+    def get_block(self, height: int) -> typing.Optional[models.BlockInfo]:
+        """
+        Get an indexed block by height.
+
+        :param height: Block height.
+        :return: Block information, or None if not indexed.
+        """
+
+        row = self._connection.execute('SELECT data FROM blocks WHERE height = ?', (height,)).fetchone()
+        return None if row is None else self._load(models.BlockInfo, row[0])
+
+    def get_blocks(self, start: int, end: int) -> typing.List[models.BlockInfo]:
+        """
+        Get the indexed blocks with heights in [start, end).
+
+        :param start: Height of the first block.
+        :param end: Height after the last block.
+        :return: Block information, in height order.
+        """
+
+        rows = self._connection.execute(
+            'SELECT data FROM blocks WHERE height >= ? AND height < ? ORDER BY height',
+            (start, end),
+        )
+        return [self._load(models.BlockInfo, i[0]) for i in rows]
+
+    def get_receipts(self, height: int) -> typing.Optional[models.Statements]:
+        """
+        Get the indexed receipts for a block.
+
+        :param height: Block height.
+        :return: Statements for the block, or None if not indexed.
+        """
+
+        row = self._connection.execute('SELECT data FROM receipts WHERE height = ?', (height,)).fetchone()
+        return None if row is None else self._load(models.Statements, row[0])
+
+    def get_transaction(self, hash: str) -> typing.Optional[models.Transaction]:
+        """
+        Get an indexed transaction by hash.
+
+        :param hash: Transaction hash.
+        :return: Transaction, or None if not indexed.
+        """
+
+        row = self._connection.execute(
+            'SELECT data FROM transactions WHERE hash = ?',
+            (hash.upper(),),
+        ).fetchone()
+        return None if row is None else self._load(models.Transaction, row[0])
+
+    def get_transactions(
+        self,
+        address: typing.Optional[AddressType] = None,
+        mosaic: typing.Optional[MosaicType] = None,
+        type: typing.Optional[TransactionTypeType] = None,
+        start: typing.Optional[int] = None,
+        end: typing.Optional[int] = None,
+        incoming: typing.Optional[bool] = None,
+        limit: typing.Optional[int] = None,
+    ) -> typing.List[models.Transaction]:
+        """
+        Get indexed transactions matching all the given filters.
+
+        Aggregate transactions match the filters of their inner transactions.
+
+        :param address: (Optional) Address signing or receiving the transaction.
+        :param mosaic: (Optional) Mosaic or mosaic alias referred to by the transaction.
+        :param type: (Optional) Transaction type.
+        :param start: (Optional) Height of the first block.
+        :param end: (Optional) Height after the last block.
+        :param incoming: (Optional) Only match `address` as recipient (True) or signer (False).
+        :param limit: (Optional) Maximum number of transactions.
+        :return: Transactions, in chain order.
+        """
+
+        heights = ''
+        bounds: list = []
+        if start is not None:
+            heights += ' AND height >= ?'
+            bounds.append(start)
+        if end is not None:
+            heights += ' AND height < ?'
+            bounds.append(end)
+
+        where = ['1' + heights]
+        params: list = list(bounds)
+        if address is not None:
+            clause = 'address = ?'
+            params.append(address_key(address))
+            if incoming is not None:
+                clause += ' AND incoming = ?'
+                params.append(int(incoming))
+            where.append(f'id IN (SELECT tx FROM transaction_addresses WHERE {clause}{heights})')
+            params += bounds
+        if mosaic is not None:
+            where.append(f'id IN (SELECT tx FROM transaction_mosaics WHERE mosaic = ?{heights})')
+            params += [mosaic_key(mosaic), *bounds]
+        if type is not None:
+            where.append(f'id IN (SELECT tx FROM transaction_types WHERE type = ?{heights})')
+            params += [int(type), *bounds]
+
+        query = f'SELECT data FROM transactions WHERE {" AND ".join(where)} ORDER BY height, position'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        rows = self._connection.execute(query, params)
+        return [self._load(models.Transaction, i[0]) for i in rows]
+
+    # HELPERS
+
+    def _get_meta(self, key: str) -> typing.Optional[str]:
+        row = self._connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def _set_network_type(self, network_type: models.NetworkType) -> None:
+        current = self.network_type
+        if current is None:
+            with self._connection:
+                self._connection.execute(
+                    'INSERT INTO meta (key, value) VALUES (?, ?)',
+                    ('network_type', str(int(network_type))),
+                )
+        elif current != network_type:
+            raise ValueError(f"Index contains {current.name}, not {network_type.name}.")
+
+    def _sync_range(
+        self,
+        start: typing.Optional[int],
+        end: typing.Optional[int],
+        height: int,
+    ) -> typing.Tuple[int, int]:
+        """Get the [start, end) heights to sync, stopping `depth` blocks below the chain height."""
+
+        if start is None:
+            start = self.height + 1
+        elif not 1 <= start <= self.height + 1:
+            raise ValueError(f"Cannot sync from {start}, the last indexed block is {self.height}.")
+        final = height - self._depth + 1
+        end = final if end is None else min(end, final)
+        return start, end
+
+    def _load(self, model, data: str):
+        return model.create_from_dto(self._codec.loads(data), self.network_type)
+
+    def _dumps(self, model) -> str:
+        return self._codec.dumps(model.to_dto(self.network_type))
+
+    def _write(self, batch: list) -> int:
+        """Write and commit a batch of `BlockData`, clearing the batch."""
+
+        if not batch:
+            return 0
+        count = len(batch)
+        with self._connection as db:
+            # Replace any blocks indexed from the first height onwards.
+            self._truncate(db, batch[0].block.height)
+            for item in batch:
+                self._write_block(db, item)
+            db.execute(
+                'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                ('height', str(batch[-1].block.height)),
+            )
+        batch.clear()
+        return count
+
+    def _truncate(self, db: sqlite3.Connection, height: int) -> None:
+        """Remove all indexed data from a height onwards."""
+
+        for table in TABLES:
+            db.execute(f'DELETE FROM {table} WHERE height >= ?', (height,))
+
+    def _write_block(self, db: sqlite3.Connection, item: abc.BlockData) -> None:
+        block = item.block
+        height = block.height
+        db.execute('INSERT INTO blocks (height, hash, data) VALUES (?, ?, ?)', (height, block.hash, self._dumps(block)))
+        if item.receipts is not None:
+            db.execute('INSERT INTO receipts (height, data) VALUES (?, ?)', (height, self._dumps(item.receipts)))
+
+        for position, transaction in enumerate(item.transactions or ()):
+            info = transaction.transaction_info
+            hash = getattr(info, 'hash', None)
+            cursor = db.execute(
+                'INSERT INTO transactions (hash, height, position, type, data) VALUES (?, ?, ?, ?, ?)',
+                (hash and hash.upper(), height, position, int(transaction.type), self._dumps(transaction)),
+            )
+            tx = cursor.lastrowid
+            addresses = set()
+            mosaics = set()
+            types = set()
+            for kind, value in transaction_entries(transaction):
+                if kind == 'type':
+                    types.add(value)
+                elif kind == 'mosaic':
+                    mosaics.add(value)
+                else:
+                    addresses.add((value, int(kind == 'recipient')))
+            db.executemany(
+                'INSERT INTO transaction_addresses (tx, height, address, incoming) VALUES (?, ?, ?, ?)',
+                [(tx, height, *i) for i in sorted(addresses)],
+            )
+            db.executemany(
+                'INSERT INTO transaction_mosaics (tx, height, mosaic) VALUES (?, ?, ?)',
+                [(tx, height, i) for i in sorted(mosaics)],
+            )
+            db.executemany(
+                'INSERT INTO transaction_types (tx, height, type) VALUES (?, ?, ?)',
+                [(tx, height, i) for i in sorted(types)],
+            )
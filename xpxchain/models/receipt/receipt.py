@@ -88,3 +88,4 @@ class Receipt(ReceiptBase):
         # Load shared data.
         cb_set('version')
         cb_set('type')
+        self._set('network_type', network_type)
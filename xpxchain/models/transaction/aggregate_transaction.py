@@ -28,7 +28,7 @@ import typing
 
 from .aggregate_transaction_cosignature import AggregateTransactionCosignature
 from .deadline import Deadline
-from .inner_transaction import InnerTransaction, InnerTransactionList
+from .inner_transaction import InnerTransaction, InnerTransactionList, LazyInnerTransactionList
 from .registry import register_transaction
 from .signed_transaction import SignedTransaction
 from .transaction import Transaction
@@ -66,9 +66,11 @@ class AggregateTransaction(Transaction):
     :param signature: (Optional) Transaction signature.
     :param signer: (Optional) Account of transaction creator.
     :param transaction_info: (Optional) Transaction metadata.
+    :param cosignatures: (Optional) Cosignatures appended to the signed transaction.
     """
 
     inner_transactions: InnerTransactionList
+    cosignatures: Cosignatures
 
     def __init__(
         self,
@@ -81,6 +83,7 @@ class AggregateTransaction(Transaction):
         signature: typing.Optional[str] = None,
         signer: typing.Optional[PublicAccount] = None,
         transaction_info: typing.Optional[TransactionInfo] = None,
+        cosignatures: typing.Optional[Cosignatures] = None,
     ) -> None:
         if type not in TYPES:
             raise ValueError('Invalid transaction type.')
@@ -95,6 +98,7 @@ class AggregateTransaction(Transaction):
             transaction_info,
         )
         self._set('inner_transactions', inner_transactions or [])
+        self._set('cosignatures', cosignatures or [])
 
     @classmethod
     def create_complete(
@@ -150,29 +154,23 @@ class AggregateTransaction(Transaction):
 
     # SIGNING
 
-#    def sign_with(
-#        self,
-#        account: Account,
-#        gen_hash: typing.AnyStr
-#    ) -> SignedTransaction:
-#        """
-#        Sign transaction.
-#
-#        :param account: Escrow account.
-#        :param gen_hash: Generation hash
-#        """
-#
-#        transaction = self.to_catbuffer()
-#        payload = account.sign(transaction, gen_hash)
-#        hash = self.transaction_hash(payload, gen_hash)
-#
-#        return SignedTransaction(
-#            payload,
-#            hash,
-#            account.public_key,
-#            self.type,
-#            self.network_type
-#        )
+    def sign_with(
+        self,
+        account: Account,
+        gen_hash: typing.AnyStr,
+        fee_strategy: util.FeeCalculationStrategy = util.FeeCalculationStrategy.MEDIUM,
+    ) -> SignedTransaction:
+        return self.sign_transaction_with_cosignatories(account, gen_hash, None, fee_strategy)
+
+    @staticmethod
+    def transaction_hash(transaction: typing.AnyStr, gen_hash: typing.AnyStr) -> str:
+        # Cosignatures are not signed, so only the data up to the end
+        # of the inner transactions is hashed.
+        transaction = util.decode_hex(transaction, with_prefix=True)
+        offset = Transaction.catbuffer_size_shared()
+        payload_size = util.u32_from_catbuffer(transaction[offset:offset + util.U32_BYTES])
+        end = offset + util.U32_BYTES + payload_size
+        return Transaction.transaction_hash(transaction[:end], gen_hash)
 
     def sign_transaction_with_cosignatories(
         self,
@@ -184,18 +182,25 @@ class AggregateTransaction(Transaction):
         """
         Sign transaction with cosignatories.
 
+        Cosignatures are not signed, existing and new cosignatures are
+        only appended to the announced payload.
+
         :param initiator_account: Initiator account.
         :param gen_hash: Generation hash
         :param cosignatories: Sequence of accounts cosigning transaction.
         """
 
-        transaction = self.to_catbuffer(fee_strategy=fee_strategy)
+        cosignatories = cosignatories or []
+        unsigned = self.replace(cosignatures=[]) if self.cosignatures else self
+        transaction = unsigned.to_catbuffer(fee_strategy=fee_strategy)
+        if unsigned.max_fee != self.max_fee:
+            self._set('max_fee', unsigned.max_fee)
 
-        if (cosignatories):
-            COSIGNATURE_SIZE = 96
+        count = len(self.cosignatures) + len(cosignatories)
+        if count:
             new_fee = util.calculate_fee(
                 fee_strategy,
-                self.catbuffer_size() + COSIGNATURE_SIZE * len(cosignatories),
+                unsigned.catbuffer_size() + Cosignature.CATBUFFER_SIZE * count,
                 self.max_fee,
             )
 
@@ -205,7 +210,8 @@ class AggregateTransaction(Transaction):
         payload = initiator.sign(transaction, gen_hash)  # type: ignore
         hash = self.transaction_hash(payload, gen_hash)  # type: ignore
 
-        if (cosignatories):
+        if count:
+            payload += Cosignature.sequence_to_catbuffer(self.cosignatures, self.network_type)
             for cosignatory in cosignatories:
                 payload += util.decode_hex(cosignatory.public_key)
                 payload += cosignatory.sign_data(hash)
@@ -230,6 +236,12 @@ class AggregateTransaction(Transaction):
 
     def inner_transactions_size(self) -> int:
         """Get payload size, the size in bytes of all sub-transactions."""
+
+        if isinstance(self.inner_transactions, LazyInnerTransactionList):
+            return self.inner_transactions.nbytes
+        return typing.cast(int, self._cached('inner_size', self._inner_transactions_size))
+
+    def _inner_transactions_size(self) -> int:
         return sum(i.catbuffer_size() for i in self.inner_transactions)
 
     def catbuffer_size_specific(self) -> int:
@@ -237,7 +249,8 @@ class AggregateTransaction(Transaction):
         # The payload size is the size from all inner transactions.
         extra_size = util.U32_BYTES
         payload_size = self.inner_transactions_size()
-        return extra_size + payload_size
+        cosignatures_size = Cosignature.CATBUFFER_SIZE * len(self.cosignatures)
+        return extra_size + payload_size + cosignatures_size
 
     def to_inner_transactions_bytes(
         self,
@@ -245,6 +258,9 @@ class AggregateTransaction(Transaction):
     ) -> bytes:
         """Get the serialized byte array of all sub-transactions."""
 
+        # Undecoded inner transactions are saved as-is.
+        if isinstance(self.inner_transactions, LazyInnerTransactionList):
+            return self.inner_transactions.to_catbuffer()
         return util.Model.sequence_to_catbuffer(
             self.inner_transactions,
             network_type
@@ -258,20 +274,38 @@ class AggregateTransaction(Transaction):
 
         # uint32_t payload_size
         # uint8_t[payload_size] transactions
+        # AggregateTransactionCosignature[] cosignatures
         payload_size = util.u32_to_catbuffer(self.inner_transactions_size())
         transactions = self.to_inner_transactions_bytes(network_type)
-        return payload_size + transactions
+        cosignatures = Cosignature.sequence_to_catbuffer(self.cosignatures, network_type)
+        return payload_size + transactions + cosignatures
 
     def load_inner_transactions_bytes(
         self,
         data: bytes,
         size: int,
         network_type: NetworkType,
+        lazy: bool = False,
     ) -> bytes:
-        """Load inner transactions data from catbuffer."""
+        """
+        Load inner transactions data from catbuffer.
+
+        :param data: Inner transactions data, and any following data.
+        :param size: Size in bytes of all inner transactions.
+        :param network_type: Network type.
+        :param lazy: (Optional) Decode each inner transaction on first access.
+        """
+
+        # Slicing the view moves the cursor without copying the data.
+        view = memoryview(data)
+        if len(view) < size:
+            raise ValueError('Insufficient data to deserialize inner transactions.')
+        if lazy:
+            self._set('inner_transactions', LazyInnerTransactionList(view[:size], network_type))
+            return view[size:]
 
         transactions = []
-        subdata = data[:size]
+        subdata = view[:size]
         while subdata:
             # This will hard-error if the transaction is invalid,
             # or cut-off, since every deserializer checks the input
@@ -281,16 +315,39 @@ class AggregateTransaction(Transaction):
                 network_type
             )
             transactions.append(value)
-        return data[size:]
+        self._set('inner_transactions', transactions)
+        return view[size:]
 
     def load_catbuffer_specific(
         self,
         data: bytes,
         network_type: NetworkType,
+        lazy: bool = False,
     ) -> bytes:
-        """Load transfer-specific data data from catbuffer."""
+        """
+        Load aggregate-specific data data from catbuffer.
 
-        raise NotImplementedError
+        Any data after the inner transactions is loaded as cosignatures,
+        since the data is bounded by the transaction size.
+
+        :param data: Aggregate-specific data in catbuffer interchange format.
+        :param network_type: Network type.
+        :param lazy: (Optional) Decode each inner transaction on first access.
+        """
+
+        # uint32_t payload_size
+        # uint8_t[payload_size] transactions
+        # AggregateTransactionCosignature[] cosignatures
+        payload_size = util.u32_from_catbuffer(data[:util.U32_BYTES])
+        data = data[util.U32_BYTES:]
+        data = self.load_inner_transactions_bytes(data, payload_size, network_type, lazy)
+        count, extra = divmod(len(data), Cosignature.CATBUFFER_SIZE)
+        if extra:
+            raise ValueError('Invalid cosignatures data size.')
+        cosignatures, data = Cosignature.sequence_from_catbuffer_pair(data, count, network_type)
+        self._set('cosignatures', cosignatures)
+
+        return data
 
     # DTO
 
@@ -303,16 +360,21 @@ class AggregateTransaction(Transaction):
         self,
         network_type: NetworkType,
     ) -> dict:
-        raise NotImplementedError
+        return {
+            'transactions': [i.to_dto(network_type) for i in self.inner_transactions],
+            'cosignatures': [i.to_dto(network_type) for i in self.cosignatures],
+        }
 
     def load_dto_specific(
         self,
         data: dict,
         network_type: NetworkType,
     ) -> None:
-        inner_transactions = [InnerTransaction.create_from_dto(x, network_type) for x in data['transactions']]
+        inner_transactions = InnerTransaction.sequence_from_dto_fast(data['transactions'], network_type)
+        cosignatures = [Cosignature.create_from_dto(x, network_type) for x in data.get('cosignatures', [])]
 
         self._set('inner_transactions', inner_transactions)
+        self._set('cosignatures', cosignatures)
 
 
 @util.inherit_doc
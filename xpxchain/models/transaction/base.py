@@ -39,11 +39,49 @@ from ... import util
 TransactionInfoType = typing.Union[TransactionInfo, AggregateTransactionInfo]
 TransactionBaseType = typing.TypeVar('TransactionBaseType', bound='TransactionBase')
 TypeMap = typing.Mapping[TransactionType, typing.Type[TransactionBaseType]]
+RawTypeMap = typing.Dict[int, typing.Type[TransactionBaseType]]
+SignerCache = typing.Dict[str, PublicAccount]
+
+
+class CachedModel(util.Model):
+    """
+    Model memoizing values computed from its fields.
+
+    Models are frozen, so the cache is invalidated by creating a new
+    model (`replace`, `copy`), or by setting a field internally with
+    `_set`. The cache is not a field.
+
+    Models must be treated as immutable: sequence fields, such as
+    `mosaics` or `inner_transactions`, must not be modified in place,
+    since the memoized values are not invalidated. Use `replace` instead.
+    """
+
+    __slots__ = ('_cache',)
+
+    def _set(self, key: str, value: typing.Any) -> None:
+        """Set a field, clearing the memoized values. Internal use only."""
+
+        object.__setattr__(self, key, value)
+        if getattr(self, '_cache', None):
+            object.__setattr__(self, '_cache', None)
+
+    def _cached(self, key: typing.Hashable, compute: typing.Callable[[], typing.Any]):
+        """Get a memoized value computed from the fields. Internal use only."""
+
+        cache = getattr(self, '_cache', None)
+        if cache is None:
+            cache = {}
+            object.__setattr__(self, '_cache', cache)
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = compute()
+            return value
 
 
 @util.inherit_doc
 @util.dataclass(frozen=True)
-class TransactionBase(util.Model):
+class TransactionBase(CachedModel):
     """
     Abstract, shared transaction base class.
 
@@ -76,6 +114,9 @@ class TransactionBase(util.Model):
     # register custom models to customize serialization/deserialization
     # logic.
     TYPE_MAP: typing.ClassVar[TypeMap]
+    # Same registry, by the raw transaction type, for fast lookups
+    # while deserializing.
+    RAW_TYPE_MAP: typing.ClassVar[RawTypeMap]
 
     # Data to simplify the serialization/deserialization of
     # transactions of a given type. Stores pre-computed
@@ -124,6 +165,9 @@ class TransactionBase(util.Model):
 
     def catbuffer_size(self) -> int:
         """Get the total size of the entity. Internal use only."""
+        return typing.cast(int, self._cached('size', self._catbuffer_size))
+
+    def _catbuffer_size(self) -> int:
         shared = self.catbuffer_size_shared()
         specific = self.catbuffer_size_specific()
         return shared + specific
@@ -151,14 +195,19 @@ class TransactionBase(util.Model):
         if network_type is not None and network_type != self.network_type:
             raise ValueError('Network type does not match transaction.')
 
-        # Use fee calculation algorithm
-        max_fee = util.calculate_fee(fee_strategy, self.catbuffer_size(), self.max_fee)
-        self._set('max_fee', max_fee)
+        # Use fee calculation algorithm, embedded transactions have no fee.
+        if self.max_fee is not None:
+            max_fee = util.calculate_fee(fee_strategy, self.catbuffer_size(), self.max_fee)
+            if max_fee != self.max_fee:
+                self._set('max_fee', max_fee)
 
-        # Save shared and specific transaction data.
-        shared = self.to_catbuffer_shared(self.network_type)
-        specific = self.to_catbuffer_specific(self.network_type)
+        # Save shared and specific transaction data, only the shared
+        # data depends on the max fee.
+        return typing.cast(bytes, self._cached(('catbuffer', self.max_fee), self._to_catbuffer))
 
+    def _to_catbuffer(self) -> bytes:
+        shared = self.to_catbuffer_shared(self.network_type)
+        specific = self._cached('catbuffer_specific', lambda: self.to_catbuffer_specific(self.network_type))
         return shared + specific
 
     def load_catbuffer_shared(
@@ -182,15 +231,17 @@ class TransactionBase(util.Model):
         cls: typing.Type[TransactionBaseType],
         data: typing.AnyStr,
         network_type: OptionalNetworkType = None,
+        **kwds,
     ) -> TransactionBaseType:
-        return cls.create_from_catbuffer_pair(data, network_type)[0]
+        return cls.create_from_catbuffer_pair(data, network_type, **kwds)[0]
 
     @classmethod
     def create_from_catbuffer_pair(
         cls: typing.Type[TransactionBaseType],
         data: typing.AnyStr,
         network_type: OptionalNetworkType = None,
-    ) -> typing.Tuple[TransactionBaseType, bytes]:
+        **kwds,
+    ) -> typing.Tuple[TransactionBaseType, typing.Union[bytes, memoryview]]:
         """
         Deserialize object from catbuffer interchange format.
 
@@ -200,32 +251,41 @@ class TransactionBase(util.Model):
         (and therefore a finalized transaction model), use the
         class directly.
 
+        Data is parsed through a `memoryview`, so loading many transactions
+        from a single buffer does not copy the remaining data at each step.
+        The leftover data is a `memoryview` if `data` is a `memoryview`,
+        otherwise, it is `bytes`.
+
         :param data: Transaction data in catbuffer interchange format.
         :param network_type: Network type.
+        :param kwds: (Optional) Transaction-specific load options.
         """
 
         # Decode the data and check initial parameters.
         data = util.decode_hex(data, with_prefix=True)
-        if len(data) < cls.catbuffer_size_shared():
+        is_view = isinstance(data, memoryview)
+        view = data if is_view else memoryview(data)
+        if len(view) < cls.catbuffer_size_shared():
             raise ValueError('Insufficient data to deserialize transaction.')
 
         # If we have a base class, find the correct derived class.
         if cls in TransactionBase.__subclasses__():
-            cls = cls.CATBUFFER.find_transaction(cls.TYPE_MAP, data)
+            cls = cls.CATBUFFER.find_transaction(cls.TYPE_MAP, view)
         inst = typing.cast(TransactionBaseType, cls.__new__(cls))
 
         # Load the network type and the total size and check transaction data.
-        size = cls.CATBUFFER.load_size(data)
-        nt = cls.CATBUFFER.load_network_type(data)
+        size = cls.CATBUFFER.load_size(view)
+        nt = cls.CATBUFFER.load_network_type(view)
         if network_type is not None and network_type != nt:
             raise ValueError('Network type does not match transaction.')
-        if len(data) < size:
+        if len(view) < size:
             raise ValueError('Transaction data shorter than entity size.')
 
-        # Load shared and specific transaction data.
-        data = inst.load_catbuffer_shared(data, nt)
-        data = inst.load_catbuffer_specific(data, nt)
-        return inst, data
+        # Load shared and specific transaction data, bounded by the entity size.
+        remaining = view[size:]
+        view = inst.load_catbuffer_shared(view[:size], nt)
+        inst.load_catbuffer_specific(view, nt, **kwds)
+        return inst, remaining if is_view else remaining.tobytes()
 
     # DTO
 
@@ -283,8 +343,15 @@ class TransactionBase(util.Model):
         self,
         data: dict,
         network_type: NetworkType,
+        accounts: typing.Optional[SignerCache] = None,
     ) -> None:
-        """Load shared transaction data from DTO. Internal use only."""
+        """
+        Load shared transaction data from DTO. Internal use only.
+
+        :param data: Transaction data in DTO interchange format.
+        :param network_type: Network type.
+        :param accounts: (Optional) Signer accounts by public key, shared between transactions.
+        """
         raise util.AbstractMethodError
 
     def load_dto_specific(
@@ -332,3 +399,54 @@ class TransactionBase(util.Model):
         inst.load_dto_shared(data, nt)
         inst.load_dto_specific(data['transaction'], nt)
         return inst
+
+    @classmethod
+    def sequence_from_dto_fast(
+        cls: typing.Type[TransactionBaseType],
+        sequence: typing.Sequence[dict],
+        network_type: OptionalNetworkType = None,
+        trusted: bool = False,
+        accounts: typing.Optional[SignerCache] = None,
+    ) -> typing.List[TransactionBaseType]:
+        """
+        Deserialize list of objects from DTO interchange format.
+
+        Equivalent to `sequence_from_dto`, but the derived classes are
+        looked up from the raw transaction type, and signers with the
+        same public key share a single account.
+
+        :param sequence: Sequence of transaction data in DTO interchange format.
+        :param network_type: (Optional) Network type.
+        :param trusted: (Optional) Skip validating the data-transfer objects.
+        :param accounts: (Optional) Signer accounts by public key, to share between calls.
+        """
+
+        derived = cls in TransactionBase.__subclasses__()
+        types = cls.RAW_TYPE_MAP
+        if accounts is None:
+            accounts = {}
+
+        result = []
+        for data in sequence:
+            transaction = data['transaction']
+            if derived:
+                try:
+                    item_cls = types[transaction['type']]
+                except KeyError:
+                    raise ValueError('Invalid data-transfer object.')
+            else:
+                item_cls = cls
+            inst = typing.cast(TransactionBaseType, item_cls.__new__(item_cls))
+
+            if not trusted and not item_cls.validate_dto(data):
+                raise ValueError('Invalid data-transfer object.')
+
+            nt = NetworkType((transaction['version'] >> 24) & 0xFF)
+            if network_type is not None and network_type != nt:
+                raise ValueError('Network type does not match transaction.')
+
+            inst.load_dto_shared(data, nt, accounts)
+            inst.load_dto_specific(transaction, nt)
+            result.append(inst)
+
+        return result
@@ -23,6 +23,7 @@
 """
 
 from __future__ import annotations
+import struct
 import typing
 
 from .aggregate_transaction_info import AggregateTransactionInfo
@@ -105,6 +106,44 @@ class DTOFormat(FormatBase):
             return cb(value, network_type)
 
 
+# HEADER HELPERS
+
+# Fields stored as raw bytes, rather than as little-endian integers.
+BYTES_FIELDS = frozenset({'signature', 'signer'})
+INTEGER_FORMATS = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+HeaderField = typing.Union[str, typing.Tuple[str, ...]]
+
+
+def compile_header(
+    slices: typing.Dict[str, slice],
+    fields: typing.Sequence[HeaderField],
+) -> struct.Struct:
+    """
+    Compile the struct to pack or unpack consecutive header fields at once.
+
+    :param slices: Catbuffer slices for each field.
+    :param fields: Fields in layout order. Fields in a tuple are packed as a single integer.
+    :return: Little-endian struct for the fields.
+    """
+
+    codes = ['<']
+    offset = 0
+    for field in fields:
+        names = (field,) if isinstance(field, str) else field
+        for name in names:
+            slc = slices[name]
+            if slc.start != offset:
+                raise ValueError(f'Header field {name} is not contiguous.')
+            offset = slc.stop
+        width = offset - slices[names[0]].start
+        if names[0] in BYTES_FIELDS:
+            codes.append(f'{width}s')
+        else:
+            codes.append(INTEGER_FORMATS[width])
+    return struct.Struct(''.join(codes))
+
+
 # CATBUFFER HELPERS
 
 
@@ -194,6 +233,18 @@ def load_signer_dto(data, network_type):
     return PublicAccount.create_from_public_key(data, network_type)
 
 
+def load_shared_signer_dto(data, network_type, accounts):
+    """Load the signer, reusing the account for known public keys."""
+
+    public_key = data['transaction'].get('signer')
+    if public_key is None:
+        return None
+    signer = accounts.get(public_key)
+    if signer is None:
+        signer = accounts[public_key] = load_signer_dto(public_key, network_type)
+    return signer
+
+
 def load_version_dto(data, network_type):
     # Version are 3B
     return data & 0xFFFFFF
@@ -24,15 +24,22 @@
 
 from __future__ import annotations
 import bidict
+import collections.abc
+import struct
 import typing
 
-from .base import TransactionBase, TypeMap
-from .format import CatbufferFormat, DTOFormat
+from .base import RawTypeMap, SignerCache, TransactionBase, TypeMap
+from .format import CatbufferFormat, DTOFormat, compile_header, load_shared_signer_dto
+from .transaction_type import TransactionType
+from .transaction_version import TransactionVersion
 from ..account.public_account import PublicAccount
 from ..blockchain.network_type import NetworkType
 from ... import util
 
-__all__ = ['InnerTransaction']
+__all__ = [
+    'InnerTransaction',
+    'LazyInnerTransactionList',
+]
 
 # We need 3 different transaction base types for `create_from_transaction`.
 T1 = typing.TypeVar('T1', bound='TransactionBase')
@@ -47,6 +54,7 @@ class InnerTransaction(TransactionBase):
     __slots__ = ()
     # Overridable classvars.
     TYPE_MAP: typing.ClassVar[TypeMap] = bidict.bidict()
+    RAW_TYPE_MAP: typing.ClassVar[RawTypeMap] = {}
     CATBUFFER: typing.ClassVar[CatbufferFormat] = CatbufferFormat(
         # Layout
         #   uint32_t size
@@ -63,6 +71,14 @@ class InnerTransaction(TransactionBase):
         },
         size_shared=42,
     )
+    # Struct for the shared fields, with version and network type
+    # packed as a single integer.
+    HEADER: typing.ClassVar[struct.Struct] = compile_header(CATBUFFER.slices, (
+        'size',
+        'signer',
+        ('version', 'network_type'),
+        'type',
+    ))
     DTO: typing.ClassVar[DTOFormat] = DTOFormat(
         names={
             'signer': 'signer',
@@ -99,40 +115,37 @@ class InnerTransaction(TransactionBase):
         self,
         network_type: NetworkType,
     ) -> bytes:
-        # Shared data and callbacks.
-        data = bytearray(self.catbuffer_size_shared())
-        cb = lambda k, v: self.CATBUFFER.save(k, data, v, network_type)
-        cb_get = lambda k: cb(k, getattr(self, k))
-
-        # Save shared data.
-        cb('size', self.catbuffer_size())
-        cb_get('signer')
-        cb_get('version')
-        cb_get('network_type')
-        cb_get('type')
-
-        return bytes(data)
+        signer = self.signer
+        return self.HEADER.pack(
+            self.catbuffer_size(),
+            bytes(32) if signer is None else util.unhexlify(signer.public_key),
+            int(self.version) | (int(network_type) << 24),
+            int(self.type),
+        )
 
     def load_catbuffer_shared(
         self,
         data: bytes,
         network_type: NetworkType,
     ) -> bytes:
-        # Shared data and callbacks.
-        cb = lambda k: self.CATBUFFER.load(k, data, network_type)
-        cb_set = lambda k: self._set(k, cb(k))
+        size, signer, version, type = self.HEADER.unpack_from(data)
+
+        # Empty signers are stored as null bytes.
+        if signer == bytes(32):
+            signer = None
+        else:
+            signer = PublicAccount.create_from_public_key(signer, network_type)
 
-        # Load shared data.
         self._set('signature', None)
-        cb_set('signer')
-        cb_set('version')
+        self._set('signer', signer)
+        self._set('version', TransactionVersion(version & 0xFFFFFF))
         self._set('network_type', network_type)
-        cb_set('type')
+        self._set('type', TransactionType(type))
         self._set('max_fee', None)
         self._set('deadline', None)
         self._set('transaction_info', None)
 
-        return data[self.catbuffer_size_shared():]
+        return data[self.HEADER.size:]
 
     # DTO
 
@@ -154,9 +167,10 @@ class InnerTransaction(TransactionBase):
         cb_get = lambda k: cb(k, getattr(self, k))
 
         # Save shared data.
+        # Do not export `network_type`, already exported
+        # with version.
         cb_get('signer')
         cb_get('version')
-        cb_get('network_type')
         cb_get('type')
         cb_get('transaction_info')
 
@@ -166,6 +180,7 @@ class InnerTransaction(TransactionBase):
         self,
         data: dict,
         network_type: NetworkType,
+        accounts: typing.Optional[SignerCache] = None,
     ) -> None:
         # Shared data and callbacks.
         cb = lambda k: self.DTO.load(k, data, network_type)
@@ -173,7 +188,10 @@ class InnerTransaction(TransactionBase):
 
         # Load shared data.
         self._set('signature', None)
-        cb_set('signer')
+        if accounts is None:
+            cb_set('signer')
+        else:
+            self._set('signer', load_shared_signer_dto(data, network_type, accounts))
         cb_set('version')
         self._set('network_type', network_type)
         cb_set('type')
@@ -182,4 +200,94 @@ class InnerTransaction(TransactionBase):
         self._set('transaction_info', None)
 
 
+class LazyInnerTransactionList(collections.abc.Sequence):
+    """
+    Sequence of inner transactions decoded on first access.
+
+    Only the size prefix of each transaction is read upfront, each
+    transaction is decoded from its slice of the buffer, without copying,
+    when first accessed.
+
+    :param data: Inner transactions data in catbuffer interchange format.
+    :param network_type: Network type.
+    """
+
+    __slots__ = (
+        '_data',
+        '_network_type',
+        '_offsets',
+        '_transactions',
+    )
+
+    _data: memoryview
+    _network_type: NetworkType
+    _offsets: typing.List[int]
+    _transactions: typing.List[typing.Optional[InnerTransaction]]
+
+    def __init__(self, data: typing.Union[bytes, memoryview], network_type: NetworkType) -> None:
+        view = memoryview(data)
+        offsets = [0]
+        shared_size = InnerTransaction.catbuffer_size_shared()
+        while offsets[-1] < len(view):
+            offset = offsets[-1]
+            size = InnerTransaction.CATBUFFER.load_size(view[offset:offset + shared_size])
+            if size < shared_size or offset + size > len(view):
+                raise ValueError('Transaction data shorter than entity size.')
+            offsets.append(offset + size)
+
+        self._data = view
+        self._network_type = network_type
+        self._offsets = offsets
+        self._transactions = [None] * (len(offsets) - 1)
+
+    def __len__(self) -> int:
+        return len(self._transactions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Inner transaction index out of range.')
+        transaction = self._transactions[index]
+        if transaction is None:
+            data = self.raw(index)
+            transaction = InnerTransaction.create_from_catbuffer(data, self._network_type)
+            self._transactions[index] = transaction
+        return transaction
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyInnerTransactionList) and self._data == other._data:
+            return True
+        if not isinstance(other, collections.abc.Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(size={len(self)}, decoded={self.decoded})'
+
+    @property
+    def decoded(self) -> int:
+        """Get the number of decoded transactions."""
+        return len(self._transactions) - self._transactions.count(None)
+
+    @property
+    def nbytes(self) -> int:
+        """Get the size in bytes of all transactions."""
+        return len(self._data)
+
+    def raw(self, index: int) -> memoryview:
+        """
+        Get the undecoded data for a single transaction.
+
+        :param index: Index of the transaction.
+        """
+        return self._data[self._offsets[index]:self._offsets[index + 1]]
+
+    def to_catbuffer(self) -> bytes:
+        """Get the data of all transactions, without encoding them."""
+        return self._data.tobytes()
+
+
 InnerTransactionList = typing.Sequence[InnerTransaction]
@@ -178,7 +178,7 @@ class LockFundsTransaction(Transaction):
         mosaic, data = Mosaic.create_from_catbuffer_pair(data, network_type)
         duration = util.u64_from_catbuffer(data[:util.U64_BYTES])
         data = data[util.U64_BYTES:]
-        hash = data[:util.U8_BYTES * 32]
+        hash = bytes(data[:util.U8_BYTES * 32])
         data = data[util.U8_BYTES * 32:]
         signed_transaction = SignedTransaction.create_from_announced(
             hash,
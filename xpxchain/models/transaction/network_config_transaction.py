@@ -170,9 +170,9 @@ class NetworkConfigTransaction(Transaction):
         data = data[util.U16_BYTES:]
         supported_entity_versions_size = util.u16_from_catbuffer(data[:util.U16_BYTES])
         data = data[util.U16_BYTES:]
-        network_config = data[:network_config_size].decode('utf-8')
+        network_config = bytes(data[:network_config_size]).decode('utf-8')
         data = data[:network_config_size]
-        supported_entity_versions = data[:supported_entity_versions_size].decode('utf-8')
+        supported_entity_versions = bytes(data[:supported_entity_versions_size]).decode('utf-8')
         data = data[:supported_entity_versions_size]
 
         self._set('apply_height_delta', apply_height_delta)
@@ -242,7 +242,7 @@ class RegisterNamespaceTransaction(Transaction):
         namespace_id = NamespaceId(util.u64_from_catbuffer(data[8:16]))
         namespace_name_size = util.u8_from_catbuffer(data[16:17])
         data = data[17:]
-        namespace_name = data[:namespace_name_size].decode('ascii')
+        namespace_name = bytes(data[:namespace_name_size]).decode('ascii')
         data = data[namespace_name_size:]
 
         self._set('namespace_type', namespace_type)
@@ -34,6 +34,7 @@ def register_transaction(name: str):
 
     def decorator(cls):
         cls.TYPE_MAP[type] = cls
+        cls.RAW_TYPE_MAP[int(type)] = cls
         return cls
 
     return decorator
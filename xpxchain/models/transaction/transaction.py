@@ -24,12 +24,16 @@
 
 from __future__ import annotations
 import bidict
+import struct
 import typing
 
-from .base import TransactionBase, TypeMap
-from .format import CatbufferFormat, DTOFormat
+from .base import RawTypeMap, SignerCache, TransactionBase, TypeMap
+from .deadline import Deadline
+from .format import CatbufferFormat, DTOFormat, compile_header, load_shared_signer_dto
 from .inner_transaction import InnerTransaction
 from .signed_transaction import SignedTransaction
+from .transaction_type import TransactionType
+from .transaction_version import TransactionVersion
 from ..account.account import Account
 from ..account.public_account import PublicAccount
 from ..blockchain.network_type import NetworkType
@@ -45,6 +49,7 @@ class Transaction(TransactionBase):
     __slots__ = ()
     # Overridable classvars.
     TYPE_MAP: typing.ClassVar[TypeMap] = bidict.bidict()
+    RAW_TYPE_MAP: typing.ClassVar[RawTypeMap] = {}
     CATBUFFER: typing.ClassVar[CatbufferFormat] = CatbufferFormat(
         # Layout
         #   uint32_t size
@@ -71,6 +76,17 @@ class Transaction(TransactionBase):
         },
         size_shared=122,
     )
+    # Struct for the shared fields, with version and network type
+    # packed as a single integer.
+    HEADER: typing.ClassVar[struct.Struct] = compile_header(CATBUFFER.slices, (
+        'size',
+        'signature',
+        'signer',
+        ('version', 'network_type'),
+        'type',
+        'max_fee',
+        'deadline',
+    ))
     DTO: typing.ClassVar[DTOFormat] = DTOFormat(
         names={
             'signature': 'signature',
@@ -162,43 +178,45 @@ class Transaction(TransactionBase):
         self,
         network_type: NetworkType,
     ) -> bytes:
-        # Shared data and callbacks.
-        data = bytearray(self.catbuffer_size_shared())
-        cb = lambda k, v: self.CATBUFFER.save(k, data, v, network_type)
-        cb_get = lambda k: cb(k, getattr(self, k))
-
-        # Save shared data.
-        cb('size', self.catbuffer_size())
-        cb_get('signature')
-        cb_get('signer')
-        cb_get('version')
-        cb_get('network_type')
-        cb_get('type')
-        cb_get('max_fee')
-        cb_get('deadline')
-
-        return bytes(data)
+        signature = self.signature
+        signer = self.signer
+        return self.HEADER.pack(
+            self.catbuffer_size(),
+            bytes(64) if signature is None else util.unhexlify(signature),
+            bytes(32) if signer is None else util.unhexlify(signer.public_key),
+            int(self.version) | (int(network_type) << 24),
+            int(self.type),
+            self.max_fee,
+            self.deadline.to_timestamp(),
+        )
 
     def load_catbuffer_shared(
         self,
         data: bytes,
         network_type: NetworkType,
     ) -> bytes:
-        # Shared data and callbacks.
-        cb = lambda k: self.CATBUFFER.load(k, data, network_type)
-        cb_set = lambda k: self._set(k, cb(k))
-
-        # Load shared data.
-        cb_set('signature')
-        cb_set('signer')
-        cb_set('version')
+        size, signature, signer, version, type, max_fee, deadline = self.HEADER.unpack_from(data)
+
+        # Empty signatures and signers are stored as null bytes.
+        if signature == bytes(64):
+            signature = None
+        else:
+            signature = util.hexlify(signature)
+        if signer == bytes(32):
+            signer = None
+        else:
+            signer = PublicAccount.create_from_public_key(signer, network_type)
+
+        self._set('signature', signature)
+        self._set('signer', signer)
+        self._set('version', TransactionVersion(version & 0xFFFFFF))
         self._set('network_type', network_type)
-        cb_set('type')
-        cb_set('max_fee')
-        cb_set('deadline')
+        self._set('type', TransactionType(type))
+        self._set('max_fee', max_fee)
+        self._set('deadline', Deadline.create_from_timestamp(deadline))
         self._set('transaction_info', None)
 
-        return data[self.catbuffer_size_shared():]
+        return data[self.HEADER.size:]
 
     # DTO
 
@@ -236,6 +254,7 @@ class Transaction(TransactionBase):
         self,
         data: dict,
         network_type: NetworkType,
+        accounts: typing.Optional[SignerCache] = None,
     ) -> None:
         # Shared data and callbacks.
         cb = lambda k: self.DTO.load(k, data, network_type)
@@ -243,7 +262,10 @@ class Transaction(TransactionBase):
 
         # Load shared data.
         cb_set('signature')
-        cb_set('signer')
+        if accounts is None:
+            cb_set('signer')
+        else:
+            self._set('signer', load_shared_signer_dto(data, network_type, accounts))
         cb_set('version')
         self._set('network_type', network_type)
         cb_set('type')
@@ -197,7 +197,7 @@ class TransferTransaction(Transaction):
         data = data[util.U16_BYTES:]
         mosaics_count = util.u8_from_catbuffer(data[:util.U8_BYTES])
         data = data[util.U8_BYTES:]
-        message = PlainMessage(data[1:message_size])
+        message = PlainMessage(bytes(data[1:message_size]))
         data = data[message_size:]
         data = self.load_mosaics_bytes(data, mosaics_count, network_type)
 
@@ -316,7 +316,8 @@ def set_replace(
 def set_miscellaneous(cls: typing.Type, clsdict: Vars) -> None:
     """Set miscellaneous data for the class."""
 
-    clsdict['_set'] = object.__setattr__
+    # Keep any `_set` override from the class or its bases.
+    clsdict.setdefault('_set', getattr(cls, '_set', object.__setattr__))
 
 
 # DATACLASS METACLASS
@@ -414,6 +415,7 @@ def update_classvars(cls: typing.Type, new_cls: typing.Type) -> None:
     # We're going to cheat, since this is a painfully long process.
     # We know the only classvars that can be present are in:
     #   1. TYPE_MAP
+    #   2. RAW_TYPE_MAP
 
     # Mapping of transaction type to transactions.
     # We use a bidict to get O(1) inverse lookup times.
@@ -421,6 +423,9 @@ def update_classvars(cls: typing.Type, new_cls: typing.Type) -> None:
     if type_map is not None and cls in type_map.inverse:
         type = type_map.inverse.pop(cls)
         type_map[type] = new_cls
+        raw_type_map = getattr(cls, 'RAW_TYPE_MAP', None)
+        if raw_type_map is not None:
+            raw_type_map[int(type)] = new_cls
 
 
 def update_closure(cls: typing.Type, new_cls: typing.Type) -> None: